@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from accounts.models import Account, InterestCompounding
+from dateutil.rrule import DAILY, rrule
+from transactions.models import Transaction
+
+
+DailyChanges = dict[date, Decimal]
+
+DAYS_IN_YEAR = 365
+COMPOUNDING_PERIODS_PER_YEAR = {
+    InterestCompounding.DAY: 365,
+    InterestCompounding.MONTH: 12,
+    InterestCompounding.YEAR: 1,
+}
+
+
+def get_daily_changes(account_id: UUID, transactions: Iterable[Transaction]) -> DailyChanges:
+    """Суммарное изменение баланса счёта по дням."""
+    changes: DailyChanges = defaultdict(Decimal)
+    for transaction in transactions:
+        if transaction.to_account_id == account_id:  # type: ignore[attr-defined]
+            changes[transaction.date] += transaction.amount
+        if transaction.from_account_id == account_id:  # type: ignore[attr-defined]
+            changes[transaction.date] -= transaction.amount
+    return changes
+
+
+def merge_daily_changes(*changes_list: DailyChanges) -> DailyChanges:
+    merged: DailyChanges = defaultdict(Decimal)
+    for changes in changes_list:
+        for day, amount in changes.items():
+            merged[day] += amount
+    return merged
+
+
+def sum_changes_before(changes: DailyChanges, start_date: date, current_date: date) -> Decimal:
+    """Сдвиг баланса от current_date к началу start_date — в памяти, как в статистике."""
+    low, high = min(start_date, current_date), max(start_date, current_date)
+    delta = sum(
+        (amount for day, amount in changes.items() if low <= day < high),
+        Decimal("0"),
+    )
+    if start_date < current_date:
+        return -delta
+    return delta
+
+
+def build_daily_balances(
+    start_balance: Decimal,
+    changes: DailyChanges,
+    start_date: date,
+    end_date: date,
+) -> dict[str, Decimal]:
+    """Баланс на конец каждого дня окна: {'дата': баланс}."""
+    balance = start_balance
+    balances: dict[str, Decimal] = {}
+    # noinspection PyTypeChecker
+    for dt in rrule(DAILY, dtstart=start_date, until=end_date):
+        selected_date = dt.date()
+        balance += changes.get(selected_date, Decimal("0"))
+        balances[selected_date.isoformat()] = balance
+    return balances
+
+
+def get_daily_interest_factor(account: Account) -> Decimal | None:
+    """Дневной множитель баланса по ставке и капитализации счёта; None — процентов нет.
+
+    Капитализация сглажена по дням: за каждый период набегает ровно ставка / число периодов.
+    """
+    if not account.interest_rate:
+        return None
+    periods = COMPOUNDING_PERIODS_PER_YEAR[InterestCompounding(account.interest_compounding)]
+    return (1 + Decimal(account.interest_rate) / 100 / periods) ** (Decimal(periods) / DAYS_IN_YEAR)
+
+
+def accrue_balance(
+    balance: Decimal,
+    changes: DailyChanges,
+    low: date,
+    high: date,
+    daily_factor: Decimal,
+) -> Decimal:
+    """Баланс на конец дня перед high по балансу на начало low (проценты со следующего дня).
+
+    Между датами изменений рост считается в закрытой форме — balance · factor^дни, поэтому
+    цена зависит от числа транзакций, а не от длины отрезка.
+    """
+    day = low
+    for change_day in sorted(day for day in changes if low <= day < high):
+        balance = balance * daily_factor ** (change_day - day).days + changes[change_day]
+        day = change_day
+    return balance * daily_factor ** ((high - day).days - 1)
+
+
+def build_accruing_balances(  # noqa: PLR0913, PLR0917
+    current_balance: Decimal,
+    current_date: date,
+    changes: DailyChanges,
+    start_date: date,
+    end_date: date,
+    daily_factor: Decimal,
+) -> dict[str, Decimal]:
+    """Как build_daily_balances, но после current_date баланс растёт на daily_factor в день.
+
+    Дни до current_date — уже история, проценты в ней учтены транзакциями.
+    """
+    if start_date <= current_date:
+        balance = current_balance + sum_changes_before(changes, start_date, current_date)
+    else:
+        balance = accrue_balance(current_balance, changes, current_date, start_date, daily_factor)
+
+    balances: dict[str, Decimal] = {}
+    # noinspection PyTypeChecker
+    for dt in rrule(DAILY, dtstart=start_date, until=end_date):
+        selected_date = dt.date()
+        if selected_date > current_date:
+            balance *= daily_factor
+        balance += changes.get(selected_date, Decimal("0"))
+        balances[selected_date.isoformat()] = balance
+    return balances
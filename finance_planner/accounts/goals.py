@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from accounts.models import Account, AccountType
+from accounts.projection import build_balance_curves, find_first_crossing
+from django.utils import timezone
+from users.models import User
+
+
+GOAL_ACCOUNT_TYPES = (AccountType.PURPOSE, AccountType.ACCUMULATION)
+DEFAULT_GOAL_HORIZON_YEARS = 10
+
+
+@dataclass(frozen=True)
+class GoalProjection:
+    account: Account
+    reached_on: date | None
+
+
+def project_goals(
+    user: User, horizon: date, account_ids: Iterable[UUID] | None = None
+) -> list[GoalProjection]:
+    """Первая дата, когда прогнозный баланс целевого счёта достигает target_amount."""
+    accounts = Account.objects.filter(
+        user=user, type__in=GOAL_ACCOUNT_TYPES, target_amount__isnull=False
+    )
+    if account_ids:
+        accounts = accounts.filter(id__in=account_ids)
+    accounts_by_id = {account.id: account for account in accounts}
+    if not accounts_by_id:
+        return []
+
+    curves = build_balance_curves(user, accounts_by_id, timezone.localdate(), horizon)
+
+    projections = []
+    for account_id, account in accounts_by_id.items():
+        curve = curves[account_id]
+        projections.append(
+            GoalProjection(
+                account=account,
+                reached_on=find_first_crossing(
+                    curve, Decimal(account.target_amount), curve.current_date, horizon
+                ),
+            )
+        )
+    return projections
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from uuid import UUID
+
+from accounts.models import Account
+from accounts.projection import build_balance_curves, find_first_crossing
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+from regular_operations.models import RegularOperation
+from scenarios.models import ScenarioRule
+from users.models import User
+
+
+LOW_BALANCE_HORIZON_YEARS = 1
+
+
+def refresh_low_balance_dates(account_ids: Iterable[UUID | None]) -> None:
+    """Пересчитывает сохранённую low_balance_date только у затронутых счетов.
+
+    Вызывается из мест записи транзакций, операций, правил и самих счетов — чтение списка
+    счетов отдаёт уже готовое поле. Расчёт транзакций по плану дату не меняет: созданные
+    строки совпадают с повторениями, которые прогноз и так учитывал. Даты, устаревшие
+    без записей по ходу времени, пересчитывает команда refresh_low_balance_dates.
+    """
+    ids = {account_id for account_id in account_ids if account_id is not None}
+    if not ids:
+        return
+    accounts_by_user: dict[UUID, dict[UUID, Account]] = defaultdict(dict)
+    users: dict[UUID, User] = {}
+    for account in Account.objects.filter(id__in=ids).select_related("user"):
+        accounts_by_user[account.user_id][account.id] = account  # type: ignore[attr-defined]
+        users[account.user_id] = account.user  # type: ignore[attr-defined]
+
+    today = timezone.localdate()
+    horizon = today + relativedelta(years=LOW_BALANCE_HORIZON_YEARS)
+    updated_at = timezone.now()
+    for user_id, accounts_by_id in accounts_by_user.items():
+        curves = build_balance_curves(users[user_id], accounts_by_id, today, horizon)
+        changed_accounts = []
+        for account_id, account in accounts_by_id.items():
+            low_balance_date = find_first_crossing(
+                curves[account_id], account.low_balance_threshold, today, horizon, below=True
+            )
+            # неизменившиеся счета не переписываются, чтобы не попадать в ленту изменений
+            if low_balance_date != account.low_balance_date:
+                account.low_balance_date = low_balance_date
+                account.updated_at = updated_at
+                changed_accounts.append(account)
+        Account.objects.bulk_update(changed_accounts, ["low_balance_date", "updated_at"])
+
+
+def get_operation_account_ids(operation: RegularOperation) -> set[UUID | None]:
+    """Счета, баланс которых зависит от операции: её собственные и цели правил сценария."""
+    return {
+        operation.from_account_id,  # type: ignore[attr-defined]
+        operation.to_account_id,  # type: ignore[attr-defined]
+        *ScenarioRule.objects.filter(scenario__operation=operation).values_list(
+            "target_account_id", flat=True
+        ),
+    }
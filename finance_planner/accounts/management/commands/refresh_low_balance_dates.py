@@ -0,0 +1,20 @@
+from accounts.low_balance import refresh_low_balance_dates
+from accounts.models import Account
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Recomputes low-balance dates that went stale as the forecast horizon moved."
+
+    def handle(self, *args, **options):
+        # дата в будущем остаётся верной, устаревают прошедшие и пустые: у них порог могли
+        # пересечь за новым краем горизонта
+        account_ids = list(
+            Account.objects.filter(
+                Q(low_balance_date__lt=timezone.localdate()) | Q(low_balance_date__isnull=True)
+            ).values_list("id", flat=True)
+        )
+        refresh_low_balance_dates(account_ids)
+        self.stdout.write(f"Checked {len(account_ids)} account(s)")
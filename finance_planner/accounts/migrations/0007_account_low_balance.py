@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_account_current_balance_updated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="low_balance_date",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="Дата падения баланса ниже порога"
+            ),
+        ),
+        migrations.AddField(
+            model_name="account",
+            name="low_balance_threshold",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=19, verbose_name="Порог низкого баланса"
+            ),
+        ),
+    ]
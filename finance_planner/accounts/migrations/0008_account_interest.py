@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:36
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_account_low_balance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="interest_compounding",
+            field=models.CharField(
+                choices=[("day", "Ежедневно"), ("month", "Ежемесячно"), ("year", "Ежегодно")],
+                default="month",
+                max_length=20,
+                verbose_name="Капитализация процентов",
+            ),
+        ),
+        migrations.AddField(
+            model_name="account",
+            name="interest_rate",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=4,
+                max_digits=7,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0)],
+                verbose_name="Годовая процентная ставка, %",
+            ),
+        ),
+    ]
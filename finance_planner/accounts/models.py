@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
 from model_utils.models import UUIDModel
@@ -13,6 +14,15 @@ class AccountType(models.TextChoices):
     RESERVE = "reserve", "Резерв"
 
 
+class InterestCompounding(models.TextChoices):
+    DAY = "day", "Ежедневно"
+    MONTH = "month", "Ежемесячно"
+    YEAR = "year", "Ежегодно"
+
+
+INTEREST_ACCOUNT_TYPES = (AccountType.ACCUMULATION, AccountType.DEBT)
+
+
 class Account(UUIDModel):
     user = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="accounts")
     name = models.CharField(max_length=255, verbose_name="Название счета")
@@ -30,6 +40,31 @@ class Account(UUIDModel):
         blank=True,
         verbose_name="Целевая сумма",
     )
+    interest_rate = models.DecimalField(
+        max_digits=7,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        verbose_name="Годовая процентная ставка, %",
+    )
+    interest_compounding = models.CharField(
+        max_length=20,
+        choices=InterestCompounding.choices,
+        default=InterestCompounding.MONTH,
+        verbose_name="Капитализация процентов",
+    )
+    low_balance_threshold = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        default=0,
+        verbose_name="Порог низкого баланса",
+    )
+    low_balance_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Дата падения баланса ниже порога",
+    )
     description = models.TextField(blank=True, verbose_name="Описание")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
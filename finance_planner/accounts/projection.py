@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from uuid import UUID
+
+from accounts.forecast import DailyChanges, build_accruing_balances, get_daily_interest_factor
+from accounts.models import Account
+from django.db.models import Sum
+from transactions.calculation import (
+    count_transaction_days,
+    get_calculation_operations,
+    get_rule_amounts,
+)
+from transactions.models import Transaction
+from users.models import User
+
+
+@dataclass(frozen=True)
+class _Source:
+    """Повторения операции или правила с их изменением баланса счёта.
+
+    Уже созданные в БД повторения отменяются точечными поправками, см. _get_sources.
+    """
+
+    delta: Decimal
+    low: date
+    high: date
+    created_date: date
+    deleted_date: date | None
+    period_type: str
+    period_interval: int
+    recurrence: str
+
+    def count(self, low: date, high: date) -> int:
+        return count_transaction_days(
+            self.created_date,
+            self.deleted_date,
+            max(low, self.low),
+            min(high, self.high),
+            self.period_type,
+            self.period_interval,
+            self.recurrence,
+        )
+
+
+class BalanceCurve:
+    """Баланс счёта на конец дня как функция даты — без ряда по дням.
+
+    Уже созданные транзакции хранятся разреженно с префиксными суммами, регулярные повторения
+    считаются в закрытой форме через count_transaction_days. Проценты по счёту в balance() не
+    входят — ряд с начислением даёт balances(), как в статистике.
+    """
+
+    def __init__(
+        self,
+        account: Account,
+        persisted_changes: dict[date, Decimal],
+        sources: list[_Source],
+    ) -> None:
+        self.current_balance = account.current_balance
+        self.current_date = account.current_balance_updated.date()
+        self.daily_factor = get_daily_interest_factor(account)
+        self.sources = sources
+        self.days = sorted(persisted_changes)
+        changes = [persisted_changes[day] for day in self.days]
+        self.totals = [Decimal("0"), *accumulate(changes)]
+        self.positive_totals = [
+            Decimal("0"),
+            *accumulate(max(change, Decimal("0")) for change in changes),
+        ]
+        self.negative_totals = [
+            Decimal("0"),
+            *accumulate(max(-change, Decimal("0")) for change in changes),
+        ]
+
+    def balance(self, day: date) -> Decimal:
+        """Баланс на конец дня: текущий плюс изменения за [current_date, day]."""
+        return (
+            self.current_balance
+            + self._persisted_sum(self.totals, self.current_date, day)
+            + sum(
+                (source.delta * source.count(self.current_date, day) for source in self.sources),
+                Decimal("0"),
+            )
+        )
+
+    def balances(self, start_date: date, end_date: date) -> dict[str, Decimal]:
+        """Баланс на конец каждого дня окна с процентами по счёту: {'дата': баланс}."""
+        window = (
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        )
+        if self.daily_factor is None:
+            return {day.isoformat(): self.balance(day) for day in window}
+
+        # изменения по дням берутся из кривой, а рост — тем же помощником, что в статистике
+        day = min(self.current_date, start_date)
+        previous = self.balance(day - timedelta(days=1))
+        changes: DailyChanges = {}
+        while day <= end_date:
+            balance = self.balance(day)
+            if balance != previous:
+                changes[day] = balance - previous
+            previous = balance
+            day += timedelta(days=1)
+        return build_accruing_balances(
+            self.current_balance,
+            self.current_date,
+            changes,
+            start_date,
+            end_date,
+            self.daily_factor,
+        )
+
+    def max_increase(self, low: date, high: date) -> Decimal:
+        """Верхняя оценка роста баланса внутри [low, high] — учитываются только поступления."""
+        return self._persisted_sum(self.positive_totals, low, high) + sum(
+            (source.delta * source.count(low, high) for source in self.sources if source.delta > 0),
+            Decimal("0"),
+        )
+
+    def max_decrease(self, low: date, high: date) -> Decimal:
+        """Верхняя оценка падения баланса внутри [low, high] — учитываются только списания."""
+        return self._persisted_sum(self.negative_totals, low, high) - sum(
+            (source.delta * source.count(low, high) for source in self.sources if source.delta < 0),
+            Decimal("0"),
+        )
+
+    def _persisted_sum(self, totals: list[Decimal], low: date, high: date) -> Decimal:
+        if low > high:
+            return Decimal("0")
+        return (
+            totals[bisect_right(self.days, high)]
+            - totals[bisect_right(self.days, low - timedelta(days=1))]
+        )
+
+
+def build_balance_curves(
+    user: User, accounts_by_id: dict[UUID, Account], today: date, horizon: date
+) -> dict[UUID, BalanceCurve]:
+    """Кривые баланса счетов до horizon за фиксированное число запросов."""
+    persisted = _get_persisted_changes(user, accounts_by_id, horizon)
+    sources, point_changes = _get_sources(user, accounts_by_id, today, horizon)
+    for account_id, changes in point_changes.items():
+        for day, change in changes.items():
+            persisted[account_id][day] += change
+    return {
+        account_id: BalanceCurve(account, persisted[account_id], sources[account_id])
+        for account_id, account in accounts_by_id.items()
+    }
+
+
+def find_first_crossing(
+    curve: BalanceCurve, threshold: Decimal, low: date, high: date, *, below: bool = False
+) -> date | None:
+    """Первый день в [low, high], когда баланс достигает threshold (или падает ниже при below)."""
+
+    def is_crossed(balance: Decimal) -> bool:
+        return balance < threshold if below else balance >= threshold
+
+    if curve.daily_factor is not None:
+        # с процентами рост нелинеен и оценки по отрезкам неверны — идём по дням
+        balances = curve.balances(low - timedelta(days=1), high)
+        for day, balance in balances.items():
+            if is_crossed(balance):
+                return max(date.fromisoformat(day), low)
+        return None
+
+    def may_cross(balance_before: Decimal, low: date, high: date) -> bool:
+        if below:
+            return balance_before - curve.max_decrease(low, high) < threshold
+        return balance_before + curve.max_increase(low, high) >= threshold
+
+    balance_before = curve.balance(low - timedelta(days=1))
+    if is_crossed(balance_before):
+        return low
+
+    # от грубого к точному: отрезок делится пополам, пока оценка не отсекает его целиком
+    pending = [(low, high, balance_before)]
+    while pending:
+        low, high, balance_before = pending.pop()
+        if low > high or not may_cross(balance_before, low, high):
+            continue
+        if low == high:
+            if is_crossed(curve.balance(low)):
+                return low
+            continue
+        middle = low + timedelta(days=(high - low).days // 2)
+        # левая половина проверяется первой, поэтому кладётся в стек последней
+        pending.append((middle + timedelta(days=1), high, curve.balance(middle)))
+        pending.append((low, middle, balance_before))
+    return None
+
+
+def _get_persisted_changes(
+    user: User, accounts_by_id: dict[UUID, Account], horizon: date
+) -> dict[UUID, dict[date, Decimal]]:
+    low = min(account.current_balance_updated.date() for account in accounts_by_id.values())
+    transactions = Transaction.objects.filter(user=user, date__gte=low, date__lte=horizon)
+
+    changes: dict[UUID, dict[date, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    for field_name, sign in (("to_account", 1), ("from_account", -1)):
+        rows = (
+            transactions.filter(**{f"{field_name}__in": accounts_by_id})
+            .values(field_name, "date")
+            .annotate(total=Sum("amount"))
+        )
+        for row in rows:
+            changes[row[field_name]][row["date"]] += sign * row["total"]
+    return changes
+
+
+def _get_sources(
+    user: User, accounts_by_id: dict[UUID, Account], today: date, horizon: date
+) -> tuple[dict[UUID, list[_Source]], dict[UUID, dict[date, Decimal]]]:
+    """Источники повторений по счетам и точечные поправки к ним.
+
+    Поправки вносят исключения операций и отменяют повторения, уже созданные в БД: они
+    пропускаются по точному ключу (источник, planned_date), как в build_virtual_transactions,
+    поэтому пропуски после частичной очистки или расчёта окна не теряются.
+    """
+    materialized_dates: dict[UUID, set[date]] = defaultdict(set)
+    for operation_id, scenario_rule_id, planned_date in Transaction.objects.filter(
+        user=user, planned_date__gte=today, planned_date__lte=horizon
+    ).values_list("operation_id", "scenario_rule_id", "planned_date"):
+        materialized_dates[operation_id or scenario_rule_id].add(planned_date)
+
+    sources: dict[UUID, list[_Source]] = defaultdict(list)
+    point_changes: dict[UUID, dict[date, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    for operation in get_calculation_operations(user, today, horizon):
+        high = horizon
+        if operation.end_date is not None:
+            high = min(high, operation.end_date.date())
+        deleted_date = operation.deleted_at.date() if operation.deleted_at else None
+
+        # первая сумма — обычное повторение, остальные — повторения с исключениями
+        exceptions = list(operation.exceptions.all())  # type: ignore[attr-defined]
+        amounts = [
+            operation.amount,
+            *(
+                Decimal("0") if exception.skip else exception.amount or operation.amount
+                for exception in exceptions
+            ),
+        ]
+        deltas: list[tuple[UUID, UUID | None, list[Decimal]]] = [
+            (operation.id, operation.to_account_id, amounts),  # type: ignore[attr-defined]
+            (operation.id, operation.from_account_id, [-amount for amount in amounts]),  # type: ignore[attr-defined]
+        ]
+        if hasattr(operation, "scenario"):
+            rules = list(operation.scenario.rules.all())
+            for rule, rule_amounts in zip(rules, get_rule_amounts(amounts, rules), strict=True):
+                # пропущенное повторение не даёт и переводов по правилам, даже фиксированных
+                rule_amounts[1:] = [
+                    Decimal("0") if exception.skip else amount
+                    for exception, amount in zip(exceptions, rule_amounts[1:], strict=True)
+                ]
+                deltas.append((rule.id, rule.target_account_id, rule_amounts))
+                deltas.append(
+                    (rule.id, operation.to_account_id, [-amount for amount in rule_amounts])  # type: ignore[attr-defined]
+                )
+
+        for source_id, account_id, (delta, *exception_deltas) in deltas:
+            if account_id not in accounts_by_id:
+                continue
+            source = _Source(
+                delta=delta,
+                low=today,
+                high=high,
+                created_date=operation.start_date.date(),
+                deleted_date=deleted_date,
+                period_type=operation.period_type,
+                period_interval=operation.period_interval,
+                recurrence=operation.recurrence,
+            )
+            materialized = {day for day in materialized_dates[source_id] if source.count(day, day)}
+            if delta:
+                sources[account_id].append(source)
+                for day in materialized:
+                    point_changes[account_id][day] -= delta
+            for exception, exception_delta in zip(exceptions, exception_deltas, strict=True):
+                if (
+                    exception.date not in materialized
+                    and exception_delta != delta
+                    and source.count(exception.date, exception.date)
+                ):
+                    point_changes[account_id][exception.date] += exception_delta - delta
+    return sources, point_changes
@@ -1,11 +1,21 @@
+from decimal import Decimal
 from typing import Any
 
-from accounts.models import Account, AccountType
+from accounts.goals import DEFAULT_GOAL_HORIZON_YEARS
+from accounts.models import INTEREST_ACCOUNT_TYPES, Account, AccountType
+from accounts.monte_carlo import DEFAULT_PERCENTILES
 from django.utils import timezone
+from regular_operations.models import RegularOperationPeriodType
 from rest_framework import serializers
+from scenarios.models import RuleType
 from serializers import StartEndInputSerializer
 
 
+SIMULATION_MAX_VARIANTS = 20
+MONTE_CARLO_DEFAULT_PATHS = 10_000
+MONTE_CARLO_MAX_PATHS = 50_000
+
+
 class AccountSerializer(serializers.ModelSerializer):
     class Meta:
         model = Account
@@ -16,11 +26,15 @@ class AccountSerializer(serializers.ModelSerializer):
             "type",
             "current_balance",
             "target_amount",
+            "interest_rate",
+            "interest_compounding",
+            "low_balance_threshold",
+            "low_balance_date",
             "description",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "user", "created_at", "updated_at"]
+        read_only_fields = ["id", "user", "low_balance_date", "created_at", "updated_at"]
 
 
 class AccountCreateUpdateSerializer(serializers.ModelSerializer):
@@ -32,6 +46,9 @@ class AccountCreateUpdateSerializer(serializers.ModelSerializer):
             "type",
             "current_balance",
             "target_amount",
+            "interest_rate",
+            "interest_compounding",
+            "low_balance_threshold",
             "description",
         ]
 
@@ -47,8 +64,17 @@ class AccountCreateUpdateSerializer(serializers.ModelSerializer):
             and Account.objects.filter(user=user, type=AccountType.MAIN).exists()
         ):
             raise serializers.ValidationError({"type": "Нельзя создать два основных счёта"})
+        self._validate_interest(attrs)
         return attrs
 
+    def _validate_interest(self, attrs: dict[str, Any]) -> None:
+        account_type = attrs.get("type", getattr(self.instance, "type", None))
+        interest_rate = attrs.get("interest_rate", getattr(self.instance, "interest_rate", None))
+        if interest_rate and account_type not in INTEREST_ACCOUNT_TYPES:
+            raise serializers.ValidationError(
+                {"interest_rate": "Проценты начисляются только на накопления и долги"}
+            )
+
 
 class AccountCreateSerializer(AccountCreateUpdateSerializer):
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
@@ -59,6 +85,7 @@ class AccountUpdateSerializer(AccountCreateUpdateSerializer):
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         if attrs.get("type", self.instance.type) != self.instance.type:
             raise serializers.ValidationError({"type": "Нельзя менять тип счёта"})
+        self._validate_interest(attrs)
         if "current_balance" in attrs is not None:
             attrs["current_balance_updated"] = timezone.now()
         return attrs
@@ -69,6 +96,10 @@ class StatisticsRequestSerializer(StartEndInputSerializer):
         default=False,
         help_text="Показать только реальные изменения баланса",
     )
+    forecast = serializers.BooleanField(
+        default=False,
+        help_text="Учитывать ещё не рассчитанные регулярные операции и правила сценариев",
+    )
     accounts = serializers.PrimaryKeyRelatedField(
         queryset=Account.objects.all(),
         many=True,
@@ -84,3 +115,154 @@ class StatisticsResponse(serializers.Serializer):
         ),
         help_text="Ключ — id счёта, значение — словарь {'дата': баланс}",
     )
+
+
+class OperationOverrideSerializer(serializers.Serializer):
+    id = serializers.UUIDField(help_text="ID регулярной операции")
+    amount = serializers.DecimalField(
+        max_digits=19, decimal_places=2, min_value=Decimal("0.01"), required=False
+    )
+    end_date = serializers.DateTimeField(required=False, allow_null=True)
+    period_type = serializers.ChoiceField(
+        choices=[
+            choice
+            for choice in RegularOperationPeriodType.choices
+            if choice[0] != RegularOperationPeriodType.CUSTOM
+        ],
+        required=False,
+    )
+    period_interval = serializers.IntegerField(min_value=1, required=False)
+    excluded = serializers.BooleanField(
+        default=False, help_text="Посчитать так, будто операции нет"
+    )
+
+
+class RuleOverrideSerializer(serializers.Serializer):
+    id = serializers.UUIDField(help_text="ID правила сценария")
+    type = serializers.ChoiceField(choices=RuleType.choices, required=False)
+    amount = serializers.DecimalField(
+        max_digits=19, decimal_places=2, min_value=Decimal("0"), required=False, allow_null=True
+    )
+    percent = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        min_value=Decimal("0"),
+        max_value=Decimal("100"),
+        required=False,
+        allow_null=True,
+    )
+    order = serializers.IntegerField(required=False)
+    target_account = serializers.UUIDField(
+        source="target_account_id", required=False, help_text="ID счёта модели Account"
+    )
+    excluded = serializers.BooleanField(default=False, help_text="Посчитать так, будто правила нет")
+
+
+class SimulationRequestSerializer(StartEndInputSerializer):
+    accounts = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Список ID счетов модели Account",
+    )
+    operations = OperationOverrideSerializer(
+        many=True, required=False, help_text="Изменения регулярных операций"
+    )
+    rules = RuleOverrideSerializer(
+        many=True, required=False, help_text="Изменения правил сценариев"
+    )
+
+
+class SimulationVariantSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255, help_text="Название варианта")
+    operations = OperationOverrideSerializer(
+        many=True, required=False, help_text="Изменения регулярных операций"
+    )
+    rules = RuleOverrideSerializer(
+        many=True, required=False, help_text="Изменения правил сценариев"
+    )
+
+
+class SimulationCompareRequestSerializer(StartEndInputSerializer):
+    accounts = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Список ID счетов модели Account",
+    )
+    variants = SimulationVariantSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=SIMULATION_MAX_VARIANTS,
+        help_text="Варианты для сравнения с текущим планом",
+    )
+
+
+class SimulationVariantResponse(StatisticsResponse):
+    name = serializers.CharField()
+
+
+class SimulationCompareResponse(serializers.Serializer):
+    baseline = StatisticsResponse(help_text="Балансы без изменений")
+    variants = SimulationVariantResponse(many=True)
+
+
+class MonteCarloRequestSerializer(StartEndInputSerializer):
+    accounts = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Список ID счетов модели Account",
+    )
+    paths = serializers.IntegerField(
+        default=MONTE_CARLO_DEFAULT_PATHS,
+        min_value=1,
+        max_value=MONTE_CARLO_MAX_PATHS,
+        help_text="Количество случайных путей",
+    )
+    percentiles = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=100),
+        default=list(DEFAULT_PERCENTILES),
+        allow_empty=False,
+        help_text="Перцентили, которые нужно вернуть",
+    )
+    seed = serializers.IntegerField(
+        required=False, min_value=0, help_text="Зерно генератора для воспроизводимости"
+    )
+
+
+class MonteCarloResponse(serializers.Serializer):
+    bands = serializers.DictField(
+        child=serializers.DictField(
+            child=serializers.DictField(
+                child=serializers.DecimalField(max_digits=12, decimal_places=2)
+            )
+        ),
+        help_text="Ключ — id счёта, далее перцентиль ('p50') и словарь {'дата': баланс}",
+    )
+
+
+class GoalsRequestSerializer(serializers.Serializer):
+    end_date = serializers.DateField(
+        required=False,
+        help_text=f"Горизонт поиска (по умолчанию — {DEFAULT_GOAL_HORIZON_YEARS} лет от сегодня)",
+    )
+    accounts = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Список ID целевых счетов модели Account",
+    )
+
+
+class GoalProjectionSerializer(serializers.Serializer):
+    account = serializers.UUIDField(source="account.id")
+    name = serializers.CharField(source="account.name")
+    target_amount = serializers.DecimalField(
+        source="account.target_amount", max_digits=19, decimal_places=4
+    )
+    reached_on = serializers.DateField(
+        allow_null=True,
+        help_text="Первая дата, когда баланс достигает цели; null — не в пределах горизонта",
+    )
+
+
+class GoalsResponse(serializers.Serializer):
+    horizon = serializers.DateField()
+    goals = GoalProjectionSerializer(many=True)
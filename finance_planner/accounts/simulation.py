@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+import copy
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+from uuid import UUID
+
+from accounts.forecast import DailyChanges, build_accruing_balances, get_daily_interest_factor
+from accounts.models import Account
+from django.db.models import Q
+from django.utils import timezone
+import numpy as np
+from regular_operations.models import RegularOperation
+from scenarios.models import ScenarioRule
+from transactions.calculation import (
+    OccurrenceKey,
+    from_cents,
+    get_calculation_operations,
+    iter_planned_transactions,
+    occurrence_key,
+    to_cents,
+)
+from transactions.models import Transaction
+from users.models import User
+
+
+OPERATION_OVERRIDE_FIELDS = ("amount", "end_date", "period_type", "period_interval")
+RULE_OVERRIDE_FIELDS = ("type", "amount", "percent", "order", "target_account_id")
+
+Overrides = Mapping[UUID, Mapping[str, Any]]
+
+
+@dataclass(frozen=True)
+class OperationPlan:
+    """Операция и правила её сценария, по которым генерируются транзакции."""
+
+    operation: RegularOperation
+    rules: list[ScenarioRule]
+
+
+@dataclass(frozen=True)
+class SimulationState:
+    """Всё, что нужно симуляции из БД. Загружается один раз и дальше не меняется."""
+
+    user: User
+    today: date
+    low: date
+    horizon: date
+    accounts: dict[UUID, Account]
+    windows: dict[UUID, tuple[date, date, date]]
+    transactions: list[Transaction]
+    plans: list[OperationPlan]
+
+    @property
+    def operation_ids(self) -> set[UUID]:
+        return {plan.operation.id for plan in self.plans}
+
+    @property
+    def rule_ids(self) -> set[UUID]:
+        return {rule.id for plan in self.plans for rule in plan.rules}
+
+
+@dataclass(frozen=True)
+class SimulationVariant:
+    """Набор операций с применёнными изменениями.
+
+    replaced_sources — операции и правила, чьи будущие неподтверждённые строки из БД
+    заменяются сгенерированными заново.
+    """
+
+    plans: list[OperationPlan]
+    replaced_sources: frozenset[UUID]
+
+
+def load_simulation_state(
+    user: User, start_date: date | None, end_date: date | None
+) -> SimulationState:
+    """Счета, транзакции окна и регулярные операции с правилами — фиксированным числом запросов."""
+    today = timezone.localdate()
+    accounts = {account.id: account for account in Account.objects.filter(user=user)}
+
+    windows: dict[UUID, tuple[date, date, date]] = {}
+    for account in accounts.values():
+        current_date = account.current_balance_updated.date()
+        windows[account.id] = (
+            current_date,
+            start_date or current_date,
+            end_date or current_date + timedelta(days=90),
+        )
+
+    if not windows:
+        return SimulationState(user, today, today, today, accounts, windows, [], [])
+
+    low = min(min(current, start) for current, start, _ in windows.values())
+    horizon = max(max(current, end) for current, _, end in windows.values())
+    transactions = list(
+        Transaction.objects.filter(user=user).filter(
+            Q(date__gte=low, date__lte=horizon)
+            | Q(planned_date__gte=today, planned_date__lte=horizon)
+        )
+    )
+    plans = [
+        OperationPlan(
+            operation,
+            list(operation.scenario.rules.all()) if hasattr(operation, "scenario") else [],
+        )
+        for operation in get_calculation_operations(user, today, horizon)
+    ]
+    return SimulationState(user, today, low, horizon, accounts, windows, transactions, plans)
+
+
+def apply_overrides(
+    state: SimulationState, operation_overrides: Overrides, rule_overrides: Overrides
+) -> SimulationVariant:
+    """Применяет изменения к копиям операций и правил — загруженное состояние не меняется."""
+    plans: list[OperationPlan] = []
+    replaced: set[UUID] = set()
+
+    for plan in state.plans:
+        operation = plan.operation
+        operation_override = operation_overrides.get(operation.id)
+        if operation_override is None and not any(rule.id in rule_overrides for rule in plan.rules):
+            plans.append(plan)
+            continue
+
+        # суммы правил зависят от операции и друг от друга (остаток, порядок), поэтому
+        # изменение операции или любого правила пересобирает все правила сценария
+        replaced.update(rule.id for rule in plan.rules)
+        if operation_override is not None:
+            replaced.add(operation.id)
+            if operation_override.get("excluded"):
+                continue
+            operation = _with_overrides(operation, operation_override, OPERATION_OVERRIDE_FIELDS)
+
+        rules: list[ScenarioRule] = []
+        for rule in plan.rules:
+            rule_override = rule_overrides.get(rule.id)
+            if rule_override is None:
+                rules.append(rule)
+                continue
+            if not rule_override.get("excluded"):
+                rules.append(_with_overrides(rule, rule_override, RULE_OVERRIDE_FIELDS))
+
+        rules.sort(key=attrgetter("order"))
+        plans.append(OperationPlan(operation, rules))
+
+    return SimulationVariant(plans=plans, replaced_sources=frozenset(replaced))
+
+
+def get_variant_transactions(
+    state: SimulationState, variant: SimulationVariant
+) -> list[Transaction]:
+    """Транзакции из БД плюс сгенерированные повторения варианта, без дублей по (источник, дата)."""
+    transactions = [
+        transaction
+        for transaction in state.transactions
+        if not _is_replaced(transaction, state.today, variant.replaced_sources)
+    ]
+    kept_keys = {
+        occurrence_key(transaction)
+        for transaction in transactions
+        if transaction.planned_date is not None
+    }
+    for plan in variant.plans:
+        for transaction in iter_planned_transactions(
+            state.user, plan.operation, state.today, state.horizon, scenario_rules=plan.rules
+        ):
+            if occurrence_key(transaction) not in kept_keys:
+                transactions.append(transaction)
+    return transactions
+
+
+def simulate_balances(
+    state: SimulationState,
+    variant: SimulationVariant,
+    account_ids: Iterable[UUID] | None = None,
+) -> dict[str, dict[str, Decimal]]:
+    """Ряды балансов по счетам для варианта — целиком в памяти."""
+    return compare_variants(state, [variant], account_ids)[0]
+
+
+@dataclass(frozen=True)
+class AccountWindow:
+    """Окно счёта в индексах дней от state.low."""
+
+    account_id: UUID
+    index: int
+    current: int
+    start: int
+    end: int
+    dates: list[str]
+
+
+@dataclass(frozen=True)
+class BalanceLayout:
+    """Базовый план, разложенный по (счёт, день) в копейках, — общий для всех вариантов.
+
+    Нулевой столбец changes — сумма до первого дня, поэтому cumsum сразу даёт префиксные суммы.
+    """
+
+    account_index: dict[UUID, int]
+    windows: list[AccountWindow]
+    changes: np.ndarray
+    replaceable: dict[UUID, list[Transaction]]
+    kept_keys: set[OccurrenceKey]
+
+
+def build_balance_layout(
+    state: SimulationState, account_ids: Iterable[UUID] | None = None
+) -> BalanceLayout:
+    selected_ids = set(account_ids or state.accounts)
+    selected = [account_id for account_id in state.accounts if account_id in selected_ids]
+    account_index = {account_id: index for index, account_id in enumerate(selected)}
+
+    windows = []
+    for account_id, index in account_index.items():
+        current_date, start_date, end_date = state.windows[account_id]
+        windows.append(
+            AccountWindow(
+                account_id=account_id,
+                index=index,
+                current=(current_date - state.low).days,
+                start=(start_date - state.low).days,
+                end=(end_date - state.low).days,
+                dates=[
+                    day.isoformat()
+                    for day in (
+                        start_date + timedelta(days=offset)
+                        for offset in range((end_date - start_date).days + 1)
+                    )
+                ],
+            )
+        )
+
+    baseline = get_variant_transactions(state, SimulationVariant(state.plans, frozenset()))
+    replaceable: dict[UUID, list[Transaction]] = defaultdict(list)
+    kept_keys = set()
+    for transaction in baseline:
+        source_id = _source_id(transaction)
+        if source_id is not None and _is_replaceable(transaction, state.today):
+            replaceable[source_id].append(transaction)
+        elif transaction.planned_date is not None:
+            kept_keys.add(occurrence_key(transaction))
+
+    changes = np.zeros((len(selected), (state.horizon - state.low).days + 2), dtype=np.int64)
+    add_changes(changes, baseline, account_index, state.low)
+    return BalanceLayout(account_index, windows, changes, replaceable, kept_keys)
+
+
+def get_variant_delta(
+    state: SimulationState, layout: BalanceLayout, variant: SimulationVariant
+) -> tuple[list[Transaction], list[Transaction]]:
+    """Строки базового плана, которые вариант убирает, и сгенерированные ему на замену."""
+    removed = [
+        transaction
+        for source_id in variant.replaced_sources
+        for transaction in layout.replaceable.get(source_id, [])
+    ]
+    added = [
+        transaction
+        for plan in variant.plans
+        if plan.operation.id in variant.replaced_sources
+        or any(rule.id in variant.replaced_sources for rule in plan.rules)
+        for transaction in iter_planned_transactions(
+            state.user, plan.operation, state.today, state.horizon, scenario_rules=plan.rules
+        )
+        if _source_id(transaction) in variant.replaced_sources
+        and occurrence_key(transaction) not in layout.kept_keys
+    ]
+    return removed, added
+
+
+def compare_variants(
+    state: SimulationState,
+    variants: Sequence[SimulationVariant],
+    account_ids: Iterable[UUID] | None = None,
+) -> list[dict[str, dict[str, Decimal]]]:
+    """Ряды балансов сразу для нескольких вариантов.
+
+    Базовый план раскладывается в матрицу один раз, вариант добавляет к ней только разницу
+    по своим заменённым источникам, а балансы всех вариантов накапливаются одним cumsum.
+    Для счетов со ставкой ряд считается build_accruing_balances, как в статистике.
+    """
+    layout = build_balance_layout(state, account_ids)
+    if not layout.windows or not variants:
+        return [{} for _ in variants]
+
+    changes = np.repeat(layout.changes[np.newaxis], len(variants), axis=0)
+    for variant_changes, variant in zip(changes, variants, strict=True):
+        removed, added = get_variant_delta(state, layout, variant)
+        add_changes(variant_changes, removed, layout.account_index, state.low, sign=-1)
+        add_changes(variant_changes, added, layout.account_index, state.low)
+
+    prefix_sums = np.cumsum(changes, axis=-1)
+
+    results: list[dict[str, dict[str, Decimal]]] = [{} for _ in variants]
+    for window in layout.windows:
+        account = state.accounts[window.account_id]
+        daily_factor = get_daily_interest_factor(account)
+        if daily_factor is not None:
+            current_date, start_date, end_date = state.windows[window.account_id]
+            for result, variant_changes in zip(results, changes[:, window.index], strict=True):
+                result[str(window.account_id)] = build_accruing_balances(
+                    account.current_balance,
+                    current_date,
+                    get_column_changes(variant_changes, state.low),
+                    start_date,
+                    end_date,
+                    daily_factor,
+                )
+            continue
+
+        # баланс на конец дня d = текущий баланс + сумма изменений за [current_date, d]
+        series = (
+            to_cents(account.current_balance)
+            + prefix_sums[:, window.index, window.start + 1 : window.end + 2]
+            - prefix_sums[:, window.index, window.current, np.newaxis]
+        )
+        for result, values in zip(results, series.tolist(), strict=True):
+            result[str(window.account_id)] = dict(
+                zip(window.dates, map(from_cents, values), strict=True)
+            )
+    return results
+
+
+def get_column_changes(changes: np.ndarray, low: date) -> DailyChanges:
+    """Строка матрицы изменений счёта в копейках — изменения по дням, как в статистике."""
+    # нулевой столбец — сумма до первого дня, столбец j + 1 — день low + j
+    return {
+        low + timedelta(days=int(column) - 1): from_cents(int(changes[column]))
+        for column in np.flatnonzero(changes[1:]) + 1
+    }
+
+
+def add_changes(
+    changes: np.ndarray,
+    transactions: Iterable[Transaction],
+    account_index: Mapping[UUID, int],
+    low: date,
+    *,
+    sign: int = 1,
+) -> None:
+    """Добавляет транзакции в матрицу изменений (счёт, день + 1) в копейках."""
+    days = changes.shape[-1] - 1
+    rows: list[int] = []
+    columns: list[int] = []
+    amounts: list[int] = []
+    for transaction in transactions:
+        day = (transaction.date - low).days
+        if not 0 <= day < days:
+            continue
+        cents = to_cents(transaction.amount) * sign
+        for account_id, direction in (
+            (transaction.to_account_id, 1),  # type: ignore[attr-defined]
+            (transaction.from_account_id, -1),  # type: ignore[attr-defined]
+        ):
+            if account_id in account_index:
+                rows.append(account_index[account_id])
+                columns.append(day + 1)
+                amounts.append(cents * direction)
+    np.add.at(changes, (rows, columns), amounts)
+
+
+def _source_id(transaction: Transaction) -> UUID | None:
+    return transaction.operation_id or transaction.scenario_rule_id  # type: ignore[attr-defined]
+
+
+def _with_overrides[T](instance: T, override: Mapping[str, Any], fields: Iterable[str]) -> T:
+    instance = copy.copy(instance)
+    for field_name in fields:
+        if field_name in override:
+            setattr(instance, field_name, override[field_name])
+    return instance
+
+
+def _is_replaceable(transaction: Transaction, today: date) -> bool:
+    return (
+        not transaction.confirmed
+        and transaction.planned_date is not None
+        and transaction.planned_date >= today
+    )
+
+
+def _is_replaced(transaction: Transaction, today: date, replaced_sources: frozenset[UUID]) -> bool:
+    return _is_replaceable(transaction, today) and _source_id(transaction) in replaced_sources
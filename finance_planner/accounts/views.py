@@ -1,23 +1,56 @@
 from datetime import date, timedelta
 from decimal import Decimal
+from uuid import UUID
 
+from accounts.forecast import (
+    build_accruing_balances,
+    build_daily_balances,
+    get_daily_changes,
+    get_daily_interest_factor,
+    merge_daily_changes,
+    sum_changes_before,
+)
+from accounts.goals import DEFAULT_GOAL_HORIZON_YEARS, project_goals
+from accounts.low_balance import refresh_low_balance_dates
 from accounts.models import Account
+from accounts.monte_carlo import monte_carlo_bands
 from accounts.serializers import (
     AccountCreateSerializer,
     AccountSerializer,
     AccountUpdateSerializer,
+    GoalsRequestSerializer,
+    GoalsResponse,
+    MonteCarloRequestSerializer,
+    MonteCarloResponse,
+    SimulationCompareRequestSerializer,
+    SimulationCompareResponse,
+    SimulationRequestSerializer,
     StatisticsRequestSerializer,
     StatisticsResponse,
 )
-from dateutil.rrule import DAILY, rrule
+from accounts.simulation import (
+    Overrides,
+    SimulationState,
+    apply_overrides,
+    compare_variants,
+    load_simulation_state,
+    simulate_balances,
+)
+from core.models import TombstoneEntity, record_tombstones
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
 from django.db.models import Case, F, Q, QuerySet, Sum, Value, When
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import permissions, status, viewsets
+from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
-from transactions.models import Transaction
+from scenarios.models import ScenarioRule
+from scenarios.serializers import RULE_VALUE_REQUIRED_ERRORS, get_rule_value_errors
+from transactions.calculation import build_virtual_transactions
+from transactions.models import Transaction, delete_future_planned_transactions
 
 
 class AccountViewSet(viewsets.ModelViewSet):
@@ -38,7 +71,37 @@ class AccountViewSet(viewsets.ModelViewSet):
         )
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        account = serializer.save(user=self.request.user)
+        refresh_low_balance_dates([account.id])
+
+    def perform_update(self, serializer):
+        account = serializer.save()
+        # порог, баланс и проценты меняют прогноз, от которого считается дата
+        if {
+            "current_balance",
+            "low_balance_threshold",
+            "interest_rate",
+            "interest_compounding",
+        } & serializer.validated_data.keys():
+            refresh_low_balance_dates([account.id])
+
+    def perform_destroy(self, instance: Account):
+        # delete() обнуляет id экземпляра, поэтому надгробие собирается заранее
+        tombstone = (instance.user_id, instance.id)  # type: ignore[attr-defined]
+        # правила сценариев с этим целевым счётом удаляются каскадом мимо deleted_at
+        rules = list(
+            ScenarioRule.objects.filter(target_account=instance).values_list(
+                "scenario__user_id", "id", "scenario__operation__to_account_id"
+            )
+        )
+        with transaction.atomic():
+            delete_future_planned_transactions(Q(scenario_rule_id__in=[rule[1] for rule in rules]))
+            instance.delete()
+            record_tombstones(TombstoneEntity.ACCOUNT, [tombstone])
+            record_tombstones(
+                TombstoneEntity.SCENARIO_RULE, [(user_id, rule_id) for user_id, rule_id, _ in rules]
+            )
+            refresh_low_balance_dates({account_id for *_, account_id in rules})
 
     @swagger_auto_schema(
         request_body=StatisticsRequestSerializer(),
@@ -58,13 +121,28 @@ class AccountViewSet(viewsets.ModelViewSet):
         if accounts_ids:
             user_accounts = user_accounts.filter(id__in=accounts_ids)
 
-        balances: dict[str, dict[str, Decimal]] = {}
-
-        for account in user_accounts:
+        only_confirmed: bool = params["only_confirmed"]
+        windows: dict[UUID, tuple[date, date, date]] = {}
+        selected_accounts = list(user_accounts)
+        for account in selected_accounts:
             current_date = account.current_balance_updated.date()
             start_date: date = params.get("start_date") or current_date
             end_date: date = params.get("end_date") or current_date + timedelta(days=90)
-            only_confirmed: bool = params["only_confirmed"]
+            windows[account.id] = (current_date, start_date, end_date)
+
+        virtual_transactions: list[Transaction] = []
+        if params["forecast"] and not only_confirmed and windows:
+            # ещё не рассчитанные повторения — только в памяти, в БД ничего не пишем
+            virtual_transactions = build_virtual_transactions(
+                request.user,  # type: ignore[arg-type]
+                timezone.localdate(),
+                max(end_date for _, _, end_date in windows.values()),
+            )
+
+        balances: dict[str, dict[str, Decimal]] = {}
+
+        for account in selected_accounts:
+            current_date, start_date, end_date = windows[account.id]
 
             account_transactions: QuerySet[Transaction] = (
                 Transaction.objects.filter(user=request.user)
@@ -75,30 +153,237 @@ class AccountViewSet(viewsets.ModelViewSet):
             if only_confirmed:
                 account_transactions.filter(confirmed=True)
 
-            account_values_by_days: dict[str, Decimal] = {}
-            balances[str(account.id)] = account_values_by_days
+            virtual_changes = get_daily_changes(account.id, virtual_transactions)
+            daily_factor = get_daily_interest_factor(account)
+            if daily_factor is not None:
+                balances[str(account.id)] = build_accruing_balances(
+                    account.current_balance,
+                    current_date,
+                    merge_daily_changes(
+                        get_daily_changes(account.id, account_transactions),
+                        virtual_changes,
+                    ),
+                    start_date,
+                    end_date,
+                    daily_factor,
+                )
+                continue
 
-            account_current_balance = account.current_balance + _calculate_account_start_delta(
-                account,
-                account_transactions,
+            account_current_balance = (
+                account.current_balance
+                + _calculate_account_start_delta(
+                    account,
+                    account_transactions,
+                    start_date,
+                    current_date,
+                )
+                + sum_changes_before(virtual_changes, start_date, current_date)
+            )
+            balances[str(account.id)] = build_daily_balances(
+                account_current_balance,
+                merge_daily_changes(
+                    get_daily_changes(account.id, account_transactions),
+                    virtual_changes,
+                ),
                 start_date,
-                current_date,
+                end_date,
             )
-            for dt in rrule(DAILY, dtstart=start_date, until=end_date):
-                selected_date = dt.date()
-                current_date_transactions = account_transactions.filter(date=selected_date)
-                for transaction in current_date_transactions:
-                    if transaction.to_account == account:
-                        account_current_balance += transaction.amount
-                    if transaction.from_account == account:
-                        account_current_balance -= transaction.amount
-                account_values_by_days[selected_date.isoformat()] = account_current_balance
 
         return Response(
             StatisticsResponse(instance={"balances": balances}).data,
             status=status.HTTP_200_OK,
         )
 
+    @swagger_auto_schema(
+        request_body=SimulationRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: StatisticsResponse, 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["post"], url_path="simulate")
+    def simulate(self, request: Request):
+        """Балансы счетов при изменённых операциях и правилах. В БД ничего не пишет."""
+        serializer = SimulationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        state = load_simulation_state(
+            request.user,  # type: ignore[arg-type]
+            params.get("start_date"),
+            params.get("end_date"),
+        )
+        operation_overrides = {
+            override["id"]: override for override in params.get("operations", [])
+        }
+        rule_overrides = {override["id"]: override for override in params.get("rules", [])}
+        _validate_simulation_ids(
+            state, params.get("accounts", []), operation_overrides, rule_overrides
+        )
+
+        variant = apply_overrides(state, operation_overrides, rule_overrides)
+        balances = simulate_balances(state, variant, params.get("accounts"))
+
+        return Response(
+            StatisticsResponse(instance={"balances": balances}).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        request_body=SimulationCompareRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: SimulationCompareResponse, 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["post"], url_path="simulate/compare")
+    def simulate_compare(self, request: Request):
+        """Текущий план и несколько вариантов изменений, посчитанные по одной загрузке."""
+        serializer = SimulationCompareRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        state = load_simulation_state(
+            request.user,  # type: ignore[arg-type]
+            params.get("start_date"),
+            params.get("end_date"),
+        )
+        variants = [apply_overrides(state, {}, {})]
+        for variant_params in params["variants"]:
+            operation_overrides = {
+                override["id"]: override for override in variant_params.get("operations", [])
+            }
+            rule_overrides = {
+                override["id"]: override for override in variant_params.get("rules", [])
+            }
+            _validate_simulation_ids(
+                state, params.get("accounts", []), operation_overrides, rule_overrides
+            )
+            variants.append(apply_overrides(state, operation_overrides, rule_overrides))
+
+        baseline, *results = compare_variants(state, variants, params.get("accounts"))
+
+        return Response(
+            SimulationCompareResponse(
+                instance={
+                    "baseline": {"balances": baseline},
+                    "variants": [
+                        {"name": variant_params["name"], "balances": balances}
+                        for variant_params, balances in zip(
+                            params["variants"], results, strict=True
+                        )
+                    ],
+                }
+            ).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        request_body=MonteCarloRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: MonteCarloResponse, 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["post"], url_path="simulate/monte-carlo")
+    def simulate_monte_carlo(self, request: Request):
+        """Перцентили балансов с учётом разброса сумм и вероятности регулярных операций."""
+        serializer = MonteCarloRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        state = load_simulation_state(
+            request.user,  # type: ignore[arg-type]
+            params.get("start_date"),
+            params.get("end_date"),
+        )
+        _validate_simulation_ids(state, params.get("accounts", []), {}, {})
+        bands = monte_carlo_bands(
+            state,
+            params["paths"],
+            params["percentiles"],
+            params.get("accounts"),
+            params.get("seed"),
+        )
+
+        return Response(
+            MonteCarloResponse(instance={"bands": bands}).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        request_body=GoalsRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: GoalsResponse, 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["post"], url_path="goals")
+    def goals(self, request: Request):
+        """Когда прогнозный баланс целевых счетов достигнет target_amount."""
+        serializer = GoalsRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        horizon: date = params.get("end_date") or timezone.localdate() + relativedelta(
+            years=DEFAULT_GOAL_HORIZON_YEARS
+        )
+        projections = project_goals(
+            request.user,  # type: ignore[arg-type]
+            horizon,
+            params.get("accounts"),
+        )
+
+        return Response(
+            GoalsResponse(instance={"horizon": horizon, "goals": projections}).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+def _validate_simulation_ids(
+    state: SimulationState,
+    account_ids: list[UUID],
+    operation_overrides: Overrides,
+    rule_overrides: Overrides,
+) -> None:
+    # проверяем по уже загруженному состоянию, без отдельных запросов
+    errors: dict[str, str] = {}
+    target_account_ids = {
+        override["target_account_id"]
+        for override in rule_overrides.values()
+        if "target_account_id" in override
+    }
+    if not set(account_ids) | target_account_ids <= state.accounts.keys():
+        errors["accounts"] = "Счёт не найден"
+    if not operation_overrides.keys() <= state.operation_ids:
+        errors["operations"] = "Регулярная операция не найдена"
+    if not rule_overrides.keys() <= state.rule_ids:
+        errors["rules"] = "Правило сценария не найдено"
+    if errors:
+        raise serializers.ValidationError(errors)
+    _validate_rule_values(state, rule_overrides)
+
+
+def _validate_rule_values(state: SimulationState, rule_overrides: Overrides) -> None:
+    # правило с изменениями должно остаться корректным, как при сохранении через API правил
+    rules = {rule.id: rule for plan in state.plans for rule in plan.rules}
+    errors = {}
+    for rule_id, override in rule_overrides.items():
+        if override.get("excluded"):
+            continue
+        rule = rules[rule_id]
+        rule_errors = get_rule_value_errors(
+            override.get("type", rule.type),
+            {
+                field: override.get(field, getattr(rule, field))
+                for field in RULE_VALUE_REQUIRED_ERRORS
+            },
+        )
+        if rule_errors:
+            errors[str(rule_id)] = rule_errors
+    if errors:
+        raise serializers.ValidationError({"rules": errors})
+
 
 def _calculate_account_start_delta(
     account: Account,
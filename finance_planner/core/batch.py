@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+from typing import Any
+from urllib.parse import SplitResult, urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest, HttpResponseBase, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH = "/api/batch/"
+BATCH_MAX_REQUESTS = 20
+# вход и выход работают с куками ответа, которые из пакета не дойдут до клиента
+BATCH_FORBIDDEN_PREFIXES = (BATCH_PATH, "/api/auth/")
+
+
+class BatchSubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField(help_text="Путь API с query string, например /api/accounts/")
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, path: str) -> str:
+        url_path = urlsplit(path).path
+        if not url_path.startswith("/api/") or url_path.startswith(BATCH_FORBIDDEN_PREFIXES):
+            raise serializers.ValidationError("Этот путь нельзя вызвать из пакета")
+        return path
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchSubRequestSerializer(many=True)
+    atomic = serializers.BooleanField(
+        default=False,
+        help_text="Выполнить все запросы в одной транзакции БД и откатить её при первой ошибке",
+    )
+
+    def validate_requests(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if not requests:
+            raise serializers.ValidationError("Нужен хотя бы один запрос")
+        if len(requests) > BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"Не больше {BATCH_MAX_REQUESTS} запросов в одном пакете"
+            )
+        return requests
+
+
+class BatchSubResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponse(serializers.Serializer):
+    responses = BatchSubResponseSerializer(many=True)
+    rolled_back = serializers.BooleanField(
+        help_text="Изменения атомарного пакета откатены из-за ошибки одного из запросов"
+    )
+
+
+@swagger_auto_schema(
+    request_body=BatchRequestSerializer(),
+    methods=[
+        "post",
+    ],
+    responses={200: BatchResponse, 400: "Ошибка"},
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch_view(request: Request):
+    """Выполняет несколько запросов API за один round trip.
+
+    Подзапросы идут через резолвер URL по очереди, от имени уже аутентифицированного
+    пользователя: токен и middleware проверяются один раз на весь пакет. В атомарном пакете
+    первая ошибка (статус 4xx/5xx) откатывает все изменения, а оставшиеся запросы не
+    выполняются и получают статус 424. Исключение подзапроса становится его ответом 500
+    и не роняет весь пакет.
+    """
+    serializer = BatchRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    sub_requests = serializer.validated_data["requests"]
+
+    if not serializer.validated_data["atomic"]:
+        responses = [_dispatch(request, sub_request) for sub_request in sub_requests]
+        return _batch_response(responses, rolled_back=False)
+
+    responses = []
+    with transaction.atomic():
+        for sub_request in sub_requests:
+            responses.append(_dispatch(request, sub_request))
+            if responses[-1]["status"] >= status.HTTP_400_BAD_REQUEST:
+                transaction.set_rollback(True)
+                break
+    skipped = [
+        {"status": status.HTTP_424_FAILED_DEPENDENCY, "body": None}
+        for _ in sub_requests[len(responses) :]
+    ]
+    return _batch_response([*responses, *skipped], rolled_back=_failed(responses))
+
+
+def _batch_response(responses: list[dict[str, Any]], rolled_back: bool) -> Response:
+    return Response(
+        BatchResponse(instance={"responses": responses, "rolled_back": rolled_back}).data,
+        status=status.HTTP_200_OK,
+    )
+
+
+def _failed(responses: list[dict[str, Any]]) -> bool:
+    return any(response["status"] >= status.HTTP_400_BAD_REQUEST for response in responses)
+
+
+def _dispatch(request: Request, sub_request: dict[str, Any]) -> dict[str, Any]:
+    url = urlsplit(sub_request["path"])
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return {"status": status.HTTP_404_NOT_FOUND, "body": {"detail": "Не найдено."}}
+
+    http_request = _build_request(request, sub_request["method"], url, sub_request.get("body"))
+    try:
+        # точка сохранения откатывает частичные записи упавшего подзапроса
+        with transaction.atomic():
+            response = match.func(http_request, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception(f"Batch sub-request {sub_request['method']} {url.path} failed")
+        return {
+            "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "body": {"detail": "Внутренняя ошибка сервера."},
+        }
+    return {"status": response.status_code, "body": _get_body(response)}
+
+
+def _build_request(request: Request, method: str, url: SplitResult, body: Any) -> HttpRequest:
+    content = b"" if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+    http_request = WSGIRequest(
+        {
+            **request.META,
+            "REQUEST_METHOD": method,
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(content)),
+            "wsgi.input": io.BytesIO(content),
+        }
+    )
+    # DRF берёт пользователя отсюда и не проверяет токен повторно, как в APIClient
+    http_request._force_auth_user = request.user  # type: ignore[attr-defined]
+    http_request._force_auth_token = request.auth  # type: ignore[attr-defined]
+    return http_request
+
+
+def _get_body(response: HttpResponseBase) -> Any:
+    if hasattr(response, "data"):
+        return response.data
+    if isinstance(response, StreamingHttpResponse):
+        content = b"".join(response.streaming_content)  # type: ignore[arg-type]
+    else:
+        content = response.content  # type: ignore[attr-defined]
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode(errors="replace")
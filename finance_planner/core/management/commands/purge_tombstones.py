@@ -0,0 +1,14 @@
+from core.models import Tombstone
+from core.sync import TOMBSTONE_RETENTION
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Deletes sync tombstones older than the change feed cursor lifetime."
+
+    def handle(self, *args, **options):
+        deleted, _ = Tombstone.objects.filter(
+            deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION
+        ).delete()
+        self.stdout.write(f"Deleted {deleted} tombstone(s)")
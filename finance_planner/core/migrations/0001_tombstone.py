@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:19
+
+import uuid
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[("accounts", "Счёт"), ("transactions", "Транзакция")],
+                        max_length=20,
+                        verbose_name="Тип сущности",
+                    ),
+                ),
+                ("entity_id", models.UUIDField(verbose_name="ID удалённой сущности")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Время удаления"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tombstones",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удалённая сущность",
+                "verbose_name_plural": "Удалённые сущности",
+                "ordering": ["deleted_at"],
+                "indexes": [
+                    models.Index(fields=["user", "deleted_at"], name="tombstone_user_deleted_idx")
+                ],
+            },
+        ),
+    ]
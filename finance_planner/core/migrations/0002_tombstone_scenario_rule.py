@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_tombstone"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tombstone",
+            name="entity",
+            field=models.CharField(
+                choices=[
+                    ("accounts", "Счёт"),
+                    ("transactions", "Транзакция"),
+                    ("scenario_rules", "Правило сценария"),
+                ],
+                max_length=20,
+                verbose_name="Тип сущности",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from uuid import UUID
+
+from django.db import models
+from django.utils import timezone
+from model_utils.models import UUIDModel
+
+
+class TombstoneEntity(models.TextChoices):
+    ACCOUNT = "accounts", "Счёт"
+    TRANSACTION = "transactions", "Транзакция"
+    SCENARIO_RULE = "scenario_rules", "Правило сценария"
+
+
+class Tombstone(UUIDModel):
+    """След жёсткого удаления для ленты изменений.
+
+    Мягко удаляемые модели отдают удаление через deleted_at, а счета и транзакции удаляются
+    из БД насовсем — клиент узнаёт о них по этим строкам. Так же записываются правила
+    сценариев, которые удаляются каскадом вместе с целевым счётом.
+    """
+
+    user = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="tombstones")
+    entity = models.CharField(
+        max_length=20, choices=TombstoneEntity.choices, verbose_name="Тип сущности"
+    )
+    entity_id = models.UUIDField(verbose_name="ID удалённой сущности")
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Время удаления")
+
+    class Meta:
+        verbose_name = "Удалённая сущность"
+        verbose_name_plural = "Удалённые сущности"
+        ordering = ["deleted_at"]
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="tombstone_user_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.entity_id}"
+
+
+def record_tombstones(entity: TombstoneEntity, rows: Iterable[tuple[int, UUID]]) -> None:
+    """Записывает надгробия одним bulk_create по парам (user_id, entity_id)."""
+    deleted_at = timezone.now()
+    Tombstone.objects.bulk_create(
+        Tombstone(user_id=user_id, entity=entity, entity_id=entity_id, deleted_at=deleted_at)
+        for user_id, entity_id in rows
+    )
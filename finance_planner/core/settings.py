@@ -135,6 +135,7 @@ INSTALLED_APPS = [
     "transactions",
     "scenarios",
     "regular_operations",
+    "loans",
 ]
 
 SWAGGER_SETTINGS = {
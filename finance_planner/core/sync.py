@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from accounts.models import Account
+from accounts.serializers import AccountSerializer
+from core.models import Tombstone, TombstoneEntity
+from django.core import signing
+from django.db.models import QuerySet
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from models import TimeWatchingModel
+from regular_operations.models import RegularOperation
+from regular_operations.serializers import RegularOperationSerializer
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from scenarios.models import Scenario, ScenarioRule
+from scenarios.serializers import ScenarioRuleSerializer, ScenarioSerializer
+from transactions.models import Transaction
+from transactions.serializers import TransactionSerializer
+from users.models import User
+
+
+CURSOR_SALT = "core.sync.cursor"
+# надгробия старше этого срока удаляет purge_tombstones, поэтому и курсоры старше не принимаются
+TOMBSTONE_RETENTION = timedelta(days=90)
+# запись, начатая до выдачи курсора и закоммиченная после, попадёт в следующую выдачу
+CURSOR_OVERLAP = timedelta(seconds=5)
+
+
+@dataclass(frozen=True)
+class SyncEntity:
+    name: str
+    serializer_class: type[serializers.ModelSerializer]
+    get_queryset: Callable[[User], QuerySet[Any]]
+    # жёстко удаляемые строки отдаются через надгробия, мягко удалённые — через deleted_at
+    tombstone: TombstoneEntity | None = None
+
+
+SYNC_ENTITIES = (
+    SyncEntity(
+        "accounts",
+        AccountSerializer,
+        lambda user: Account.objects.filter(user=user),
+        tombstone=TombstoneEntity.ACCOUNT,
+    ),
+    SyncEntity(
+        "regular_operations",
+        RegularOperationSerializer,
+        lambda user: (
+            RegularOperation.available_objects.filter(user=user)
+            .select_related("from_account", "to_account")
+            .prefetch_related("scenario__rules", "scenario__rules__target_account")
+        ),
+    ),
+    SyncEntity(
+        "scenarios",
+        ScenarioSerializer,
+        lambda user: (
+            Scenario.available_objects.filter(user=user)
+            .select_related("operation")
+            .prefetch_related("rules", "rules__target_account")
+        ),
+    ),
+    SyncEntity(
+        "scenario_rules",
+        ScenarioRuleSerializer,
+        lambda user: ScenarioRule.available_objects.filter(scenario__user=user).select_related(
+            "target_account"
+        ),
+        tombstone=TombstoneEntity.SCENARIO_RULE,
+    ),
+    SyncEntity(
+        "transactions",
+        TransactionSerializer,
+        lambda user: Transaction.objects.filter(user=user).select_related(
+            "from_account", "to_account", "scenario_rule"
+        ),
+        tombstone=TombstoneEntity.TRANSACTION,
+    ),
+)
+
+
+def encode_cursor(moment: datetime) -> str:
+    return signing.dumps(moment.isoformat(), salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor: str) -> datetime:
+    return datetime.fromisoformat(signing.loads(cursor, salt=CURSOR_SALT))
+
+
+def build_changes(user: User, since: datetime | None) -> dict[str, dict[str, Any]]:
+    """Созданные, изменённые и удалённые с момента since сущности пользователя.
+
+    Без since отдаются все живые сущности — это первая синхронизация. Число запросов
+    не зависит от числа изменений: по одному на сущность, её мягкие удаления и надгробия.
+    """
+    tombstones: dict[str, list[UUID]] = defaultdict(list)
+    if since is not None:
+        for entity, entity_id in Tombstone.objects.filter(
+            user=user, deleted_at__gte=since
+        ).values_list("entity", "entity_id"):
+            tombstones[entity].append(entity_id)
+
+    changes = {}
+    for entity in SYNC_ENTITIES:
+        rows = entity.get_queryset(user)
+        deleted = list(tombstones[entity.tombstone]) if entity.tombstone is not None else []
+        if issubclass(rows.model, TimeWatchingModel):
+            if since is not None:
+                deleted += rows.filter(deleted_at__gte=since).values_list("id", flat=True)
+            rows = rows.filter(deleted_at__isnull=True)
+        if since is not None:
+            rows = rows.filter(updated_at__gte=since)
+        changes[entity.name] = {
+            "updated": entity.serializer_class(rows, many=True).data,
+            "deleted": deleted,
+        }
+    return changes
+
+
+class ChangesRequestSerializer(serializers.Serializer):
+    cursor = serializers.CharField(
+        required=False, help_text="Курсор из прошлого ответа; без него — полная выгрузка"
+    )
+
+    def validate_cursor(self, cursor: str) -> datetime:
+        try:
+            since = decode_cursor(cursor)
+        except (signing.BadSignature, ValueError) as error:
+            raise serializers.ValidationError("Некорректный курсор") from error
+        if since < timezone.now() - TOMBSTONE_RETENTION:
+            raise serializers.ValidationError("Курсор устарел, нужна полная синхронизация")
+        return since
+
+
+class EntityChangesSerializer(serializers.Serializer):
+    updated = serializers.ListField(
+        child=serializers.DictField(), help_text="Созданные и изменённые сущности"
+    )
+    deleted = serializers.ListField(child=serializers.UUIDField(), help_text="ID удалённых")
+
+
+class ChangesResponse(serializers.Serializer):
+    cursor = serializers.CharField(help_text="Передать в следующий запрос")
+    changes = serializers.DictField(
+        child=EntityChangesSerializer(),
+        help_text="Ключ — тип сущности: " + ", ".join(entity.name for entity in SYNC_ENTITIES),
+    )
+
+
+@swagger_auto_schema(
+    query_serializer=ChangesRequestSerializer(),
+    methods=[
+        "get",
+    ],
+    responses={200: ChangesResponse, 400: "Ошибка"},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def changes_view(request: Request):
+    """Лента изменений для синхронизации клиента.
+
+    Возвращает сущности, созданные, изменённые и удалённые после курсора, и новый курсор.
+    Ответы соседних запросов могут пересекаться на несколько секунд, поэтому клиент
+    применяет изменения идемпотентно.
+    """
+    serializer = ChangesRequestSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+
+    cursor = encode_cursor(timezone.now() - CURSOR_OVERLAP)
+    changes = build_changes(
+        request.user,  # type: ignore[arg-type]
+        serializer.validated_data.get("cursor"),
+    )
+    return Response(
+        ChangesResponse(instance={"cursor": cursor, "changes": changes}).data,
+        status=status.HTTP_200_OK,
+    )
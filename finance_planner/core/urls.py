@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from core.batch import batch_view
+from core.sync import changes_view
 from django.contrib import admin
 from django.http import HttpResponse
 from django.urls import include, path
@@ -65,9 +67,12 @@ urlpatterns = [
     # Django admin login для Swagger UI
     path("accounts/login/", simple_login_view, name="django_login"),
     path("api/", include("auth.urls")),
+    path("api/batch/", batch_view, name="batch"),
+    path("api/changes/", changes_view, name="changes"),
     path("api/users/", include("users.urls")),
     path("api/accounts/", include("accounts.urls")),
     path("api/transactions/", include("transactions.urls")),
     path("api/scenarios/", include("scenarios.urls")),
     path("api/regular-operations/", include("regular_operations.urls")),
+    path("api/loans/", include("loans.urls")),
 ]
@@ -0,0 +1,15 @@
+from django.contrib import admin
+from loans.models import Loan, LoanPayment
+
+
+class LoanPaymentInline(admin.TabularInline):
+    model = LoanPayment
+    extra = 0
+
+
+@admin.register(Loan)
+class LoanAdmin(admin.ModelAdmin):
+    list_display = ["account", "user", "principal", "interest_rate", "term_months"]
+    search_fields = ["account__name", "user__username"]
+    inlines = [LoanPaymentInline]
+    readonly_fields = ["created_at", "updated_at"]
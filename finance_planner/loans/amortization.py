@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+import math
+
+from accounts.models import Account
+from dateutil.relativedelta import relativedelta
+from django.db.models import QuerySet
+from django.utils import timezone
+from loans.models import Loan, LoanPayment
+import numpy as np
+from transactions.calculation import BULK_CREATE_BATCH_SIZE, from_cents, to_cents
+from transactions.models import Transaction, TransactionType, delete_transactions
+from transactions.summaries import iter_months, refresh_monthly_summaries
+
+
+MONTHS_IN_YEAR = 12
+# запас на погрешность float при вычислении срока через логарифм
+TERM_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """Аннуитетный график в копейках: i-й элемент массивов — i-й платёж."""
+
+    dates: list[date]
+    amounts: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    remaining: np.ndarray
+
+    def to_payments(self, loan: Loan) -> list[LoanPayment]:
+        return [
+            LoanPayment(
+                loan=loan,
+                date=day,
+                amount=from_cents(amount),
+                interest=from_cents(interest),
+                principal=from_cents(principal),
+                remaining=from_cents(remaining),
+            )
+            for day, amount, interest, principal, remaining in zip(
+                self.dates,
+                self.amounts.tolist(),
+                self.interest.tolist(),
+                self.principal.tolist(),
+                self.remaining.tolist(),
+                strict=True,
+            )
+        ]
+
+
+def get_monthly_payment(principal: Decimal, annual_rate: Decimal, term_months: int) -> Decimal:
+    """Аннуитетный платёж, округлённый вверх до копейки, чтобы не выйти за срок."""
+    balance = to_cents(principal)
+    rate = _get_monthly_rate(annual_rate)
+    if not rate:
+        return from_cents(math.ceil(balance / term_months))
+    return from_cents(math.ceil(balance * rate / (1 - (1 + rate) ** -term_months)))
+
+
+def build_amortization_schedule(
+    principal: Decimal,
+    annual_rate: Decimal,
+    monthly_payment: Decimal,
+    first_payment_date: date,
+    *,
+    first_month: int = 0,
+) -> AmortizationSchedule:
+    """График до полного погашения principal платежами monthly_payment — без цикла по месяцам.
+
+    Остаток после k-го платежа считается в закрытой форме B·q^k − A·(q^k − 1)/r, где q = 1 + r,
+    проценты — от округлённого остатка перед платежом. Последний платёж закрывает долг до
+    копейки. Даты идут от first_payment_date, first_month — номер первого месяца в этой сетке.
+    """
+    balance = to_cents(principal)
+    payment = to_cents(monthly_payment)
+    rate = _get_monthly_rate(annual_rate)
+    term = _get_term(balance, payment, rate)
+
+    months = np.arange(1, term + 1)
+    if rate:
+        growth = (1 + rate) ** months
+        remaining_float = balance * growth - payment * (growth - 1) / rate
+    else:
+        remaining_float = balance - payment * months.astype(np.float64)
+    remaining = np.maximum(np.rint(remaining_float), 0).astype(np.int64)
+    remaining[-1] = 0
+    previous = np.concatenate(([balance], remaining[:-1]))
+    # округление может обнулить остаток на платёж раньше — пустые хвостовые строки отбрасываются
+    paid = previous > 0
+    remaining, previous = remaining[paid], previous[paid]
+    interest = np.rint(previous * rate).astype(np.int64)
+    principal_parts = previous - remaining
+
+    return AmortizationSchedule(
+        dates=[
+            first_payment_date + relativedelta(months=first_month + month)
+            for month in range(len(remaining))
+        ],
+        amounts=principal_parts + interest,
+        interest=interest,
+        principal=principal_parts,
+        remaining=remaining,
+    )
+
+
+def get_loan_schedule(loan: Loan) -> AmortizationSchedule:
+    return build_amortization_schedule(
+        loan.principal, loan.interest_rate, loan.monthly_payment, loan.first_payment_date
+    )
+
+
+def save_payments(loan: Loan, payments: Sequence[LoanPayment]) -> list[LoanPayment]:
+    """Записывает платежи и плановые транзакции под них двумя bulk_create.
+
+    На долговой счёт переводится только основной долг, чтобы его прогноз сходился к нулю,
+    а проценты списываются со счёта платежей расходом.
+    """
+    saved = LoanPayment.objects.bulk_create(payments, batch_size=BULK_CREATE_BATCH_SIZE)
+    transactions = []
+    for payment in saved:
+        if payment.principal:
+            transactions.append(
+                _build_transaction(
+                    loan,
+                    payment,
+                    TransactionType.TRANSFER,
+                    payment.principal,
+                    to_account=loan.account,
+                )
+            )
+        if payment.interest:
+            transactions.append(
+                _build_transaction(loan, payment, TransactionType.EXPENSE, payment.interest)
+            )
+    Transaction.objects.bulk_create(transactions, batch_size=BULK_CREATE_BATCH_SIZE)
+    refresh_monthly_summaries(loan.user, [payment.date for payment in saved])
+    return saved
+
+
+def get_remaining_principal(loan: Loan, day: date) -> Decimal:
+    """Остаток основного долга после всех платежей по day включительно."""
+    last_payment = LoanPayment.objects.filter(loan=loan, date__lte=day).last()
+    if last_payment is None:
+        return loan.principal
+    return last_payment.remaining
+
+
+def get_payments_after(loan: Loan, day: date) -> QuerySet[LoanPayment]:
+    return LoanPayment.objects.filter(loan=loan, date__gt=day)
+
+
+def apply_extra_payment(loan: Loan, amount: Decimal, day: date) -> list[LoanPayment]:
+    """Досрочное погашение: переписывается только хвост графика после day.
+
+    Ежемесячный платёж сохраняется, сокращается срок. Платежи до day и их транзакции не
+    трогаются, хвост удаляется и создаётся заново одним bulk_create.
+    """
+    remaining = get_remaining_principal(loan, day) - amount
+    tail = get_payments_after(loan, day)
+    next_due_date = tail.filter(extra=False).values_list("date", flat=True).first()
+    delete_transactions(Transaction.objects.filter(loan_payment__in=tail, confirmed=False))
+    tail.delete()
+    refresh_monthly_summaries(loan.user, iter_months(day, timezone.localdate()))
+
+    payments = [
+        LoanPayment(
+            loan=loan,
+            date=day,
+            amount=amount,
+            interest=Decimal("0"),
+            principal=amount,
+            remaining=remaining,
+            extra=True,
+        )
+    ]
+    if remaining > 0 and next_due_date is not None:
+        schedule = build_amortization_schedule(
+            remaining,
+            loan.interest_rate,
+            loan.monthly_payment,
+            loan.first_payment_date,
+            first_month=_months_between(loan.first_payment_date, next_due_date),
+        )
+        payments.extend(schedule.to_payments(loan))
+    return save_payments(loan, payments)
+
+
+def _get_monthly_rate(annual_rate: Decimal) -> float:
+    return float(annual_rate) / 100 / MONTHS_IN_YEAR
+
+
+def _get_term(balance: int, payment: int, rate: float) -> int:
+    if payment <= balance * rate:
+        raise ValueError("Платёж не покрывает проценты по кредиту")
+    if not rate:
+        return math.ceil(balance / payment)
+    term = -math.log(1 - balance * rate / payment) / math.log(1 + rate)
+    return max(1, math.ceil(term - TERM_EPSILON))
+
+
+def _months_between(start: date, current: date) -> int:
+    return (current.year - start.year) * MONTHS_IN_YEAR + current.month - start.month
+
+
+def _build_transaction(
+    loan: Loan,
+    payment: LoanPayment,
+    transaction_type: TransactionType,
+    amount: Decimal,
+    to_account: Account | None = None,
+) -> Transaction:
+    return Transaction(
+        user=loan.user,
+        date=payment.date,
+        planned_date=payment.date,
+        type=transaction_type,
+        amount=amount,
+        from_account=loan.payer_account,
+        to_account=to_account,
+        confirmed=False,
+        description=_get_description(payment, transaction_type),
+        loan_payment=payment,
+    )
+
+
+def _get_description(payment: LoanPayment, transaction_type: TransactionType) -> str:
+    if payment.extra:
+        return "Досрочное погашение кредита"
+    if transaction_type == TransactionType.EXPENSE:
+        return f"Проценты по кредиту: {payment.interest}"
+    return f"Платёж по кредиту: основной долг {payment.principal}"
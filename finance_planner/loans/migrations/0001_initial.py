@@ -0,0 +1,156 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:42
+
+import uuid
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("accounts", "0008_account_interest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Loan",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "created_at",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="created_at"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="updated_at"
+                    ),
+                ),
+                ("deleted_at", models.DateTimeField(blank=True, default=None, null=True)),
+                (
+                    "principal",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=19,
+                        validators=[django.core.validators.MinValueValidator(0.01)],
+                        verbose_name="Сумма кредита",
+                    ),
+                ),
+                (
+                    "interest_rate",
+                    models.DecimalField(
+                        decimal_places=4,
+                        max_digits=7,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                        verbose_name="Годовая процентная ставка, %",
+                    ),
+                ),
+                (
+                    "term_months",
+                    models.PositiveIntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)],
+                        verbose_name="Срок, месяцев",
+                    ),
+                ),
+                ("first_payment_date", models.DateField(verbose_name="Дата первого платежа")),
+                (
+                    "monthly_payment",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=19, verbose_name="Ежемесячный платёж"
+                    ),
+                ),
+                (
+                    "account",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="loan",
+                        to="accounts.account",
+                        verbose_name="Долговой счёт",
+                    ),
+                ),
+                (
+                    "payer_account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="paid_loans",
+                        to="accounts.account",
+                        verbose_name="Счёт списания платежей",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="loans",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Кредит",
+                "verbose_name_plural": "Кредиты",
+            },
+        ),
+        migrations.CreateModel(
+            name="LoanPayment",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Дата платежа")),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=19, verbose_name="Сумма платежа"
+                    ),
+                ),
+                (
+                    "interest",
+                    models.DecimalField(decimal_places=2, max_digits=19, verbose_name="Проценты"),
+                ),
+                (
+                    "principal",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=19, verbose_name="Погашение основного долга"
+                    ),
+                ),
+                (
+                    "remaining",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=19, verbose_name="Остаток долга после платежа"
+                    ),
+                ),
+                ("extra", models.BooleanField(default=False, verbose_name="Досрочный платёж")),
+                (
+                    "loan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payments",
+                        to="loans.loan",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Платёж по кредиту",
+                "verbose_name_plural": "Платежи по кредиту",
+                "ordering": ["date", "extra"],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_account_interest"),
+        ("loans", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="loan",
+            name="account",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="debt_loans",
+                to="accounts.account",
+                verbose_name="Долговой счёт",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="loan",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("account",),
+                name="loan_unique_active_account",
+            ),
+        ),
+    ]
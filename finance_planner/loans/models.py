@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from django.core.validators import MinValueValidator
+from django.db import models
+from django.db.models import Q
+from model_utils.models import UUIDModel
+from models import TimeWatchingModel
+from users.models import User
+
+
+class Loan(UUIDModel, TimeWatchingModel):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="loans")
+    account = models.ForeignKey(
+        "accounts.Account",
+        on_delete=models.CASCADE,
+        related_name="debt_loans",
+        verbose_name="Долговой счёт",
+    )
+    payer_account = models.ForeignKey(
+        "accounts.Account",
+        on_delete=models.CASCADE,
+        related_name="paid_loans",
+        verbose_name="Счёт списания платежей",
+    )
+    principal = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        validators=[MinValueValidator(0.01)],
+        verbose_name="Сумма кредита",
+    )
+    interest_rate = models.DecimalField(
+        max_digits=7,
+        decimal_places=4,
+        validators=[MinValueValidator(0)],
+        verbose_name="Годовая процентная ставка, %",
+    )
+    term_months = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)], verbose_name="Срок, месяцев"
+    )
+    first_payment_date = models.DateField(verbose_name="Дата первого платежа")
+    monthly_payment = models.DecimalField(
+        max_digits=19, decimal_places=2, verbose_name="Ежемесячный платёж"
+    )
+
+    class Meta:
+        verbose_name = "Кредит"
+        verbose_name_plural = "Кредиты"
+        constraints = [
+            # удалённый кредит остаётся в БД мягко и не мешает завести новый на тот же счёт
+            models.UniqueConstraint(
+                fields=["account"],
+                condition=Q(deleted_at__isnull=True),
+                name="loan_unique_active_account",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.account} {self.principal}"
+
+
+class LoanPayment(UUIDModel):
+    loan = models.ForeignKey(Loan, on_delete=models.CASCADE, related_name="payments")
+    date = models.DateField(verbose_name="Дата платежа")
+    amount = models.DecimalField(max_digits=19, decimal_places=2, verbose_name="Сумма платежа")
+    interest = models.DecimalField(max_digits=19, decimal_places=2, verbose_name="Проценты")
+    principal = models.DecimalField(
+        max_digits=19, decimal_places=2, verbose_name="Погашение основного долга"
+    )
+    remaining = models.DecimalField(
+        max_digits=19, decimal_places=2, verbose_name="Остаток долга после платежа"
+    )
+    extra = models.BooleanField(default=False, verbose_name="Досрочный платёж")
+
+    class Meta:
+        verbose_name = "Платёж по кредиту"
+        verbose_name_plural = "Платежи по кредиту"
+        # досрочный платёж в день планового идёт после него
+        ordering = ["date", "extra"]
+
+    def __str__(self) -> str:
+        return f"{self.date} {self.amount}"
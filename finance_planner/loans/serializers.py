@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from accounts.models import Account, AccountType
+from loans.models import Loan, LoanPayment
+from rest_framework import serializers
+
+
+class LoanPaymentSerializer(serializers.ModelSerializer):
+    transactions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = LoanPayment
+        fields = [
+            "id",
+            "date",
+            "amount",
+            "interest",
+            "principal",
+            "remaining",
+            "extra",
+            "transactions",
+        ]
+
+
+class LoanSerializer(serializers.ModelSerializer):
+    account_name = serializers.CharField(source="account.name", read_only=True)
+
+    class Meta:
+        model = Loan
+        fields = [
+            "id",
+            "account",
+            "account_name",
+            "payer_account",
+            "principal",
+            "interest_rate",
+            "term_months",
+            "first_payment_date",
+            "monthly_payment",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class LoanScheduleRequestSerializer(serializers.Serializer):
+    principal = serializers.DecimalField(max_digits=19, decimal_places=2, min_value=Decimal("0.01"))
+    interest_rate = serializers.DecimalField(
+        max_digits=7, decimal_places=4, min_value=Decimal("0"), help_text="Годовая ставка, %"
+    )
+    term_months = serializers.IntegerField(min_value=1, max_value=1200)
+    first_payment_date = serializers.DateField()
+
+
+class LoanCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Loan
+        fields = [
+            "id",
+            "account",
+            "payer_account",
+            "principal",
+            "interest_rate",
+            "term_months",
+            "first_payment_date",
+        ]
+        read_only_fields = ["id"]
+
+    def validate_account(self, account: Account) -> Account:
+        request = self.context.get("request")
+        if account.user_id != request.user.id:  # type: ignore[union-attr]
+            raise serializers.ValidationError("Счет должен принадлежать текущему пользователю")
+        if account.type != AccountType.DEBT:
+            raise serializers.ValidationError("Кредит привязывается только к долговому счёту")
+        if Loan.objects.filter(account=account).exists():
+            raise serializers.ValidationError("У счёта уже есть кредит")
+        return account
+
+    def validate_payer_account(self, account: Account) -> Account:
+        request = self.context.get("request")
+        if account.user_id != request.user.id:  # type: ignore[union-attr]
+            raise serializers.ValidationError("Счет должен принадлежать текущему пользователю")
+        return account
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs["account"] == attrs["payer_account"]:
+            raise serializers.ValidationError(
+                {"payer_account": "Платежи не могут идти с самого долгового счёта"}
+            )
+        return attrs
+
+
+class ExtraPaymentRequestSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    amount = serializers.DecimalField(max_digits=19, decimal_places=2, min_value=Decimal("0.01"))
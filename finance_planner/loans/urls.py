@@ -0,0 +1,8 @@
+from loans.views import LoanViewSet
+from rest_framework.routers import SimpleRouter
+
+
+router = SimpleRouter()
+router.register("", LoanViewSet, basename="loan")
+
+urlpatterns = router.urls
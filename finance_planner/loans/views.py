@@ -0,0 +1,149 @@
+from datetime import date
+
+from accounts.low_balance import refresh_low_balance_dates
+from django.db import transaction
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from drf_yasg.utils import swagger_auto_schema
+from loans.amortization import (
+    apply_extra_payment,
+    get_loan_schedule,
+    get_monthly_payment,
+    get_payments_after,
+    get_remaining_principal,
+    save_payments,
+)
+from loans.models import Loan
+from loans.serializers import (
+    ExtraPaymentRequestSerializer,
+    LoanCreateSerializer,
+    LoanPaymentSerializer,
+    LoanScheduleRequestSerializer,
+    LoanSerializer,
+)
+from rest_framework import mixins, permissions, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+from transactions.models import delete_future_planned_transactions
+
+
+class LoanViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Loan.objects.filter(user=self.request.user).select_related(
+            "account", "payer_account"
+        )
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return LoanCreateSerializer
+        return LoanSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        with transaction.atomic():
+            loan: Loan = serializer.save(
+                user=request.user,
+                monthly_payment=get_monthly_payment(
+                    params["principal"], params["interest_rate"], params["term_months"]
+                ),
+            )
+            save_payments(loan, get_loan_schedule(loan).to_payments(loan))
+            refresh_low_balance_dates([loan.account_id, loan.payer_account_id])  # type: ignore[attr-defined]
+        return Response(
+            LoanSerializer(loan, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    def perform_destroy(self, instance: Loan):
+        with transaction.atomic():
+            delete_future_planned_transactions(Q(loan_payment__loan=instance))
+            instance.delete()
+            refresh_low_balance_dates([instance.account_id, instance.payer_account_id])  # type: ignore[attr-defined]
+
+    @swagger_auto_schema(
+        methods=[
+            "get",
+        ],
+        responses={200: LoanPaymentSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="schedule")
+    def schedule(self, request: Request, pk: str):
+        """График платежей кредита с разбивкой на проценты и основной долг."""
+        loan = get_object_or_404(self.get_queryset(), pk=pk)
+        return Response(
+            LoanPaymentSerializer(loan.payments.prefetch_related("transactions"), many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        request_body=LoanScheduleRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: LoanPaymentSerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["post"], url_path="preview")
+    def preview(self, request: Request):
+        """Рассчитать график по параметрам кредита, ничего не записывая."""
+        serializer = LoanScheduleRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        loan = Loan(
+            principal=params["principal"],
+            interest_rate=params["interest_rate"],
+            term_months=params["term_months"],
+            first_payment_date=params["first_payment_date"],
+            monthly_payment=get_monthly_payment(
+                params["principal"], params["interest_rate"], params["term_months"]
+            ),
+        )
+        payments = get_loan_schedule(loan).to_payments(loan)
+        return Response(
+            LoanPaymentSerializer(payments, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        request_body=ExtraPaymentRequestSerializer(),
+        methods=[
+            "post",
+        ],
+        responses={200: LoanPaymentSerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=True, methods=["post"], url_path="extra-payment")
+    def extra_payment(self, request: Request, pk: str):
+        """Досрочное погашение: пересчитать оставшийся график с сохранением платежа."""
+        loan = get_object_or_404(self.get_queryset(), pk=pk)
+        serializer = ExtraPaymentRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        day: date = serializer.validated_data["date"]
+        amount = serializer.validated_data["amount"]
+
+        with transaction.atomic():
+            if amount > get_remaining_principal(loan, day):
+                raise serializers.ValidationError(
+                    {"amount": "Сумма больше остатка основного долга"}
+                )
+            if get_payments_after(loan, day).filter(transactions__confirmed=True).exists():
+                raise serializers.ValidationError(
+                    {"date": "После этой даты уже есть подтверждённые платежи"}
+                )
+            apply_extra_payment(loan, amount, day)
+            refresh_low_balance_dates([loan.account_id, loan.payer_account_id])
+
+        return Response(
+            LoanPaymentSerializer(loan.payments.prefetch_related("transactions"), many=True).data,
+            status=status.HTTP_200_OK,
+        )
@@ -71,4 +71,5 @@ class TimeWatchingModel(models.Model):
 
     def restore(self) -> None:
         self.deleted_at = None
-        self.save(update_fields={"deleted_at"})
+        # восстановленная сущность должна снова попасть в ленту изменений
+        self.save(update_fields={"deleted_at", "updated_at"})
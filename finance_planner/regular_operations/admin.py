@@ -1,5 +1,5 @@
 from django.contrib import admin
-from regular_operations.models import RegularOperation
+from regular_operations.models import RegularOperation, RegularOperationException
 
 
 @admin.register(RegularOperation)
@@ -18,3 +18,11 @@ class RegularOperationAdmin(admin.ModelAdmin):
     search_fields = ("title", "description")
     ordering = ("-created_at",)
     autocomplete_fields = ("user", "from_account", "to_account")
+
+
+@admin.register(RegularOperationException)
+class RegularOperationExceptionAdmin(admin.ModelAdmin):
+    list_display = ("operation", "date", "amount", "skip")
+    list_filter = ("skip",)
+    ordering = ("-date",)
+    autocomplete_fields = ("operation",)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from regular_operations.models import RegularOperation
+from transactions.calculation import refresh_next_occurrences
+
+
+class Command(BaseCommand):
+    help = "Moves next_occurrence of regular operations forward to today."
+
+    def handle(self, *args, **options):
+        # свежие значения не трогаются: устаревают только даты в прошлом и ещё не заполненные
+        operations = RegularOperation.objects.filter(
+            Q(next_occurrence__lt=timezone.localdate()) | Q(next_occurrence__isnull=True)
+        ).prefetch_related("exceptions")
+        refresh_next_occurrences(operations)
+        self.stdout.write(f"Checked {len(operations)} regular operation(s)")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:19
+
+from decimal import Decimal
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("regular_operations", "0005_remove_regularoperation_is_active_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="regularoperation",
+            name="amount_deviation",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                max_digits=19,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0)],
+                verbose_name="Стандартное отклонение суммы",
+            ),
+        ),
+        migrations.AddField(
+            model_name="regularoperation",
+            name="probability",
+            field=models.DecimalField(
+                decimal_places=4,
+                default=Decimal("1"),
+                max_digits=5,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(1),
+                ],
+                verbose_name="Вероятность повторения",
+            ),
+        ),
+    ]
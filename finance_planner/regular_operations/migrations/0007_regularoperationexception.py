@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:48
+
+import uuid
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("regular_operations", "0006_regularoperation_amount_deviation_probability"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegularOperationException",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Дата повторения")),
+                (
+                    "amount",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=19,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(0.01)],
+                        verbose_name="Сумма вместо суммы операции",
+                    ),
+                ),
+                ("skip", models.BooleanField(default=False, verbose_name="Пропустить повторение")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "operation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exceptions",
+                        to="regular_operations.regularoperation",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Исключение регулярной операции",
+                "verbose_name_plural": "Исключения регулярных операций",
+                "ordering": ["date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("operation", "date"), name="regular_operation_exception_unique_date"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("regular_operations", "0007_regularoperationexception"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="regularoperation",
+            name="recurrence",
+            field=models.CharField(
+                blank=True,
+                help_text="Например, FREQ=MONTHLY;BYMONTHDAY=15,-1 — используется при типе custom",
+                max_length=255,
+                verbose_name="Правило повторения (RFC 5545)",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="regularoperation",
+            name="period_type",
+            field=models.CharField(
+                choices=[
+                    ("day", "Ежедневно"),
+                    ("week", "Еженедельно"),
+                    ("month", "Ежемесячно"),
+                    ("custom", "По правилу повторения"),
+                ],
+                max_length=20,
+                verbose_name="Периодичность",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("regular_operations", "0008_regularoperation_recurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="regularoperation",
+            name="next_occurrence",
+            field=models.DateField(
+                blank=True,
+                db_index=True,
+                help_text="Не позже реального ближайшего повторения: обновляется при изменениях и расчёте",
+                null=True,
+                verbose_name="Ближайшее повторение",
+            ),
+        ),
+    ]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from datetime import date
+from decimal import Decimal
+from typing import Any
 
-from django.core.validators import MinValueValidator
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import Q
 from model_utils.models import UUIDModel
 from models import SoftDeletableModelManager, TimeWatchingModel
+from transactions.models import delete_future_planned_transactions
 
 
 class RegularOperationType(models.TextChoices):
@@ -17,6 +21,7 @@ class RegularOperationPeriodType(models.TextChoices):
     DAY = "day", "Ежедневно"
     WEEK = "week", "Еженедельно"
     MONTH = "month", "Ежемесячно"
+    CUSTOM = "custom", "По правилу повторения"
 
 
 class RegularOperation(UUIDModel, TimeWatchingModel):
@@ -62,7 +67,35 @@ class RegularOperation(UUIDModel, TimeWatchingModel):
         validators=[MinValueValidator(1)],
         verbose_name="Интервал",
     )
+    recurrence = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Правило повторения (RFC 5545)",
+        help_text="Например, FREQ=MONTHLY;BYMONTHDAY=15,-1 — используется при типе custom",
+    )
     active_before = models.DateField(default=date.max, verbose_name="Активна")
+    next_occurrence = models.DateField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name="Ближайшее повторение",
+        help_text="Не позже реального ближайшего повторения: обновляется при изменениях и расчёте",
+    )
+    amount_deviation = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        verbose_name="Стандартное отклонение суммы",
+    )
+    probability = models.DecimalField(
+        max_digits=5,
+        decimal_places=4,
+        default=Decimal("1"),
+        validators=[MinValueValidator(0), MaxValueValidator(1)],
+        verbose_name="Вероятность повторения",
+    )
 
     class Meta:
         verbose_name = "Регулярная операция"
@@ -74,3 +107,48 @@ class RegularOperation(UUIDModel, TimeWatchingModel):
 
     def __str__(self) -> str:
         return f"{self.title} ({self.get_type_display()})"
+
+    def delete(self, hard: bool = False, **kwargs: Any):  # type: ignore[override]
+        with transaction.atomic():
+            # вместе с операцией уходят и её будущие переводы по правилам сценария
+            delete_future_planned_transactions(
+                Q(operation=self) | Q(scenario_rule__scenario__operation=self)
+            )
+            if not hard:
+                self.next_occurrence = None
+                RegularOperation.available_objects.filter(pk=self.pk).update(next_occurrence=None)
+            return super().delete(hard=hard, **kwargs)
+
+
+class RegularOperationException(UUIDModel):
+    """Исключение для одного повторения операции: пропуск или другая сумма."""
+
+    operation = models.ForeignKey(
+        RegularOperation, on_delete=models.CASCADE, related_name="exceptions"
+    )
+    date = models.DateField(verbose_name="Дата повторения")
+    amount = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0.01)],
+        verbose_name="Сумма вместо суммы операции",
+    )
+    skip = models.BooleanField(default=False, verbose_name="Пропустить повторение")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Исключение регулярной операции"
+        verbose_name_plural = "Исключения регулярных операций"
+        # генератор повторений сливает исключения с датами за один проход
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["operation", "date"], name="regular_operation_exception_unique_date"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.operation_id} {self.date}"  # type: ignore[attr-defined]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time
+from functools import lru_cache
+import threading
+
+from dateutil.rrule import rrule, rruleset, rrulestr
+
+
+SCHEDULE_CACHE_SIZE = 1024
+
+
+class RecurrenceSchedule:
+    """Скомпилированное правило повторения: отсортированные даты, дописываемые по запросу.
+
+    Даты генерируются один раз и только до самой дальней запрошенной границы, поэтому
+    повторный запрос окна стоит двоичного поиска и копирования попавших в него дат.
+    """
+
+    def __init__(self, rule: rrule | rruleset) -> None:
+        self._pending = iter(rule)
+        self._dates: list[date] = []
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def between(self, low: date, high: date) -> list[date]:
+        """Даты повторений в [low, high]."""
+        self._extend(high)
+        return self._dates[bisect_left(self._dates, low) : bisect_right(self._dates, high)]
+
+    def count(self, low: date, high: date) -> int:
+        """Число повторений в [low, high]."""
+        self._extend(high)
+        return max(0, bisect_right(self._dates, high) - bisect_left(self._dates, low))
+
+    def first(self, low: date) -> date | None:
+        """Первое повторение не раньше low или None, если правило исчерпано."""
+        self._extend(low)
+        index = bisect_left(self._dates, low)
+        return self._dates[index] if index < len(self._dates) else None
+
+    def _extend(self, high: date) -> None:
+        with self._lock:
+            while not self._exhausted and (not self._dates or self._dates[-1] < high):
+                occurrence = next(self._pending, None)
+                if occurrence is None:
+                    self._exhausted = True
+                else:
+                    self._dates.append(occurrence.date())
+
+
+def parse_recurrence(recurrence: str, start_date: date) -> rrule | rruleset:
+    """Разбирает правило в формате RFC 5545 (RRULE, EXDATE и т. д.) от даты начала операции."""
+    return rrulestr(recurrence, dtstart=datetime.combine(start_date, time.min))
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def get_schedule(recurrence: str, start_date: date) -> RecurrenceSchedule:
+    """Расписание из кэша процесса: правило разбирается один раз на текст и дату начала."""
+    return RecurrenceSchedule(parse_recurrence(recurrence, start_date))
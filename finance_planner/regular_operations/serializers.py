@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+from datetime import date
 from typing import Any
 
-from regular_operations.models import RegularOperation, RegularOperationType
+from regular_operations.models import (
+    RegularOperation,
+    RegularOperationException,
+    RegularOperationPeriodType,
+    RegularOperationType,
+)
+from regular_operations.recurrence import parse_recurrence
 from rest_framework import serializers
 from scenarios.models import Scenario
 from scenarios.serializers import ScenarioRuleSerializer
+from serializers import StartEndInputSerializer
+from transactions.calculation import count_transaction_days
 
 
 class RegularOperationScenarioSerializer(serializers.ModelSerializer):
@@ -46,7 +55,11 @@ class RegularOperationSerializer(serializers.ModelSerializer):
             "end_date",
             "period_type",
             "period_interval",
+            "recurrence",
             "active_before",
+            "next_occurrence",
+            "amount_deviation",
+            "probability",
             "scenario",
             "created_at",
             "updated_at",
@@ -55,6 +68,7 @@ class RegularOperationSerializer(serializers.ModelSerializer):
             "id",
             "from_account_name",
             "to_account_name",
+            "next_occurrence",
             "scenario",
             "created_at",
             "updated_at",
@@ -75,7 +89,10 @@ class RegularOperationCreateSerializer(serializers.ModelSerializer):
             "end_date",
             "period_type",
             "period_interval",
+            "recurrence",
             "active_before",
+            "amount_deviation",
+            "probability",
         ]
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:  # noqa: PLR0912
@@ -100,6 +117,12 @@ class RegularOperationCreateSerializer(serializers.ModelSerializer):
                 {"type": f"Недопустимый тип операции: '{operation_type}'"}
             )
 
+        self._validate_recurrence(
+            self._get_field_value("period_type", attrs),
+            self._get_field_value("recurrence", attrs) or "",
+            start_date,
+        )
+
         if start_date and end_date and end_date <= start_date:
             raise serializers.ValidationError(
                 {"end_date": "Дата окончания должна быть больше или равна дате начала"}
@@ -143,6 +166,27 @@ class RegularOperationCreateSerializer(serializers.ModelSerializer):
                 {"from_account": "Счет списания должен принадлежать текущему пользователю"}
             )
 
+    @staticmethod
+    def _validate_recurrence(period_type: str, recurrence: str, start_date: Any | None) -> None:
+        if period_type != RegularOperationPeriodType.CUSTOM:
+            if recurrence:
+                raise serializers.ValidationError(
+                    {"recurrence": "Правило повторения задаётся только для типа custom"}
+                )
+            return
+        if not recurrence:
+            raise serializers.ValidationError(
+                {"recurrence": "Для типа custom нужно указать правило повторения"}
+            )
+        if start_date is None:
+            return
+        try:
+            parse_recurrence(recurrence, start_date.date())
+        except (ValueError, TypeError) as e:
+            raise serializers.ValidationError(
+                {"recurrence": f"Некорректное правило повторения: {e}"}
+            ) from e
+
     def _get_field_value(self, field: str, attrs: dict[str, Any]):
         if field in attrs:
             return attrs[field]
@@ -165,3 +209,64 @@ class RegularOperationUpdateSerializer(RegularOperationCreateSerializer):
                 {"period_interval": "Нельзя менять интервал повторения"}
             )
         return super().validate(attrs)
+
+
+class RegularOperationExceptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RegularOperationException
+        fields = ["id", "date", "amount", "skip"]
+        read_only_fields = ["id"]
+
+    def validate_date(self, day: date) -> date:
+        operation: RegularOperation = self.context["operation"]
+        if operation.end_date is not None and day > operation.end_date.date():
+            raise serializers.ValidationError("Дата позже окончания операции")
+        if not count_transaction_days(
+            operation.start_date.date(),
+            operation.deleted_at.date() if operation.deleted_at else None,
+            day,
+            day,
+            operation.period_type,
+            operation.period_interval,
+            operation.recurrence,
+        ):
+            raise serializers.ValidationError("В эту дату нет повторения операции")
+        return day
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs.get("skip", False) == (attrs.get("amount") is not None):
+            raise serializers.ValidationError(
+                {"amount": "Нужно указать либо сумму повторения, либо пропуск"}
+            )
+        return attrs
+
+
+class VarianceRequestSerializer(StartEndInputSerializer):
+    operations = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Только эти операции (по умолчанию — все)",
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        start_date, end_date = attrs.get("start_date"), attrs.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError(
+                {"end_date": "Дата окончания должна быть не раньше даты начала"}
+            )
+        return attrs
+
+
+class VarianceRowSerializer(serializers.Serializer):
+    operation = serializers.UUIDField()
+    title = serializers.CharField()
+    month = serializers.DateField(help_text="Первый день месяца плановых дат")
+    planned_total = serializers.DecimalField(max_digits=19, decimal_places=2)
+    actual_total = serializers.DecimalField(max_digits=19, decimal_places=2)
+    variance = serializers.DecimalField(
+        max_digits=19, decimal_places=2, help_text="Факт минус план"
+    )
+    planned_count = serializers.IntegerField()
+    confirmed_count = serializers.IntegerField()
+    missed_count = serializers.IntegerField()
+    late_count = serializers.IntegerField()
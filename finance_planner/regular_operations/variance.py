@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+from regular_operations.models import RegularOperationException
+from transactions.models import Transaction
+from users.models import User
+
+
+VARIANCE_DEFAULT_MONTHS = 3
+
+
+def build_variance_report(
+    user: User,
+    start_date: date,
+    end_date: date,
+    operation_ids: Collection[UUID] | None = None,
+) -> list[dict[str, Any]]:
+    """План и факт по регулярным операциям помесячно одним агрегирующим запросом.
+
+    Каждая строка операции с planned_date в окне — одно повторение. Плановая сумма берётся из
+    исключения на эту дату или из операции, фактическая — сумма подтверждённых строк.
+    Пропущенные — неподтверждённые повторения до сегодняшнего дня, опоздавшие —
+    подтверждённые позже плановой даты.
+    """
+    today = timezone.localdate()
+    exception_amount = RegularOperationException.objects.filter(
+        operation=OuterRef("operation"), date=OuterRef("planned_date"), amount__isnull=False
+    ).values("amount")[:1]
+    transactions = Transaction.objects.filter(
+        user=user,
+        operation__isnull=False,
+        planned_date__gte=start_date,
+        planned_date__lte=end_date,
+    )
+    if operation_ids is not None:
+        transactions = transactions.filter(operation_id__in=operation_ids)
+
+    confirmed = Q(confirmed=True)
+    rows = (
+        transactions.annotate(
+            month=TruncMonth("planned_date"),
+            planned_amount=Coalesce(
+                Subquery(exception_amount),
+                F("operation__amount"),
+                output_field=DecimalField(max_digits=19, decimal_places=4),
+            ),
+        )
+        .values("operation", "month")
+        .annotate(
+            title=F("operation__title"),
+            planned_total=Sum("planned_amount"),
+            actual_total=Coalesce(
+                Sum("amount", filter=confirmed),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=19, decimal_places=4),
+            ),
+            planned_count=Count("id"),
+            confirmed_count=Count("id", filter=confirmed),
+            missed_count=Count("id", filter=Q(confirmed=False, planned_date__lt=today)),
+            late_count=Count("id", filter=confirmed & Q(date__gt=F("planned_date"))),
+        )
+        .annotate(variance=F("actual_total") - F("planned_total"))
+        .order_by("title", "operation", "month")
+    )
+    return list(rows)
@@ -1,17 +1,39 @@
 from datetime import date
 
+from accounts.low_balance import get_operation_account_ids, refresh_low_balance_dates
+from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from regular_operations.models import RegularOperation, RegularOperationType
+from drf_yasg.utils import swagger_auto_schema
+from regular_operations.models import (
+    RegularOperation,
+    RegularOperationException,
+    RegularOperationType,
+)
 from regular_operations.serializers import (
     RegularOperationCreateSerializer,
+    RegularOperationExceptionSerializer,
     RegularOperationSerializer,
     RegularOperationUpdateSerializer,
+    VarianceRequestSerializer,
+    VarianceRowSerializer,
 )
+from regular_operations.variance import VARIANCE_DEFAULT_MONTHS, build_variance_report
 from rest_framework import filters, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
 from rest_framework.response import Response
 from scenarios.models import Scenario
+from transactions.calculation import (
+    REGENERATION_FIELDS,
+    refresh_next_occurrences,
+    regenerate_occurrence,
+    regenerate_operation_transactions,
+)
 
 
 class RegularOperationViewSet(viewsets.ModelViewSet):
@@ -43,7 +65,10 @@ class RegularOperationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         operation_type = serializer.validated_data.get("type")
         if operation_type == RegularOperationType.EXPENSE:
-            serializer.save(user=self.request.user)
+            with transaction.atomic():
+                expense: RegularOperation = serializer.save(user=self.request.user)
+                refresh_next_occurrences([expense])
+                refresh_low_balance_dates(get_operation_account_ids(expense))
             return
 
         try:
@@ -57,9 +82,31 @@ class RegularOperationViewSet(viewsets.ModelViewSet):
                     description="Создан автоматически",
                     active_before=date.max,
                 )
+                refresh_next_occurrences([operation])
+                refresh_low_balance_dates(get_operation_account_ids(operation))
         except IntegrityError as e:
             raise ValidationError({"detail": "Связанный сценарий уже существует."}) from e
 
+    def perform_update(self, serializer):
+        regeneration_needed = any(
+            field in REGENERATION_FIELDS
+            and serializer.validated_data[field] != getattr(serializer.instance, field)
+            for field in serializer.validated_data
+        )
+        with transaction.atomic():
+            old_account_ids = get_operation_account_ids(serializer.instance)
+            operation: RegularOperation = serializer.save()
+            if regeneration_needed:
+                regenerate_operation_transactions(operation)
+            refresh_next_occurrences([operation])
+            refresh_low_balance_dates(old_account_ids | get_operation_account_ids(operation))
+
+    def perform_destroy(self, instance: RegularOperation):
+        with transaction.atomic():
+            account_ids = get_operation_account_ids(instance)
+            instance.delete()
+            refresh_low_balance_dates(account_ids)
+
     def create(self, request, *args, **kwargs):
         write_serializer = self.get_serializer(data=request.data)
         write_serializer.is_valid(raise_exception=True)
@@ -70,3 +117,97 @@ class RegularOperationViewSet(viewsets.ModelViewSet):
             operation, context=self.get_serializer_context()
         )
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        method="get",
+        responses={200: RegularOperationExceptionSerializer(many=True)},
+    )
+    @swagger_auto_schema(
+        method="post",
+        request_body=RegularOperationExceptionSerializer(),
+        responses={200: RegularOperationExceptionSerializer(), 400: "Ошибка"},
+    )
+    @action(detail=True, methods=["get", "post"], url_path="exceptions")
+    def exceptions(self, request: Request, pk: str):
+        """Исключения отдельных повторений: пропуск или другая сумма.
+
+        POST создаёт или заменяет исключение на дату и переписывает только строки этого
+        повторения.
+        """
+        operation: RegularOperation = self.get_object()
+        if request.method == "GET":
+            return Response(
+                RegularOperationExceptionSerializer(
+                    RegularOperationException.objects.filter(operation=operation), many=True
+                ).data,
+                status=status.HTTP_200_OK,
+            )
+
+        serializer = RegularOperationExceptionSerializer(
+            data=request.data, context={**self.get_serializer_context(), "operation": operation}
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            exception, _ = RegularOperationException.objects.update_or_create(
+                operation=operation,
+                date=serializer.validated_data["date"],
+                defaults={
+                    "amount": serializer.validated_data.get("amount"),
+                    "skip": serializer.validated_data.get("skip", False),
+                },
+            )
+            regenerate_occurrence(operation, exception.date)
+            refresh_next_occurrences([operation])
+            refresh_low_balance_dates(get_operation_account_ids(operation))
+        return Response(
+            RegularOperationExceptionSerializer(exception).data, status=status.HTTP_200_OK
+        )
+
+    @swagger_auto_schema(method="delete", responses={204: "Исключение удалено"})
+    @action(detail=True, methods=["delete"], url_path=r"exceptions/(?P<day>\d{4}-\d{2}-\d{2})")
+    def delete_exception(self, request: Request, pk: str, day: str):
+        """Вернуть повторению на дату обычную сумму операции."""
+        operation: RegularOperation = self.get_object()
+        try:
+            exception_date = date.fromisoformat(day)
+        except ValueError as error:
+            # шаблон URL пропускает несуществующие даты вроде 2025-02-30
+            raise Http404 from error
+        exception = get_object_or_404(
+            RegularOperationException, operation=operation, date=exception_date
+        )
+        with transaction.atomic():
+            exception.delete()
+            regenerate_occurrence(operation, exception.date)
+            refresh_next_occurrences([operation])
+            refresh_low_balance_dates(get_operation_account_ids(operation))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @swagger_auto_schema(
+        query_serializer=VarianceRequestSerializer(),
+        methods=[
+            "get",
+        ],
+        responses={200: VarianceRowSerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["get"], url_path="variance")
+    def variance(self, request: Request):
+        """План и факт по каждой регулярной операции помесячно: суммы, пропуски и опоздания.
+
+        По умолчанию окно — последние три календарных месяца по сегодняшний день.
+        """
+        serializer = VarianceRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        end_date: date = params.get("end_date") or timezone.localdate()
+        start_date: date = params.get("start_date") or (
+            end_date - relativedelta(months=VARIANCE_DEFAULT_MONTHS - 1)
+        ).replace(day=1)
+        rows = build_variance_report(
+            request.user,  # type: ignore[arg-type]
+            start_date,
+            end_date,
+            params.get("operations"),
+        )
+        return Response(VarianceRowSerializer(rows, many=True).data, status=status.HTTP_200_OK)
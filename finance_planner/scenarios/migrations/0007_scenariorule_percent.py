@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:46
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scenarios", "0006_remove_scenario_is_active_scenario_active_before"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scenariorule",
+            name="percent",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                max_digits=5,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(100),
+                ],
+                verbose_name="Процент от суммы операции",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="scenariorule",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("fixed", "Фиксированная сумма"),
+                    ("percentage", "Процент"),
+                    ("remainder", "Остаток"),
+                ],
+                default="fixed",
+                max_length=20,
+                verbose_name="Тип правила",
+            ),
+        ),
+    ]
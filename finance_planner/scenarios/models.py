@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from model_utils.models import UUIDModel
 from models import TimeWatchingModel
@@ -10,7 +11,8 @@ from users.models import User
 
 class RuleType(models.TextChoices):
     FIXED = "fixed", "Фиксированная сумма"
-    # TODO: PERCENTAGE = 'percentage', 'Процент'
+    PERCENTAGE = "percentage", "Процент"
+    REMAINDER = "remainder", "Остаток"
 
 
 class Scenario(UUIDModel, TimeWatchingModel):
@@ -46,6 +48,14 @@ class ScenarioRule(UUIDModel, TimeWatchingModel):
         blank=True,
         verbose_name="Фиксированная сумма",
     )
+    percent = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        verbose_name="Процент от суммы операции",
+    )
     order = models.IntegerField(default=0, verbose_name="Порядок применения")
 
     class Meta:
@@ -1,9 +1,37 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import Any
+
 from rest_framework import serializers
 from scenarios.models import RuleType, Scenario, ScenarioRule
 
 
+# поле со значением, которое нужно правилу каждого типа; остальные должны быть пустыми
+RULE_VALUE_FIELDS = {
+    RuleType.FIXED: "amount",
+    RuleType.PERCENTAGE: "percent",
+    RuleType.REMAINDER: None,
+}
+RULE_VALUE_REQUIRED_ERRORS = {
+    "amount": "Для фиксированного правила нужна сумма",
+    "percent": "Для процентного правила нужен процент от суммы операции",
+}
+
+
+def get_rule_value_errors(rule_type: str, values: Mapping[str, Any]) -> dict[str, str]:
+    """Ошибки полей amount и percent: заполнено должно быть ровно поле типа правила."""
+    required_field = RULE_VALUE_FIELDS[rule_type]
+    errors = {}
+    for field, required_error in RULE_VALUE_REQUIRED_ERRORS.items():
+        value = values.get(field)
+        if field == required_field and value is None:
+            errors[field] = required_error
+        elif field != required_field and value is not None:
+            errors[field] = "Для правила этого типа поле должно быть пустым"
+    return errors
+
+
 class ScenarioRuleSerializer(serializers.ModelSerializer):
     target_account_name = serializers.CharField(source="target_account.name", read_only=True)
 
@@ -16,6 +44,7 @@ class ScenarioRuleSerializer(serializers.ModelSerializer):
             "target_account_name",
             "type",
             "amount",
+            "percent",
             "order",
         ]
 
@@ -23,7 +52,7 @@ class ScenarioRuleSerializer(serializers.ModelSerializer):
 class ScenarioRuleCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ScenarioRule
-        fields = ["id", "scenario", "target_account", "type", "amount", "order"]
+        fields = ["id", "scenario", "target_account", "type", "amount", "percent", "order"]
         read_only_fields = ["id"]
         extra_kwargs = {
             "type": {"default": RuleType.FIXED},
@@ -45,6 +74,19 @@ class ScenarioRuleCreateUpdateSerializer(serializers.ModelSerializer):
             )
         return scenario
 
+    def validate(self, attrs):
+        rule_type = attrs.get("type", getattr(self.instance, "type", RuleType.FIXED))
+        errors = get_rule_value_errors(
+            rule_type,
+            {
+                field: attrs.get(field, getattr(self.instance, field, None))
+                for field in RULE_VALUE_REQUIRED_ERRORS
+            },
+        )
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
 
 class ScenarioSerializer(serializers.ModelSerializer):
     rules = ScenarioRuleSerializer(many=True, read_only=True)
@@ -1,3 +1,8 @@
+from uuid import UUID
+
+from accounts.low_balance import refresh_low_balance_dates
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.response import Response
 from scenarios.models import Scenario, ScenarioRule
@@ -7,6 +12,11 @@ from scenarios.serializers import (
     ScenarioRuleSerializer,
     ScenarioSerializer,
 )
+from transactions.calculation import (
+    RULE_REGENERATION_FIELDS,
+    regenerate_operation_transactions,
+)
+from transactions.models import delete_future_planned_transactions
 
 
 class ScenarioViewSet(
@@ -65,12 +75,45 @@ class ScenarioRuleViewSet(
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        rule = serializer.save()
+        with transaction.atomic():
+            rule = serializer.save()
+            _regenerate_rule_transactions(rule)
+            refresh_low_balance_dates(_get_account_ids(rule))
         return self._serialize_response(rule, status_code=status.HTTP_201_CREATED)
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            account_ids = _get_account_ids(instance)
+            delete_future_planned_transactions(Q(scenario_rule=instance))
+            instance.delete()
+            refresh_low_balance_dates(account_ids)
+
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        rule = serializer.save()
-        return self._serialize_response(rule, status_code=status.HTTP_200_OK)
+        self.perform_update(serializer)
+        return self._serialize_response(serializer.instance, status_code=status.HTTP_200_OK)
+
+    def perform_update(self, serializer):
+        regeneration_needed = any(
+            field in RULE_REGENERATION_FIELDS
+            and serializer.validated_data[field] != getattr(serializer.instance, field)
+            for field in serializer.validated_data
+        )
+        with transaction.atomic():
+            old_account_ids = _get_account_ids(serializer.instance)
+            rule = serializer.save()
+            if regeneration_needed:
+                _regenerate_rule_transactions(rule)
+            refresh_low_balance_dates(old_account_ids | _get_account_ids(rule))
+
+
+def _regenerate_rule_transactions(rule: ScenarioRule) -> None:
+    """Правило меняет суммы переводов всего сценария, поэтому пересчитывается вся операция."""
+    regenerate_operation_transactions(rule.scenario.operation)
+
+
+def _get_account_ids(rule: ScenarioRule) -> set[UUID | None]:
+    """Правило переводит деньги со счёта поступления операции на целевой счёт."""
+    return {rule.target_account_id, rule.scenario.operation.to_account_id}  # type: ignore[attr-defined]
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Transaction
+from .models import CalculateJob, MonthlySummary, SummarizedMonth, Transaction
 
 
 @admin.register(Transaction)
@@ -9,3 +9,22 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ["type", "confirmed", "date"]
     search_fields = ["description", "user__username"]
     readonly_fields = ["created_at", "updated_at"]
+
+
+@admin.register(CalculateJob)
+class CalculateJobAdmin(admin.ModelAdmin):
+    list_display = ["user", "status", "start_date", "end_date", "created_at", "finished_at"]
+    list_filter = ["status"]
+    readonly_fields = ["created_at", "updated_at", "started_at", "finished_at"]
+
+
+@admin.register(MonthlySummary)
+class MonthlySummaryAdmin(admin.ModelAdmin):
+    list_display = ["user", "month", "type", "total", "count"]
+    list_filter = ["type", "month"]
+
+
+@admin.register(SummarizedMonth)
+class SummarizedMonthAdmin(admin.ModelAdmin):
+    list_display = ["user", "month"]
+    list_filter = ["month"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import Count, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+from transactions.models import MonthlySummary, Transaction
+
+
+GROUP_BY_PERIODS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+    "year": TruncYear,
+}
+GROUP_BY_FIELDS = ("type", "from_account", "to_account", "operation")
+GROUP_BY_CHOICES = (*GROUP_BY_PERIODS, *GROUP_BY_FIELDS)
+SUMMARY_GROUP_BY = frozenset({"month", "year", "type", "from_account", "to_account"})
+SUMMARY_PARAMS = frozenset(
+    {
+        "group_by",
+        "type",
+        "type__in",
+        "from_account",
+        "to_account",
+        "date__gte",
+        "date__lte",
+        "ordering",
+    }
+)
+
+
+def aggregate_transactions(
+    transactions: QuerySet[Transaction],
+    group_by: Sequence[str],
+    summaries: QuerySet[MonthlySummary] | None = None,
+) -> list[dict[str, Any]]:
+    """Суммы и количество транзакций по группам одним GROUP BY.
+
+    Период (не больше одного) попадает в ключ period — начало дня, недели, месяца или года.
+    Без ключей группировки возвращается одна строка с общими итогами. Итоги закрытых
+    месяцев из summaries складываются с транзакциями, которые в них не вошли.
+    """
+    groups = _group(transactions, group_by, "date", "amount", Count("id"))
+    if summaries is not None:
+        for key, (total, count) in _group(
+            summaries, group_by, "month", "total", Sum("count")
+        ).items():
+            group = groups.setdefault(key, [Decimal("0"), 0])
+            group[0] += total
+            group[1] += count
+
+    keys = _get_keys(group_by)
+    return [
+        {**dict(zip(keys, key, strict=True)), "total": total, "count": count}
+        for key, (total, count) in sorted(groups.items(), key=_sort_key)
+    ]
+
+
+def can_use_summaries(params: Iterable[str], group_by: Sequence[str]) -> bool:
+    """Итоги месяцев подходят, если группировка и фильтры не мельче месяца и пары счетов."""
+    return set(params) <= SUMMARY_PARAMS and set(group_by) <= SUMMARY_GROUP_BY
+
+
+def _get_keys(group_by: Sequence[str]) -> list[str]:
+    periods = ["period" for key in group_by if key in GROUP_BY_PERIODS]
+    return [*periods, *(key for key in group_by if key in GROUP_BY_FIELDS)]
+
+
+def _group(
+    rows: QuerySet[Any],
+    group_by: Sequence[str],
+    date_field: str,
+    amount_field: str,
+    count: Count | Sum,
+) -> dict[tuple[Any, ...], list[Any]]:
+    periods = [key for key in group_by if key in GROUP_BY_PERIODS]
+    annotations = {"period": GROUP_BY_PERIODS[periods[0]](date_field)} if periods else {}
+    keys = _get_keys(group_by)
+    if not keys:
+        totals = rows.aggregate(total=Sum(amount_field), count=count)
+        return {(): [totals["total"] or Decimal("0"), totals["count"] or 0]}
+    # сортировка из фильтров попала бы в GROUP BY, поэтому сбрасывается
+    grouped = (
+        rows.annotate(**annotations)
+        .values(*keys)
+        .annotate(total=Sum(amount_field), count=count)
+        .order_by()
+    )
+    return {tuple(row[key] for key in keys): [row["total"], row["count"]] for row in grouped}
+
+
+def _sort_key(item: tuple[tuple[Any, ...], list[Any]]) -> tuple[tuple[bool, Any], ...]:
+    # NULL идёт первым, как в ORDER BY
+    return tuple((value is not None, value) for value in item[0])
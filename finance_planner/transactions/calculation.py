@@ -0,0 +1,726 @@
+from __future__ import annotations
+
+import calendar
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from operator import attrgetter
+from uuid import UUID
+
+from core.models import TombstoneEntity, record_tombstones
+from dateutil.rrule import DAILY, rrule
+from django.db import transaction as db_transaction
+from django.db.models import Case, F, Max, Q, QuerySet, TextField, UUIDField, Value, When
+from django.utils import timezone
+import numpy as np
+from regular_operations.models import (
+    RegularOperation,
+    RegularOperationException,
+    RegularOperationPeriodType,
+    RegularOperationType,
+)
+from regular_operations.recurrence import get_schedule
+from scenarios.models import RuleType, ScenarioRule
+from transactions.models import Transaction, TransactionType
+from transactions.summaries import iter_months, refresh_monthly_summaries
+from users.models import User
+
+
+OPERATION_TO_TRANSACTION_TYPE: dict[str, str] = {
+    RegularOperationType.INCOME: TransactionType.INCOME,
+    RegularOperationType.EXPENSE: TransactionType.EXPENSE,
+}
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+# верхняя граница длины одного периода повторения в днях
+MAX_PERIOD_DAYS: dict[str, int] = {
+    RegularOperationPeriodType.DAY: 1,
+    RegularOperationPeriodType.WEEK: 7,
+    RegularOperationPeriodType.MONTH: 31,
+}
+
+ProgressCallback = Callable[[int, int], None]
+OccurrenceKey = tuple[UUID | None, UUID | None, date | None]
+
+
+REGENERATION_FIELDS: frozenset[str] = frozenset(
+    {"title", "amount", "from_account", "to_account", "start_date", "end_date", "recurrence"}
+)
+# поля правила сценария, от которых зависят суммы и счета его запланированных переводов
+RULE_REGENERATION_FIELDS: frozenset[str] = frozenset(
+    {"type", "amount", "percent", "order", "target_account"}
+)
+
+
+@dataclass(frozen=True)
+class CalculationResult:
+    transactions_created: int
+    transactions_all: int
+
+
+@dataclass(frozen=True)
+class RegenerationResult:
+    transactions_created: int
+    transactions_updated: int
+    transactions_deleted: int
+
+
+def get_calculation_operations(
+    user: User, start_date: date, end_date: date
+) -> QuerySet[RegularOperation]:
+    """Регулярные операции пользователя, которые могут дать транзакции в окне расчёта."""
+    return (
+        RegularOperation.available_objects.filter(
+            user=user, active_before__gt=timezone.now().date()
+        )
+        .filter(start_date__date__lte=end_date)
+        .filter(Q(end_date__date__gte=start_date) | Q(deleted_at__isnull=True))
+        .filter(Q(deleted_at__date__lt=end_date) | Q(deleted_at__isnull=True))
+        .select_related("from_account", "to_account")
+        .prefetch_related("scenario", "scenario__rules", "exceptions")
+    )
+
+
+def calculate_transactions(
+    user: User,
+    start_date: date,
+    end_date: date,
+    on_progress: ProgressCallback | None = None,
+) -> CalculationResult:
+    """Создаёт запланированные транзакции по регулярным операциям и их сценариям.
+
+    Дубликаты отсекаются частичными уникальными индексами по (operation, planned_date) и
+    (scenario_rule, planned_date): недостающие строки вставляются одним bulk_create с
+    ignore_conflicts, поэтому параллельные расчёты не могут задвоить транзакции.
+    transactions_created — число повторений, которых не было в БД перед вставкой; чужие
+    записи в то же окно на него не влияют.
+
+    Args:
+        user: владелец операций и создаваемых транзакций.
+        start_date: начало окна расчёта (включительно).
+        end_date: конец окна расчёта (включительно).
+        on_progress: вызывается после каждой операции с (обработано, всего).
+    """
+    date_range_regular_operations = list(get_calculation_operations(user, start_date, end_date))
+    date_range_existing_transactions = (
+        Transaction.objects.filter(user=user)
+        .filter(planned_date__gte=start_date)
+        .filter(planned_date__lte=end_date)
+    )
+    total_operations = len(date_range_regular_operations)
+
+    planned_transactions: list[Transaction] = []
+    for processed_operations, regular_operation in enumerate(
+        date_range_regular_operations, start=1
+    ):
+        planned_transactions.extend(
+            iter_planned_transactions(user, regular_operation, start_date, end_date)
+        )
+        if on_progress is not None:
+            on_progress(processed_operations, total_operations)
+
+    with db_transaction.atomic():
+        materialized_keys = set(
+            date_range_existing_transactions.values_list(
+                "operation_id", "scenario_rule_id", "planned_date"
+            )
+        )
+        missing_transactions = [
+            transaction
+            for transaction in planned_transactions
+            if occurrence_key(transaction) not in materialized_keys
+        ]
+        Transaction.objects.bulk_create(
+            missing_transactions,
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        refresh_next_occurrences(date_range_regular_operations)
+        refresh_monthly_summaries(user, iter_months(start_date, end_date))
+
+    return CalculationResult(
+        transactions_created=len(missing_transactions),
+        transactions_all=len(planned_transactions),
+    )
+
+
+def iter_planned_transactions(
+    user: User,
+    regular_operation: RegularOperation,
+    start_date: date,
+    end_date: date,
+    scenario_rules: Iterable[ScenarioRule] | None = None,
+) -> Iterator[Transaction]:
+    """Несохранённые транзакции операции и правил её сценария для окна расчёта.
+
+    scenario_rules подменяет правила сценария — так симуляция подставляет изменённые в памяти
+    копии, не трогая БД.
+    """
+    if scenario_rules is None:
+        scenario_rules = []
+        if hasattr(regular_operation, "scenario"):
+            scenario_rules = regular_operation.scenario.rules.all()
+    scenario_rules = list(scenario_rules)
+
+    if regular_operation.end_date is not None:
+        end_date = min(end_date, regular_operation.end_date.date())
+
+    occurrence_dates = _get_occurrence_dates(regular_operation, start_date, end_date)
+    occurrence_dates, operation_amounts = apply_occurrence_exceptions(
+        occurrence_dates,
+        regular_operation.amount,
+        regular_operation.exceptions.all(),  # type: ignore[attr-defined]
+    )
+    rule_amounts = get_rule_amounts(operation_amounts, scenario_rules)
+
+    for occurrence, selected_date in enumerate(occurrence_dates):
+        yield Transaction(
+            user=user,
+            date=selected_date,
+            planned_date=selected_date,
+            type=OPERATION_TO_TRANSACTION_TYPE[regular_operation.type],
+            amount=operation_amounts[occurrence],
+            from_account=regular_operation.from_account,
+            to_account=regular_operation.to_account,
+            operation=regular_operation,
+            confirmed=False,
+            description=f"Операция для {regular_operation.title}",
+        )
+
+        for scenario_index, (rule, amounts) in enumerate(
+            zip(scenario_rules, rule_amounts, strict=True)
+        ):
+            # нулевой перевод (например, пустой остаток) транзакцией не становится
+            if not amounts[occurrence]:
+                continue
+            yield Transaction(
+                user=user,
+                date=selected_date,
+                planned_date=selected_date,
+                type=TransactionType.TRANSFER,
+                amount=amounts[occurrence],
+                from_account=regular_operation.to_account,
+                to_account_id=rule.target_account_id,  # type: ignore[attr-defined]
+                scenario_rule=rule,
+                confirmed=False,
+                description=_get_rule_description(regular_operation, scenario_index),
+            )
+
+
+def apply_occurrence_exceptions(
+    occurrence_dates: Sequence[date],
+    amount: Decimal,
+    exceptions: Iterable[RegularOperationException],
+) -> tuple[list[date], list[Decimal]]:
+    """Даты и суммы повторений с учётом пропусков и переопределённых сумм.
+
+    Даты и исключения отсортированы, поэтому они сливаются за один проход.
+    """
+    dates: list[date] = []
+    amounts: list[Decimal] = []
+    pending = iter(exceptions)
+    exception = next(pending, None)
+    for day in occurrence_dates:
+        while exception is not None and exception.date < day:
+            exception = next(pending, None)
+        if exception is None or exception.date != day:
+            dates.append(day)
+            amounts.append(amount)
+        elif not exception.skip:
+            dates.append(day)
+            amounts.append(amount if exception.amount is None else exception.amount)
+    return dates, amounts
+
+
+def get_rule_amounts(
+    operation_amounts: Sequence[Decimal], scenario_rules: Sequence[ScenarioRule]
+) -> list[list[Decimal]]:
+    """Суммы переводов по правилам сценария для каждого повторения операции."""
+    operation_cents = np.array([to_cents(amount) for amount in operation_amounts], dtype=np.int64)
+    return [
+        [from_cents(value) for value in rule_cents.tolist()]
+        for rule_cents in get_rule_cents(operation_cents, scenario_rules)
+    ]
+
+
+def get_rule_cents(
+    operation_cents: np.ndarray, scenario_rules: Sequence[ScenarioRule]
+) -> list[np.ndarray]:
+    """Суммы правил в копейках разом для всех повторений — массив любой формы на правило.
+
+    Правила применяются в порядке order: FIXED — своя сумма, PERCENTAGE — процент от суммы
+    операции с округлением до копейки половиной вверх (как quantize с ROUND_HALF_UP),
+    REMAINDER — что осталось после предыдущих правил, но не меньше нуля.
+    """
+    left = operation_cents.copy()
+    rule_cents_list = []
+    for rule in scenario_rules:
+        match rule.type:
+            case RuleType.PERCENTAGE:
+                basis_points = to_cents(rule.percent or Decimal("0"))
+                rule_cents = (operation_cents * basis_points + 5000) // 10000
+            case RuleType.REMAINDER:
+                rule_cents = np.maximum(left, 0)
+            case _:
+                rule_cents = np.full_like(operation_cents, to_cents(rule.amount or Decimal("0")))
+        left = left - rule_cents
+        rule_cents_list.append(rule_cents)
+    return rule_cents_list
+
+
+def to_cents(amount: Decimal) -> int:
+    return int(amount * 100)
+
+
+def from_cents(value: int) -> Decimal:
+    return Decimal(value).scaleb(-2)
+
+
+def iter_virtual_transactions(
+    user: User, start_date: date, end_date: date
+) -> Iterator[Transaction]:
+    """Повторения регулярных операций и правил сценариев, ещё не созданные в БД.
+
+    Ничего не пишет и не берёт блокировок: отдаёт несохранённые транзакции — ровно те,
+    что создал бы calculate_transactions за это окно. Повторения, для которых есть строка
+    с тем же (источник, planned_date), пропускаются.
+    """
+    if start_date > end_date:
+        return
+
+    materialized_keys = set(
+        Transaction.objects.filter(
+            user=user, planned_date__gte=start_date, planned_date__lte=end_date
+        ).values_list("operation_id", "scenario_rule_id", "planned_date")
+    )
+    for regular_operation in get_calculation_operations(user, start_date, end_date):
+        for transaction in iter_planned_transactions(user, regular_operation, start_date, end_date):
+            if occurrence_key(transaction) not in materialized_keys:
+                yield transaction
+
+
+def build_upcoming_transactions(user: User, start_date: date, end_date: date) -> list[Transaction]:
+    """Неподтверждённые транзакции и ещё не созданные повторения за окно, отсортированные по дате.
+
+    Операции без повторений в окне отсекаются индексом по next_occurrence, поэтому число
+    запросов не зависит ни от длины окна, ни от числа операций пользователя.
+    """
+    upcoming = list(
+        Transaction.objects.filter(
+            user=user, confirmed=False, date__gte=start_date, date__lte=end_date
+        )
+    )
+    materialized_keys = set(
+        Transaction.objects.filter(
+            user=user, planned_date__gte=start_date, planned_date__lte=end_date
+        ).values_list("operation_id", "scenario_rule_id", "planned_date")
+    )
+    for regular_operation in get_calculation_operations(user, start_date, end_date).filter(
+        next_occurrence__lte=end_date
+    ):
+        upcoming.extend(
+            transaction
+            for transaction in iter_planned_transactions(
+                user, regular_operation, start_date, end_date
+            )
+            if occurrence_key(transaction) not in materialized_keys
+        )
+    upcoming.sort(key=attrgetter("date"))
+    return upcoming
+
+
+def build_virtual_transactions(user: User, start_date: date, end_date: date) -> list[Transaction]:
+    return list(iter_virtual_transactions(user, start_date, end_date))
+
+
+def regenerate_operation_transactions(regular_operation: RegularOperation) -> RegenerationResult:
+    """Приводит будущие неподтверждённые транзакции операции к её текущему состоянию.
+
+    Горизонт не расширяется: пересчитываются только даты до последней уже запланированной
+    транзакции пользователя.
+    Вместо удаления и повторного расчёта применяется разница между старым и новым набором
+    повторений — по одному DELETE, UPDATE и INSERT независимо от длины горизонта. Суммы
+    исключений и правил сценария пишутся ветками одного CASE.
+    """
+    today = timezone.localdate()
+    scenario_rules = _get_scenario_rules(regular_operation)
+    scenario_rule_ids = [rule.id for rule in scenario_rules]
+    # без исключений сумма у всех повторений одна, поэтому и суммы правил общие
+    rule_amounts = {
+        rule.id: amounts[0]
+        for rule, amounts in zip(
+            scenario_rules,
+            get_rule_amounts([regular_operation.amount], scenario_rules),
+            strict=True,
+        )
+    }
+
+    planned_transactions = Transaction.objects.filter(
+        Q(operation=regular_operation) | Q(scenario_rule_id__in=scenario_rule_ids),
+        confirmed=False,
+        planned_date__gte=today,
+    )
+    horizon_end = _get_horizon_end(regular_operation)
+    if horizon_end is None or horizon_end < today:
+        return RegenerationResult(0, 0, 0)
+
+    existing_ids = {
+        (operation_id, scenario_rule_id, planned_date): transaction_id
+        for transaction_id, operation_id, scenario_rule_id, planned_date in (
+            planned_transactions.values_list(
+                "id", "operation_id", "scenario_rule_id", "planned_date"
+            )
+        )
+    }
+    existing_keys = existing_ids.keys()
+    desired_transactions = list(
+        iter_planned_transactions(
+            regular_operation.user, regular_operation, today, horizon_end, scenario_rules
+        )
+    )
+    desired_amounts = {
+        occurrence_key(transaction): transaction.amount for transaction in desired_transactions
+    }
+    kept_keys = existing_keys & desired_amounts.keys()
+    kept_dates = {planned_date for _, _, planned_date in kept_keys}
+    # отдельные ветки CASE получают только строки, чья сумма изменена исключением
+    operation_overrides: list[When] = []
+    rule_overrides: list[When] = []
+    for key in kept_keys:
+        operation_id, scenario_rule_id, planned_date = key
+        amount = desired_amounts[key]
+        if operation_id is not None and amount != regular_operation.amount:
+            operation_overrides.append(When(planned_date=planned_date, then=Value(amount)))
+        elif scenario_rule_id is not None and amount != rule_amounts[scenario_rule_id]:
+            rule_overrides.append(
+                When(
+                    scenario_rule_id=scenario_rule_id, planned_date=planned_date, then=Value(amount)
+                )
+            )
+
+    with db_transaction.atomic():
+        deleted_count = 0
+        stale_ids = [existing_ids[key] for key in existing_keys - kept_keys]
+        if stale_ids:
+            deleted_count, _ = planned_transactions.filter(id__in=stale_ids).delete()
+            record_tombstones(
+                TombstoneEntity.TRANSACTION,
+                [(regular_operation.user_id, stale_id) for stale_id in stale_ids],  # type: ignore[attr-defined]
+            )
+
+        updated_count = planned_transactions.filter(
+            operation=regular_operation, planned_date__in=kept_dates
+        ).update(
+            amount=Case(*operation_overrides, default=Value(regular_operation.amount)),
+            from_account=regular_operation.from_account,
+            to_account=regular_operation.to_account,
+            description=f"Операция для {regular_operation.title}",
+            updated_at=timezone.now(),
+        )
+        if scenario_rule_ids:
+            updated_count += planned_transactions.filter(
+                scenario_rule_id__in=scenario_rule_ids, planned_date__in=kept_dates
+            ).update(
+                amount=Case(
+                    *rule_overrides,
+                    *(
+                        When(scenario_rule_id=rule_id, then=Value(amount))
+                        for rule_id, amount in rule_amounts.items()
+                    ),
+                    default=F("amount"),
+                ),
+                from_account=regular_operation.to_account,
+                to_account_id=Case(
+                    *(
+                        When(scenario_rule_id=rule.id, then=Value(rule.target_account_id))  # type: ignore[attr-defined]
+                        for rule in scenario_rules
+                    ),
+                    default=F("to_account_id"),
+                    output_field=UUIDField(),
+                ),
+                # номер в описании — позиция правила, она меняется вместе с order
+                description=Case(
+                    *(
+                        When(
+                            scenario_rule_id=rule.id,
+                            then=Value(_get_rule_description(regular_operation, scenario_index)),
+                        )
+                        for scenario_index, rule in enumerate(scenario_rules)
+                    ),
+                    default=F("description"),
+                    output_field=TextField(),
+                ),
+                updated_at=timezone.now(),
+            )
+
+        missing_transactions = [
+            transaction
+            for transaction in desired_transactions
+            if occurrence_key(transaction) not in existing_keys
+        ]
+        Transaction.objects.bulk_create(
+            missing_transactions,
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    return RegenerationResult(
+        transactions_created=len(missing_transactions),
+        transactions_updated=updated_count,
+        transactions_deleted=deleted_count,
+    )
+
+
+def regenerate_occurrence(regular_operation: RegularOperation, day: date) -> RegenerationResult:
+    """Приводит запланированные строки одного повторения к операции и её исключениям.
+
+    Трогаются только неподтверждённые строки этой даты. Повторение за горизонтом расчёта
+    не создаётся — его подхватят следующий расчёт и прогноз.
+    """
+    scenario_rules = _get_scenario_rules(regular_operation)
+    existing = {
+        occurrence_key(transaction): transaction
+        for transaction in Transaction.objects.filter(
+            Q(operation=regular_operation)
+            | Q(scenario_rule_id__in=[rule.id for rule in scenario_rules]),
+            confirmed=False,
+            planned_date=day,
+        )
+    }
+    desired = {
+        occurrence_key(transaction): transaction
+        for transaction in iter_planned_transactions(
+            regular_operation.user, regular_operation, day, day, scenario_rules
+        )
+    }
+
+    with db_transaction.atomic():
+        deleted_count = 0
+        stale_ids = [transaction.id for key, transaction in existing.items() if key not in desired]
+        if stale_ids:
+            deleted_count, _ = Transaction.objects.filter(id__in=stale_ids).delete()
+            record_tombstones(
+                TombstoneEntity.TRANSACTION,
+                [(regular_operation.user_id, stale_id) for stale_id in stale_ids],  # type: ignore[attr-defined]
+            )
+
+        # bulk_update не трогает auto_now, а лента изменений читает updated_at
+        updated_at = timezone.now()
+        changed_transactions = []
+        for key, transaction in existing.items():
+            if key in desired and transaction.amount != desired[key].amount:
+                transaction.amount = desired[key].amount
+                transaction.updated_at = updated_at
+                changed_transactions.append(transaction)
+        updated_count = Transaction.objects.bulk_update(
+            changed_transactions, ["amount", "updated_at"]
+        )
+
+        missing_transactions: list[Transaction] = []
+        horizon_end = _get_horizon_end(regular_operation)
+        if horizon_end is not None and day <= horizon_end:
+            missing_transactions = [
+                transaction for key, transaction in desired.items() if key not in existing
+            ]
+            Transaction.objects.bulk_create(missing_transactions, ignore_conflicts=True)
+        refresh_monthly_summaries(regular_operation.user, [day])
+
+    return RegenerationResult(
+        transactions_created=len(missing_transactions),
+        transactions_updated=updated_count,
+        transactions_deleted=deleted_count,
+    )
+
+
+def get_next_occurrence(regular_operation: RegularOperation, day: date) -> date | None:
+    """Первое непропущенное повторение операции не раньше day; None, если их больше не будет."""
+    last_day = date.max
+    if regular_operation.end_date is not None:
+        last_day = regular_operation.end_date.date()
+    if regular_operation.deleted_at is not None:
+        last_day = min(last_day, regular_operation.deleted_at.date() - timedelta(days=1))
+    low = max(day, regular_operation.start_date.date())
+    exceptions = list(regular_operation.exceptions.all())  # type: ignore[attr-defined]
+
+    if regular_operation.period_type == RegularOperationPeriodType.CUSTOM:
+        skipped_dates = {exception.date for exception in exceptions if exception.skip}
+        schedule = get_schedule(regular_operation.recurrence, regular_operation.start_date.date())
+        occurrence = schedule.first(low)
+        while occurrence is not None and occurrence in skipped_dates:
+            occurrence = schedule.first(occurrence + timedelta(days=1))
+        return occurrence if occurrence is not None and occurrence <= last_day else None
+
+    # в любом окне длиной в период есть повторение, поэтому окна перебираются, только пока
+    # всё найденное пропущено исключениями
+    window = timedelta(days=MAX_PERIOD_DAYS[regular_operation.period_type])
+    window *= regular_operation.period_interval
+    while low <= last_day:
+        high = min(last_day, low + window)
+        occurrence_dates, _ = apply_occurrence_exceptions(
+            _get_occurrence_dates(regular_operation, low, high),
+            regular_operation.amount,
+            exceptions,
+        )
+        if occurrence_dates:
+            return occurrence_dates[0]
+        low = high + timedelta(days=1)
+    return None
+
+
+def refresh_next_occurrences(regular_operations: Iterable[RegularOperation]) -> None:
+    """Пересчитывает next_occurrence от сегодняшнего дня одним bulk_update."""
+    today = timezone.localdate()
+    updated_at = timezone.now()
+    changed_operations = []
+    for regular_operation in regular_operations:
+        next_occurrence = get_next_occurrence(regular_operation, today)
+        if next_occurrence != regular_operation.next_occurrence:
+            regular_operation.next_occurrence = next_occurrence
+            regular_operation.updated_at = updated_at
+            changed_operations.append(regular_operation)
+    RegularOperation.available_objects.bulk_update(
+        changed_operations, ["next_occurrence", "updated_at"], batch_size=BULK_CREATE_BATCH_SIZE
+    )
+
+
+def _get_scenario_rules(regular_operation: RegularOperation) -> list[ScenarioRule]:
+    if not hasattr(regular_operation, "scenario"):
+        return []
+    return list(regular_operation.scenario.rules.all())
+
+
+def _get_rule_description(regular_operation: RegularOperation, scenario_index: int) -> str:
+    return f"Операция для {regular_operation.scenario.title} ({scenario_index})"  # type: ignore[attr-defined]
+
+
+def _get_horizon_end(regular_operation: RegularOperation) -> date | None:
+    return Transaction.objects.filter(
+        user_id=regular_operation.user_id,  # type: ignore[attr-defined]
+        planned_date__isnull=False,
+    ).aggregate(horizon_end=Max("planned_date"))["horizon_end"]
+
+
+def occurrence_key(transaction: Transaction) -> OccurrenceKey:
+    """Ключ повторения, по которому работают уникальные индексы запланированных транзакций."""
+    return (
+        transaction.operation_id,  # type: ignore[attr-defined]
+        transaction.scenario_rule_id,  # type: ignore[attr-defined]
+        transaction.planned_date,
+    )
+
+
+def _get_occurrence_dates(
+    regular_operation: RegularOperation, start_date: date, end_date: date
+) -> Sequence[date]:
+    created_date = regular_operation.start_date.date()
+    deleted_date = regular_operation.deleted_at.date() if regular_operation.deleted_at else None
+    if regular_operation.period_type == RegularOperationPeriodType.CUSTOM:
+        if deleted_date is not None:
+            end_date = min(end_date, deleted_date - timedelta(days=1))
+        return get_schedule(regular_operation.recurrence, created_date).between(
+            max(start_date, created_date), end_date
+        )
+
+    # noinspection PyTypeChecker
+    return [
+        dt.date()
+        for dt in rrule(DAILY, dtstart=start_date, until=end_date)
+        if _is_transaction_day(
+            created_date,
+            deleted_date,
+            dt.date(),
+            regular_operation.period_type,
+            regular_operation.period_interval,
+        )
+    ]
+
+
+def _is_transaction_day(  # noqa: PLR0911
+    created_date: date,
+    deleted_date: date | None,
+    current_date: date,
+    period_type: str,
+    period_interval: int,
+) -> bool:
+    if current_date < created_date:
+        return False
+    if deleted_date is not None and current_date >= deleted_date:
+        return False
+
+    match period_type:
+        case RegularOperationPeriodType.DAY:
+            delta_days = (current_date - created_date).days
+            return delta_days % period_interval == 0
+        case RegularOperationPeriodType.WEEK:
+            if current_date.weekday() != created_date.weekday():
+                return False
+            delta_days = (current_date - created_date).days
+            weeks = delta_days // 7
+            return weeks % period_interval == 0
+        case RegularOperationPeriodType.MONTH:
+            months_from_start = (current_date.year - created_date.year) * 12 + (
+                current_date.month - created_date.month
+            )
+            if months_from_start % period_interval != 0:
+                return False
+            last_day_this_month = calendar.monthrange(current_date.year, current_date.month)[1]
+            due_day = min(created_date.day, last_day_this_month)
+
+            return current_date.day == due_day
+
+        case _:
+            raise ValueError(f"Unknown period type: {period_type}")
+
+
+def count_transaction_days(  # noqa: PLR0913, PLR0917
+    created_date: date,
+    deleted_date: date | None,
+    low: date,
+    high: date,
+    period_type: str,
+    period_interval: int,
+    recurrence: str = "",
+) -> int:
+    """Число дней в [low, high], для которых _is_transaction_day истинно, — без перебора дней.
+
+    Для типа custom дни берутся из скомпилированного правила recurrence.
+    """
+    if deleted_date is not None:
+        high = min(high, deleted_date - timedelta(days=1))
+    low = max(low, created_date)
+    if low > high:
+        return 0
+
+    match period_type:
+        case RegularOperationPeriodType.DAY | RegularOperationPeriodType.WEEK:
+            step = period_interval
+            if period_type == RegularOperationPeriodType.WEEK:
+                step *= 7
+            first = -(-(low - created_date).days // step)
+            last = (high - created_date).days // step
+        case RegularOperationPeriodType.MONTH:
+            first = -(-_months_between(created_date, low) // period_interval)
+            if _month_due_date(created_date, first * period_interval) < low:
+                first += 1
+            last = _months_between(created_date, high) // period_interval
+            if _month_due_date(created_date, last * period_interval) > high:
+                last -= 1
+        case RegularOperationPeriodType.CUSTOM:
+            return get_schedule(recurrence, created_date).count(low, high)
+        case _:
+            raise ValueError(f"Unknown period type: {period_type}")
+
+    return max(0, last - first + 1)
+
+
+def _months_between(start: date, current: date) -> int:
+    return (current.year - start.year) * 12 + (current.month - start.month)
+
+
+def _month_due_date(start: date, months: int) -> date:
+    years, month_index = divmod(start.month - 1 + months, 12)
+    year = start.year + years
+    month = month_index + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
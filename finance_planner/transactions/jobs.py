@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+import logging
+import threading
+from uuid import UUID
+
+from django.db import connection, transaction as db_transaction
+from django.db.models import Q
+from django.utils import timezone
+from transactions.calculation import calculate_transactions
+from transactions.models import CalculateJob, CalculateJobStatus
+
+
+logger = logging.getLogger(__name__)
+
+# пока воркер жив, он обновляет updated_at задачи с этим интервалом, как бы долго ни шёл расчёт
+JOB_HEARTBEAT_INTERVAL = timedelta(minutes=1)
+# выполняемая задача, которая молчит дольше, брошена упавшим воркером
+JOB_STALE_TIMEOUT = timedelta(minutes=10)
+# задача, которая раз за разом роняет воркер, не должна забираться бесконечно
+JOB_MAX_ATTEMPTS = 3
+
+
+def claim_next_job() -> CalculateJob | None:
+    """Забирает самую старую задачу из очереди и помечает её выполняемой.
+
+    Строка блокируется с SKIP LOCKED, поэтому несколько воркеров не возьмут одну задачу.
+    Зависшая в RUNNING задача забирается заново: расчёт идемпотентен. После
+    JOB_MAX_ATTEMPTS попыток она помечается ошибочной.
+    """
+    now = timezone.now()
+    stale = Q(status=CalculateJobStatus.RUNNING, updated_at__lt=now - JOB_STALE_TIMEOUT)
+    with db_transaction.atomic():
+        CalculateJob.objects.filter(stale, attempts__gte=JOB_MAX_ATTEMPTS).update(
+            status=CalculateJobStatus.FAILED,
+            error="Воркер не завершил задачу за отведённое число попыток",
+            finished_at=now,
+            updated_at=now,
+        )
+        job = (
+            CalculateJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=CalculateJobStatus.PENDING) | stale)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = CalculateJobStatus.RUNNING
+        job.started_at = now
+        job.attempts += 1
+        job.processed_operations = 0
+        job.save(
+            update_fields=[
+                "status",
+                "started_at",
+                "attempts",
+                "processed_operations",
+                "updated_at",
+            ]
+        )
+    return job
+
+
+def run_job(job: CalculateJob) -> None:
+    """Выполняет расчёт задачи и сохраняет результат или ошибку."""
+
+    def _on_progress(processed: int, total: int) -> None:
+        CalculateJob.objects.filter(id=job.id).update(
+            processed_operations=processed,
+            total_operations=total,
+            updated_at=timezone.now(),
+        )
+
+    try:
+        with _heartbeat(job.id):
+            result = calculate_transactions(
+                job.user,
+                job.start_date,
+                job.end_date,
+                on_progress=_on_progress,
+            )
+    except Exception as e:
+        logger.exception(f"Calculate job {job.id} failed")
+        job.status = CalculateJobStatus.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return
+
+    job.refresh_from_db(fields=["processed_operations", "total_operations"])
+    job.status = CalculateJobStatus.DONE
+    job.transactions_created = result.transactions_created
+    job.transactions_all = result.transactions_all
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=[
+            "status",
+            "transactions_created",
+            "transactions_all",
+            "finished_at",
+            "updated_at",
+        ]
+    )
+
+
+@contextmanager
+def _heartbeat(job_id: UUID) -> Iterator[None]:
+    """Пока выполняется блок, фоновый поток раз в JOB_HEARTBEAT_INTERVAL продлевает задачу.
+
+    Прогресс приходит только между операциями, а одна операция может считаться дольше
+    JOB_STALE_TIMEOUT — без пульса живую задачу забрал бы второй воркер.
+    """
+    stopped = threading.Event()
+
+    def _beat() -> None:
+        try:
+            while not stopped.wait(JOB_HEARTBEAT_INTERVAL.total_seconds()):
+                try:
+                    _touch_job(job_id)
+                except Exception:
+                    logger.exception(f"Calculate job {job_id} heartbeat failed")
+        finally:
+            # у потока своё соединение с БД, оно не закроется само
+            connection.close()
+
+    thread = threading.Thread(target=_beat, name=f"calculate-job-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _touch_job(job_id: UUID) -> None:
+    CalculateJob.objects.filter(id=job_id, status=CalculateJobStatus.RUNNING).update(
+        updated_at=timezone.now()
+    )
+
+
+def process_pending_jobs(limit: int | None = None) -> int:
+    """Выполняет задачи из очереди, пока она не опустеет или не достигнут лимит."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
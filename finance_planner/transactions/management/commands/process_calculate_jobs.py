@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from transactions.jobs import process_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Processes queued calculate jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the current queue and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_pending_jobs()
+            if processed:
+                self.stdout.write(f"Processed {processed} calculate job(s)")
+            if options["once"]:
+                return
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from transactions.summaries import rebuild_monthly_summaries
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuilds monthly transaction summaries of closed months from the ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Rebuild summaries of a single user (by username) instead of everyone.",
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"] is not None:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User '{options['user']}' does not exist")
+        created = rebuild_monthly_summaries(user)
+        self.stdout.write(f"Created {created} monthly summary row(s)")
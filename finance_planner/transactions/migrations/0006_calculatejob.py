@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:01
+
+import uuid
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0005_transaction_planned_date"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalculateJob",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("done", "Выполнено"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                ("start_date", models.DateField(verbose_name="Начало окна расчёта")),
+                ("end_date", models.DateField(verbose_name="Конец окна расчёта")),
+                (
+                    "processed_operations",
+                    models.PositiveIntegerField(default=0, verbose_name="Обработано операций"),
+                ),
+                (
+                    "total_operations",
+                    models.PositiveIntegerField(default=0, verbose_name="Всего операций"),
+                ),
+                ("transactions_created", models.PositiveIntegerField(blank=True, null=True)),
+                ("transactions_all", models.PositiveIntegerField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, verbose_name="Ошибка")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="calculate_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Задача расчёта",
+                "verbose_name_plural": "Задачи расчёта",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(fields=["status", "created_at"], name="calculate_job_queue_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def get_duplicated_ids(transactions, field: str) -> list:
+    """ID лишних строк среди transactions с одинаковыми (field, planned_date).
+
+    Из дубликатов остаётся подтверждённая строка — её сумма уже в current_balance, —
+    а среди равных по подтверждению самая старая.
+    """
+    seen: set[tuple] = set()
+    duplicated_ids = []
+    planned = (
+        transactions.filter(**{f"{field}__isnull": False}, planned_date__isnull=False)
+        .order_by("-confirmed", "created_at")
+        .values_list("id", f"{field}_id", "planned_date")
+    )
+    for transaction_id, source_id, planned_date in planned.iterator():
+        key = (source_id, planned_date)
+        if key in seen:
+            duplicated_ids.append(transaction_id)
+        else:
+            seen.add(key)
+    return duplicated_ids
+
+
+def remove_duplicated_planned_transactions(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    for field in ("operation", "scenario_rule"):
+        duplicated_ids = get_duplicated_ids(Transaction.objects.all(), field)
+        Transaction.objects.filter(id__in=duplicated_ids).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_account_current_balance_updated"),
+        ("regular_operations", "0005_remove_regularoperation_is_active_and_more"),
+        ("scenarios", "0006_remove_scenario_is_active_scenario_active_before"),
+        ("transactions", "0006_calculatejob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_planned_transactions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="transaction",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("operation__isnull", False), ("planned_date__isnull", False)),
+                fields=("operation", "planned_date"),
+                name="transaction_unique_operation_planned_date",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="transaction",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("planned_date__isnull", False), ("scenario_rule__isnull", False)
+                ),
+                fields=("scenario_rule", "planned_date"),
+                name="transaction_unique_scenario_rule_planned_date",
+            ),
+        ),
+    ]
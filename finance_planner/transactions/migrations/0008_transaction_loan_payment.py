@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("loans", "0001_initial"),
+        ("transactions", "0007_transaction_unique_planned_occurrences"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="loan_payment",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="transaction",
+                to="loans.loanpayment",
+            ),
+        ),
+    ]
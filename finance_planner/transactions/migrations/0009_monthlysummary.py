@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:08
+
+import uuid
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_account_interest"),
+        ("transactions", "0008_transaction_loan_payment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlySummary",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Первый день месяца")),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("income", "Пополнение"),
+                            ("expense", "Списание"),
+                            ("transfer", "Перевод"),
+                        ],
+                        max_length=20,
+                        verbose_name="Тип операции",
+                    ),
+                ),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=4, max_digits=19, verbose_name="Сумма"),
+                ),
+                ("count", models.PositiveIntegerField(verbose_name="Количество транзакций")),
+                (
+                    "from_account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="accounts.account",
+                    ),
+                ),
+                (
+                    "to_account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="accounts.account",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Итоги месяца",
+                "verbose_name_plural": "Итоги месяцев",
+                "ordering": ["month"],
+                "indexes": [
+                    models.Index(fields=["user", "month"], name="monthly_summary_user_month_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("loans", "0002_loan_unique_active_account"),
+        ("transactions", "0009_monthlysummary"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="loan_payment",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="transactions",
+                to="loans.loanpayment",
+            ),
+        ),
+    ]
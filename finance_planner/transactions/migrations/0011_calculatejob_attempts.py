@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0010_transaction_loan_payment_fk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calculatejob",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0, verbose_name="Попыток выполнения"),
+        ),
+    ]
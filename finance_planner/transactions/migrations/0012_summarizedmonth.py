@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:51
+
+import uuid
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import model_utils.fields
+
+
+def mark_stored_months(apps, schema_editor):
+    MonthlySummary = apps.get_model("transactions", "MonthlySummary")
+    SummarizedMonth = apps.get_model("transactions", "SummarizedMonth")
+    SummarizedMonth.objects.bulk_create(
+        SummarizedMonth(user_id=user_id, month=month)
+        for user_id, month in MonthlySummary.objects.values_list("user", "month")
+        .distinct()
+        .order_by()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0011_calculatejob_attempts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SummarizedMonth",
+            fields=[
+                (
+                    "id",
+                    model_utils.fields.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Первый день месяца")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="summarized_months",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Посчитанный месяц",
+                "verbose_name_plural": "Посчитанные месяцы",
+                "ordering": ["month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "month"), name="summarized_month_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(mark_stored_months, migrations.RunPython.noop),
+    ]
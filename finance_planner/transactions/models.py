@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from core.models import TombstoneEntity, record_tombstones
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 from model_utils.models import UUIDModel
 
 
@@ -58,11 +61,159 @@ class Transaction(UUIDModel):
         null=True,
         blank=True,
     )
+    # платёж по кредиту даёт перевод основного долга и расход на проценты
+    loan_payment = models.ForeignKey(
+        "loans.LoanPayment",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transactions",
+    )
 
     class Meta:
         verbose_name = "Операция"
         verbose_name_plural = "Операции"
         ordering = ["-date", "-created_at"]
+        constraints = [
+            # одна регулярная операция/правило сценария даёт не больше одной транзакции в
+            # запланированную дату — расчёт полагается на это через ON CONFLICT DO NOTHING
+            models.UniqueConstraint(
+                fields=["operation", "planned_date"],
+                condition=Q(operation__isnull=False, planned_date__isnull=False),
+                name="transaction_unique_operation_planned_date",
+            ),
+            models.UniqueConstraint(
+                fields=["scenario_rule", "planned_date"],
+                condition=Q(scenario_rule__isnull=False, planned_date__isnull=False),
+                name="transaction_unique_scenario_rule_planned_date",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.date} {self.type} {self.amount}"
+
+
+def delete_future_planned_transactions(condition: Q) -> int:
+    """Удаляет будущие неподтверждённые транзакции, подходящие под condition, одним DELETE.
+
+    Прошлые и подтверждённые транзакции остаются как история.
+    """
+    return delete_transactions(
+        Transaction.objects.filter(
+            condition,
+            confirmed=False,
+            planned_date__gte=timezone.localdate(),
+        )
+    )
+
+
+def delete_transactions(transactions: QuerySet[Transaction]) -> int:
+    """Удаляет транзакции одним DELETE по их id и оставляет надгробия для ленты изменений."""
+    rows = list(transactions.values_list("user_id", "id"))
+    if not rows:
+        return 0
+    deleted, _ = Transaction.objects.filter(id__in=[row[1] for row in rows]).delete()
+    record_tombstones(TombstoneEntity.TRANSACTION, rows)
+    return deleted
+
+
+class MonthlySummary(UUIDModel):
+    """Итоги транзакций закрытого месяца по типу и паре счетов.
+
+    Пара (from_account, to_account) вместо одного счёта сохраняет направление перевода.
+    Строки пересчитываются целым месяцем из мест записи транзакций, см. transactions.summaries.
+    """
+
+    user = models.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="monthly_summaries"
+    )
+    month = models.DateField(verbose_name="Первый день месяца")
+    type = models.CharField(
+        max_length=20, choices=TransactionType.choices, verbose_name="Тип операции"
+    )
+    # удаление счёта обнуляет ссылки так же, как у самих транзакций
+    from_account = models.ForeignKey(
+        "accounts.Account", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    to_account = models.ForeignKey(
+        "accounts.Account", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    total = models.DecimalField(max_digits=19, decimal_places=4, verbose_name="Сумма")
+    count = models.PositiveIntegerField(verbose_name="Количество транзакций")
+
+    class Meta:
+        verbose_name = "Итоги месяца"
+        verbose_name_plural = "Итоги месяцев"
+        ordering = ["month"]
+        indexes = [
+            models.Index(fields=["user", "month"], name="monthly_summary_user_month_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m} {self.type} {self.total}"
+
+
+class SummarizedMonth(UUIDModel):
+    """Отметка, что итоги закрытого месяца пользователя посчитаны.
+
+    У месяца без транзакций нет строк MonthlySummary, поэтому признаком пересчёта служит
+    отметка, а не наличие строк.
+    """
+
+    user = models.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="summarized_months"
+    )
+    month = models.DateField(verbose_name="Первый день месяца")
+
+    class Meta:
+        verbose_name = "Посчитанный месяц"
+        verbose_name_plural = "Посчитанные месяцы"
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "month"], name="summarized_month_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m}"
+
+
+class CalculateJobStatus(models.TextChoices):
+    PENDING = "pending", "В очереди"
+    RUNNING = "running", "Выполняется"
+    DONE = "done", "Выполнено"
+    FAILED = "failed", "Ошибка"
+
+
+class CalculateJob(UUIDModel):
+    user = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="calculate_jobs")
+    status = models.CharField(
+        max_length=20,
+        choices=CalculateJobStatus.choices,
+        default=CalculateJobStatus.PENDING,
+        verbose_name="Статус",
+    )
+    start_date = models.DateField(verbose_name="Начало окна расчёта")
+    end_date = models.DateField(verbose_name="Конец окна расчёта")
+    processed_operations = models.PositiveIntegerField(
+        default=0, verbose_name="Обработано операций"
+    )
+    total_operations = models.PositiveIntegerField(default=0, verbose_name="Всего операций")
+    transactions_created = models.PositiveIntegerField(null=True, blank=True)
+    transactions_all = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попыток выполнения")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Задача расчёта"
+        verbose_name_plural = "Задачи расчёта"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="calculate_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.start_date}..{self.end_date} {self.status}"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import calendar
+from collections.abc import Collection
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from django.db.models import Count, F, Q, QuerySet, Sum, Window
+from django.db.models.functions import RowNumber
+from transactions.models import Transaction, TransactionType
+from users.models import User
+
+
+ACCOUNT_TOTAL_FIELDS = ("income", "expense", "transfer_in", "transfer_out")
+
+
+def get_month_bounds(month: date) -> tuple[date, date]:
+    first_day = month.replace(day=1)
+    return first_day, first_day.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def build_month_calendar(
+    user: User,
+    month: date,
+    account_ids: Collection[UUID] | None = None,
+    transactions_limit: int = 0,
+) -> list[dict[str, Any]]:
+    """Итоги по дням месяца: суммы по типам и разбивка по счетам.
+
+    Итоги считаются одним GROUP BY по (дата, тип, счета). При transactions_limit к каждому
+    дню добавляется до стольких крупнейших транзакций — ещё одним запросом с ROW_NUMBER.
+    """
+    first_day, last_day = get_month_bounds(month)
+    transactions = _get_month_transactions(user, first_day, last_day, account_ids)
+
+    days = {
+        first_day + timedelta(days=offset): _empty_day(first_day + timedelta(days=offset))
+        for offset in range((last_day - first_day).days + 1)
+    }
+    rows = (
+        transactions.values("date", "type", "from_account", "to_account")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        day = days[row["date"]]
+        day[row["type"]] += row["total"]
+        day["count"] += row["count"]
+        for account_id, field_name in _get_account_fields(row):
+            if account_ids is not None and account_id not in account_ids:
+                continue
+            account_totals = day["accounts"].setdefault(str(account_id), _empty_account())
+            account_totals[field_name] += row["total"]
+            account_totals["count"] += row["count"]
+
+    if transactions_limit:
+        for day in days.values():
+            day["transactions"] = []
+        for transaction in transactions.annotate(
+            day_index=Window(RowNumber(), partition_by=F("date"), order_by=F("amount").desc())
+        ).filter(day_index__lte=transactions_limit):
+            days[transaction.date]["transactions"].append(transaction)
+
+    return list(days.values())
+
+
+def _get_month_transactions(
+    user: User, first_day: date, last_day: date, account_ids: Collection[UUID] | None
+) -> QuerySet[Transaction]:
+    transactions = Transaction.objects.filter(user=user, date__gte=first_day, date__lte=last_day)
+    if account_ids is not None:
+        transactions = transactions.filter(
+            Q(from_account_id__in=account_ids) | Q(to_account_id__in=account_ids)
+        )
+    return transactions
+
+
+def _get_account_fields(row: dict[str, Any]) -> list[tuple[UUID, str]]:
+    match row["type"]:
+        case TransactionType.INCOME:
+            fields = [(row["to_account"], "income")]
+        case TransactionType.EXPENSE:
+            fields = [(row["from_account"], "expense")]
+        case _:
+            fields = [(row["from_account"], "transfer_out"), (row["to_account"], "transfer_in")]
+    return [(account_id, field_name) for account_id, field_name in fields if account_id]
+
+
+def _empty_day(day: date) -> dict[str, Any]:
+    return {
+        "date": day,
+        **{transaction_type: Decimal("0") for transaction_type in TransactionType.values},
+        "count": 0,
+        "accounts": {},
+    }
+
+
+def _empty_account() -> dict[str, Any]:
+    return {**{field_name: Decimal("0") for field_name in ACCOUNT_TOTAL_FIELDS}, "count": 0}
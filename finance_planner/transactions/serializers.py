@@ -2,7 +2,9 @@ from typing import Any
 
 from django.utils import timezone
 from rest_framework import serializers
-from transactions.models import Transaction
+from serializers import StartEndInputSerializer
+from transactions.aggregation import GROUP_BY_CHOICES, GROUP_BY_PERIODS
+from transactions.models import CalculateJob, CalculateJobStatus, Transaction
 
 
 class TransactionSerializer(serializers.ModelSerializer):
@@ -110,3 +112,181 @@ class TransactionUpdateSerializer(TransactionCreateSerializer):
 class CalculateResponse(serializers.Serializer):
     transactions_created = serializers.IntegerField()
     transactions_all = serializers.IntegerField()
+
+
+class CalculateRequestSerializer(StartEndInputSerializer):
+    run_async = serializers.BooleanField(
+        default=False,
+        help_text="Поставить расчёт в очередь и вернуть задачу вместо ожидания результата",
+    )
+    dry_run = serializers.BooleanField(
+        default=False,
+        help_text="Вернуть транзакции, которые создал бы расчёт, ничего не сохраняя",
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs["run_async"] and attrs["dry_run"]:
+            raise serializers.ValidationError({"dry_run": "Предпросмотр нельзя запускать в фоне"})
+        return attrs
+
+
+class PlannedTransactionPreviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Transaction
+        fields = [
+            "date",
+            "planned_date",
+            "type",
+            "amount",
+            "from_account",
+            "to_account",
+            "operation",
+            "scenario_rule",
+            "description",
+        ]
+        read_only_fields = fields
+
+
+class UpcomingRequestSerializer(serializers.Serializer):
+    days = serializers.IntegerField(
+        min_value=1, max_value=366, default=14, help_text="Сколько дней вперёд, считая сегодня"
+    )
+
+
+class UpcomingTransactionSerializer(serializers.ModelSerializer):
+    id = serializers.SerializerMethodField()
+    virtual = serializers.SerializerMethodField(help_text="Повторение ещё не создано в БД")
+
+    class Meta:
+        model = Transaction
+        fields = [
+            "id",
+            "date",
+            "type",
+            "amount",
+            "from_account",
+            "to_account",
+            "operation",
+            "scenario_rule",
+            "description",
+            "virtual",
+        ]
+        read_only_fields = fields
+
+    def get_id(self, transaction: Transaction) -> str | None:
+        if transaction._state.adding:
+            return None
+        return str(transaction.id)
+
+    def get_virtual(self, transaction: Transaction) -> bool:
+        return transaction._state.adding
+
+
+class CalendarRequestSerializer(serializers.Serializer):
+    month = serializers.DateField(
+        input_formats=["%Y-%m"], help_text="Месяц в формате ГГГГ-ММ (по умолчанию — текущий)"
+    )
+    accounts = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Список ID счетов модели Account",
+    )
+    transactions_limit = serializers.IntegerField(
+        min_value=0,
+        max_value=20,
+        default=0,
+        help_text="Сколько крупнейших транзакций приложить к каждому дню",
+    )
+
+
+class CalendarTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Transaction
+        fields = [
+            "id",
+            "type",
+            "amount",
+            "from_account",
+            "to_account",
+            "confirmed",
+            "description",
+        ]
+        read_only_fields = fields
+
+
+class CalendarAccountTotalsSerializer(serializers.Serializer):
+    income = serializers.DecimalField(max_digits=19, decimal_places=2)
+    expense = serializers.DecimalField(max_digits=19, decimal_places=2)
+    transfer_in = serializers.DecimalField(max_digits=19, decimal_places=2)
+    transfer_out = serializers.DecimalField(max_digits=19, decimal_places=2)
+    count = serializers.IntegerField()
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    income = serializers.DecimalField(max_digits=19, decimal_places=2)
+    expense = serializers.DecimalField(max_digits=19, decimal_places=2)
+    transfer = serializers.DecimalField(max_digits=19, decimal_places=2)
+    count = serializers.IntegerField()
+    accounts = serializers.DictField(
+        child=CalendarAccountTotalsSerializer(), help_text="Ключ — id счёта"
+    )
+    transactions = CalendarTransactionSerializer(many=True, required=False)
+
+
+class AggregateRequestSerializer(serializers.Serializer):
+    group_by = serializers.ListField(
+        child=serializers.ChoiceField(choices=GROUP_BY_CHOICES),
+        required=False,
+        default=list,
+        help_text="Ключи группировки: один период (day/week/month/year) и поля транзакции",
+    )
+    # те же фильтры, что у списка; здесь — чтобы выбрать закрытые месяцы с готовыми итогами
+    date__gte = serializers.DateField(required=False)
+    date__lte = serializers.DateField(required=False)
+
+    def validate_group_by(self, group_by: list[str]) -> list[str]:
+        if len([key for key in group_by if key in GROUP_BY_PERIODS]) > 1:
+            raise serializers.ValidationError("Можно группировать только по одному периоду")
+        return list(dict.fromkeys(group_by))
+
+
+class AggregateRowSerializer(serializers.Serializer):
+    period = serializers.DateField(required=False, help_text="Начало периода")
+    type = serializers.CharField(required=False)
+    from_account = serializers.UUIDField(required=False)
+    to_account = serializers.UUIDField(required=False)
+    operation = serializers.UUIDField(required=False)
+    total = serializers.DecimalField(max_digits=19, decimal_places=4)
+    count = serializers.IntegerField()
+
+
+class CalculateJobSerializer(serializers.ModelSerializer):
+    result = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CalculateJob
+        fields = [
+            "id",
+            "status",
+            "start_date",
+            "end_date",
+            "processed_operations",
+            "total_operations",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_result(self, obj: CalculateJob) -> dict[str, int] | None:
+        if obj.status != CalculateJobStatus.DONE:
+            return None
+        return CalculateResponse(
+            {
+                "transactions_created": obj.transactions_created,
+                "transactions_all": obj.transactions_all,
+            }
+        ).data
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction as db_transaction
+from django.db.models import Count, Min, QuerySet, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+import django_filters
+from transactions.models import MonthlySummary, SummarizedMonth, Transaction
+from users.models import User
+
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+class MonthlySummaryFilterSet(django_filters.FilterSet):
+    """Те же фильтры списка транзакций, которые можно применить к итогам месяцев."""
+
+    class Meta:
+        model = MonthlySummary
+        fields = {
+            "type": ["exact", "in"],
+            "from_account": ["exact"],
+            "to_account": ["exact"],
+        }
+
+
+def get_open_month() -> date:
+    """Первый день текущего месяца: итоги хранятся только для месяцев до него."""
+    return timezone.localdate().replace(day=1)
+
+
+def iter_months(start_date: date, end_date: date) -> Iterator[date]:
+    """Первые дни месяцев, пересекающихся с [start_date, end_date]."""
+    month = start_date.replace(day=1)
+    while month <= end_date:
+        yield month
+        month += relativedelta(months=1)
+
+
+def refresh_monthly_summaries(user: User, days: Iterable[date]) -> None:
+    """Пересчитывает итоги закрытых месяцев, в которые попадают days.
+
+    Вызывается из мест записи транзакций с датами затронутых строк. Месяц пересчитывается
+    целиком одним GROUP BY, поэтому итоги не расходятся с журналом при любых правках;
+    текущий и будущие месяцы пропускаются без запросов. Пересчитанные месяцы отмечаются
+    в SummarizedMonth, в том числе пустые.
+    """
+    open_month = get_open_month()
+    months = {day.replace(day=1) for day in days if day < open_month}
+    if not months:
+        return
+    with db_transaction.atomic():
+        MonthlySummary.objects.filter(user=user, month__in=months).delete()
+        MonthlySummary.objects.bulk_create(
+            _build_summaries(
+                Transaction.objects.filter(
+                    user=user,
+                    date__gte=min(months),
+                    date__lt=max(months) + relativedelta(months=1),
+                ),
+                months,
+            ),
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+        SummarizedMonth.objects.bulk_create(
+            (SummarizedMonth(user=user, month=month) for month in months),
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_monthly_summaries(user: User | None = None) -> int:
+    """Пересобирает все итоги закрытых месяцев, у всех пользователей или у одного.
+
+    Отметки остаются только у месяцев с транзакциями, пустые досчитаются при чтении.
+    """
+    summaries = MonthlySummary.objects.all()
+    summarized_months = SummarizedMonth.objects.all()
+    transactions = Transaction.objects.filter(date__lt=get_open_month())
+    if user is not None:
+        summaries = summaries.filter(user=user)
+        summarized_months = summarized_months.filter(user=user)
+        transactions = transactions.filter(user=user)
+    with db_transaction.atomic():
+        summaries.delete()
+        summarized_months.delete()
+        created = MonthlySummary.objects.bulk_create(
+            _build_summaries(transactions), batch_size=BULK_CREATE_BATCH_SIZE
+        )
+        months = {(summary.user_id, summary.month) for summary in created}  # type: ignore[attr-defined]
+        SummarizedMonth.objects.bulk_create(
+            SummarizedMonth(user_id=user_id, month=month) for user_id, month in months
+        )
+    return len(created)
+
+
+def get_closed_month_summaries(
+    user: User, date_from: date | None, date_to: date | None
+) -> tuple[QuerySet[MonthlySummary], date, date] | None:
+    """Итоги закрытых месяцев, целиком лежащих в [date_from, date_to].
+
+    Возвращает строки и границы [first_month, end_month) этих месяцев или None, если таких
+    месяцев нет. Месяцы без отметки SummarizedMonth (например, только что закрывшийся)
+    досчитываются из журнала перед чтением.
+    """
+    end_month = get_open_month()
+    if date_to is not None:
+        end_month = min(end_month, (date_to + relativedelta(days=1)).replace(day=1))
+    if date_from is not None:
+        first_month = date_from.replace(day=1)
+        if first_month < date_from:
+            first_month += relativedelta(months=1)
+    else:
+        first_date = Transaction.objects.filter(user=user, date__lt=end_month).aggregate(
+            first_date=Min("date")
+        )["first_date"]
+        if first_date is None:
+            return None
+        first_month = first_date.replace(day=1)
+    if first_month >= end_month:
+        return None
+
+    summaries = MonthlySummary.objects.filter(
+        user=user, month__gte=first_month, month__lt=end_month
+    )
+    stored_months = set(
+        SummarizedMonth.objects.filter(
+            user=user, month__gte=first_month, month__lt=end_month
+        ).values_list("month", flat=True)
+    )
+    refresh_monthly_summaries(
+        user,
+        (
+            month
+            for month in iter_months(first_month, end_month - relativedelta(days=1))
+            if month not in stored_months
+        ),
+    )
+    return summaries, first_month, end_month
+
+
+def _build_summaries(
+    transactions: QuerySet[Transaction], months: set[date] | None = None
+) -> Iterator[MonthlySummary]:
+    rows = (
+        transactions.annotate(month=TruncMonth("date"))
+        .values("user", "month", "type", "from_account", "to_account")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    for row in rows.iterator():
+        if months is not None and row["month"] not in months:
+            continue
+        yield MonthlySummary(
+            user_id=row["user"],
+            month=row["month"],
+            type=row["type"],
+            from_account_id=row["from_account"],
+            to_account_id=row["to_account"],
+            total=row["total"],
+            count=row["count"],
+        )
@@ -1,43 +1,57 @@
-import calendar
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import logging
+from typing import Any
+from uuid import UUID
 
+from accounts.low_balance import refresh_low_balance_dates
 from accounts.models import Account
-from dateutil.rrule import DAILY, rrule
-from django.db import transaction, transaction as db_transaction
-from django.db.models import F, Q, QuerySet
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
-from regular_operations.models import (
-    RegularOperation,
-    RegularOperationPeriodType,
-    RegularOperationType,
-)
-from rest_framework import filters, permissions, status, viewsets
+from rest_framework import filters, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
-from serializers import StartEndInputSerializer
-from transactions.models import Transaction, TransactionType
+from transactions.aggregation import aggregate_transactions, can_use_summaries
+from transactions.calculation import (
+    build_upcoming_transactions,
+    calculate_transactions,
+    iter_virtual_transactions,
+)
+from transactions.models import CalculateJob, Transaction, delete_transactions
+from transactions.month_calendar import build_month_calendar
 from transactions.serializers import (
+    AggregateRequestSerializer,
+    AggregateRowSerializer,
+    CalculateJobSerializer,
+    CalculateRequestSerializer,
     CalculateResponse,
+    CalendarDaySerializer,
+    CalendarRequestSerializer,
+    PlannedTransactionPreviewSerializer,
     TransactionCreateSerializer,
     TransactionSerializer,
     TransactionUpdateSerializer,
+    UpcomingRequestSerializer,
+    UpcomingTransactionSerializer,
+)
+from transactions.summaries import (
+    MonthlySummaryFilterSet,
+    get_closed_month_summaries,
+    refresh_monthly_summaries,
 )
 from utils import field_updated, get_result_field
 
 
 logger = logging.getLogger(__name__)
 
-OPERATION_TO_TRANSACTION_TYPE: dict[str, str] = {
-    RegularOperationType.INCOME: TransactionType.INCOME,
-    RegularOperationType.EXPENSE: TransactionType.EXPENSE,
-}
-
 
 class TransactionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
@@ -89,11 +103,15 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 from_account = serializer.validated_data.get("from_account")
                 if from_account is not None:
                     self._change_account_balance(from_account, -amount, datetime_now)
-            serializer.save(user=self.request.user)
+            instance = serializer.save(user=self.request.user)
+            refresh_low_balance_dates(_get_account_ids(instance))
+            refresh_monthly_summaries(self.request.user, [instance.date])  # type: ignore[arg-type]
 
     def perform_update(self, serializer: TransactionCreateSerializer):  # type: ignore[override]
         with transaction.atomic():
             datetime_now = timezone.now()
+            old_account_ids = _get_account_ids(serializer.instance)
+            old_date = serializer.instance.date  # type: ignore[union-attr]
             is_amount_updated = field_updated("amount", serializer)
             is_to_account_updated = field_updated("to_account", serializer)
             is_from_account_updated = field_updated("from_account", serializer)
@@ -122,7 +140,16 @@ class TransactionViewSet(viewsets.ModelViewSet):
                     self._change_account_balance(old_from_account, old_amount, datetime_now)
                     self._change_account_balance(new_from_account, -new_amount, datetime_now)
 
-            serializer.save(user=self.request.user)
+            instance = serializer.save(user=self.request.user)
+            refresh_low_balance_dates(old_account_ids | _get_account_ids(instance))
+            refresh_monthly_summaries(self.request.user, {old_date, instance.date})  # type: ignore[arg-type]
+
+    def perform_destroy(self, instance: Transaction):
+        with transaction.atomic():
+            account_ids = _get_account_ids(instance)
+            delete_transactions(Transaction.objects.filter(id=instance.id))
+            refresh_low_balance_dates(account_ids)
+            refresh_monthly_summaries(self.request.user, [instance.date])  # type: ignore[arg-type]
 
     def _change_account_balance(
         self, account: Account | None, amount: Decimal, datetime_now: datetime
@@ -138,22 +165,27 @@ class TransactionViewSet(viewsets.ModelViewSet):
         rows = Account.objects.filter(id=account_obj.id).update(
             current_balance=F("current_balance") + amount,
             current_balance_updated=datetime_now,
+            updated_at=datetime_now,
         )
         if not rows:
             raise ValueError(f"User '{self.request.user}' doesn't have account '{account}'")
 
     @swagger_auto_schema(
-        request_body=StartEndInputSerializer(),
+        request_body=CalculateRequestSerializer(),
         methods=[
             "post",
         ],
-        responses={200: CalculateResponse, 400: "Ошибка"},
+        responses={
+            200: CalculateResponse,
+            202: CalculateJobSerializer,
+            400: "Ошибка",
+        },
     )
     @action(detail=False, methods=["post"], url_path="calculate")
     def calculate(self, request: Request):
         """Создать транзакции на основе регулярных операций."""
         # 1) Валидируем входные параметры через сериализатор
-        serializer = StartEndInputSerializer(data=request.data)
+        serializer = CalculateRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         params = serializer.validated_data
 
@@ -161,131 +193,153 @@ class TransactionViewSet(viewsets.ModelViewSet):
         start_date: date = params.get("start_date") or current_date
         end_date: date = params.get("end_date") or current_date + timedelta(days=90)
 
-        now = timezone.now()
-        # 2) Дальше — логика создания/планирования
-        date_range_regular_operations: QuerySet[RegularOperation] = (
-            RegularOperation.available_objects.filter(
-                user=request.user, active_before__gt=now.date()
+        # 2) Предпросмотр идёт тем же генератором, что и расчёт, но без записи и блокировок
+        if params["dry_run"]:
+            return StreamingHttpResponse(
+                _stream_json_list(
+                    PlannedTransactionPreviewSerializer,
+                    iter_virtual_transactions(request.user, start_date, end_date),  # type: ignore[arg-type]
+                ),
+                content_type="application/json",
+            )
+
+        # 3) Длинные окна можно отдать воркеру, чтобы не держать gunicorn-воркер
+        if params["run_async"]:
+            job = CalculateJob.objects.create(
+                user=request.user,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            return Response(
+                CalculateJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
             )
-            .filter(start_date__date__lte=end_date)
-            .filter(Q(end_date__date__gte=start_date) | Q(deleted_at__isnull=True))
-            .filter(Q(deleted_at__date__lt=end_date) | Q(deleted_at__isnull=True))
-            .select_related("from_account", "to_account")
-            .prefetch_related("scenario", "scenario__rules")
-        )
-        date_range_existing_transactions = (
-            Transaction.objects.filter(user=request.user)
-            .filter(planned_date__gte=start_date)
-            .filter(planned_date__lte=end_date)
-        )
 
-        with db_transaction.atomic():
-            existing_transaction_ids = 0
-            all_transactions = []
-            for regular_operation in date_range_regular_operations:
-                scenario_rules = []
-                if hasattr(regular_operation, "scenario"):
-                    scenario_rules = regular_operation.scenario.rules.all()
-
-                # noinspection PyTypeChecker
-                for dt in rrule(DAILY, dtstart=start_date, until=end_date):
-                    selected_date = dt.date()
-
-                    if not _is_transaction_day(
-                        regular_operation.start_date.date(),
-                        regular_operation.deleted_at.date()
-                        if regular_operation.deleted_at
-                        else None,
-                        selected_date,
-                        regular_operation.period_type,
-                        regular_operation.period_interval,
-                    ):
-                        continue
-                    existing_transaction_ids += 1
-                    if not date_range_existing_transactions.filter(
-                        operation=regular_operation,
-                        planned_date=selected_date,
-                    ).exists():
-                        all_transactions.append(
-                            Transaction.objects.create(
-                                user=request.user,
-                                date=selected_date,
-                                planned_date=selected_date,
-                                type=OPERATION_TO_TRANSACTION_TYPE[regular_operation.type],
-                                amount=regular_operation.amount,
-                                from_account=regular_operation.from_account,
-                                to_account=regular_operation.to_account,
-                                operation=regular_operation,
-                                confirmed=False,
-                                description=f"Операция для {regular_operation.title}",
-                            )
-                        )
-
-                    for scenario_index, rule in enumerate(scenario_rules):
-                        existing_transaction_ids += 1
-                        if not date_range_existing_transactions.filter(
-                            scenario_rule=rule,
-                            planned_date=selected_date,
-                        ).exists():
-                            all_transactions.append(
-                                Transaction.objects.create(
-                                    user=request.user,
-                                    date=selected_date,
-                                    planned_date=selected_date,
-                                    type=TransactionType.TRANSFER,
-                                    amount=rule.amount,
-                                    from_account=regular_operation.to_account,
-                                    to_account=rule.target_account,
-                                    scenario_rule=rule,
-                                    confirmed=False,
-                                    description=f"Операция для {regular_operation.scenario.title} "  # type: ignore[attr-defined]
-                                    f"({scenario_index})",
-                                )
-                            )
+        # 4) Дальше — логика создания/планирования
+        result = calculate_transactions(request.user, start_date, end_date)  # type: ignore[arg-type]
 
         return Response(
             CalculateResponse(
                 {
-                    "transactions_created": len(all_transactions),
-                    "transactions_all": existing_transaction_ids,
+                    "transactions_created": result.transactions_created,
+                    "transactions_all": result.transactions_all,
                 }
             ).data,
             status=status.HTTP_200_OK,
         )
 
+    @swagger_auto_schema(
+        methods=[
+            "get",
+        ],
+        responses={200: CalculateJobSerializer, 404: "Задача не найдена"},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"calculate/jobs/(?P<job_id>[^/.]+)",
+    )
+    def calculate_job(self, request: Request, job_id: str):
+        """Статус и результат фоновой задачи расчёта."""
+        job = get_object_or_404(CalculateJob, id=job_id, user=request.user)
+        return Response(CalculateJobSerializer(job).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        query_serializer=UpcomingRequestSerializer(),
+        methods=[
+            "get",
+        ],
+        responses={200: UpcomingTransactionSerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["get"], url_path="upcoming")
+    def upcoming(self, request: Request):
+        """Ближайшие платежи: запланированные транзакции и ещё не рассчитанные повторения."""
+        serializer = UpcomingRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
 
-def _is_transaction_day(  # noqa: PLR0911
-    created_date: date,
-    deleted_date: date | None,
-    current_date: date,
-    period_type: str,
-    period_interval: int,
-) -> bool:
-    if current_date < created_date:
-        return False
-    if deleted_date is not None and current_date >= deleted_date:
-        return False
-
-    match period_type:
-        case RegularOperationPeriodType.DAY:
-            delta_days = (current_date - created_date).days
-            return delta_days % period_interval == 0
-        case RegularOperationPeriodType.WEEK:
-            if current_date.weekday() != created_date.weekday():
-                return False
-            delta_days = (current_date - created_date).days
-            weeks = delta_days // 7
-            return weeks % period_interval == 0
-        case RegularOperationPeriodType.MONTH:
-            months_from_start = (current_date.year - created_date.year) * 12 + (
-                current_date.month - created_date.month
+        start_date = timezone.localdate()
+        end_date = start_date + timedelta(days=serializer.validated_data["days"] - 1)
+        upcoming = build_upcoming_transactions(request.user, start_date, end_date)  # type: ignore[arg-type]
+        return Response(
+            UpcomingTransactionSerializer(upcoming, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        query_serializer=CalendarRequestSerializer(),
+        methods=[
+            "get",
+        ],
+        responses={200: CalendarDaySerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["get"], url_path="calendar")
+    def calendar(self, request: Request):
+        """Календарь месяца: суммы и число транзакций по дням и счетам."""
+        query = request.query_params.copy()
+        query.setdefault("month", timezone.localdate().strftime("%Y-%m"))
+        serializer = CalendarRequestSerializer(data=query)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        days = build_month_calendar(
+            request.user,  # type: ignore[arg-type]
+            params["month"],
+            set(params["accounts"]) if "accounts" in params else None,
+            params["transactions_limit"],
+        )
+        return Response(CalendarDaySerializer(days, many=True).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        query_serializer=AggregateRequestSerializer(),
+        methods=[
+            "get",
+        ],
+        responses={200: AggregateRowSerializer(many=True), 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["get"], url_path="aggregate")
+    def aggregate(self, request: Request):
+        """Суммы и количество транзакций по периодам, типам, счетам и операциям.
+
+        Принимает те же фильтры, что и список транзакций.
+        """
+        serializer = AggregateRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        params = serializer.validated_data
+        transactions = self.filter_queryset(self.get_queryset())
+
+        summaries = None
+        closed_months = None
+        if can_use_summaries(request.query_params, params["group_by"]):
+            closed_months = get_closed_month_summaries(
+                request.user,  # type: ignore[arg-type]
+                params.get("date__gte"),
+                params.get("date__lte"),
             )
-            if months_from_start % period_interval != 0:
-                return False
-            last_day_this_month = calendar.monthrange(current_date.year, current_date.month)[1]
-            due_day = min(created_date.day, last_day_this_month)
+        if closed_months is not None:
+            # закрытые месяцы берутся из готовых итогов, журнал читается только вне них
+            month_summaries, first_month, end_month = closed_months
+            summaries = MonthlySummaryFilterSet(request.query_params, queryset=month_summaries).qs
+            transactions = transactions.exclude(date__gte=first_month, date__lt=end_month)
+
+        rows = aggregate_transactions(transactions, params["group_by"], summaries)
+        return Response(AggregateRowSerializer(rows, many=True).data, status=status.HTTP_200_OK)
+
+
+def _get_account_ids(instance: Transaction | None) -> set[UUID | None]:
+    if instance is None:
+        return set()
+    return {instance.from_account_id, instance.to_account_id}  # type: ignore[attr-defined]
 
-            return current_date.day == due_day
 
-        case _:
-            raise ValueError(f"Unknown period type: {period_type}")
+def _stream_json_list(
+    serializer_class: type[serializers.BaseSerializer],
+    instances: Iterable[Any],
+) -> Iterator[bytes]:
+    """Отдаёт JSON-массив по одному элементу, не собирая весь ответ в памяти."""
+    renderer = JSONRenderer()
+    separator = b"["
+    for instance in instances:
+        yield separator + renderer.render(serializer_class(instance).data)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from accounts.models import Account
+from accounts.projection import build_balance_curves
+from django.db.models import Prefetch
+from django.utils import timezone
+from regular_operations.models import RegularOperation
+from scenarios.models import ScenarioRule
+from transactions.models import Transaction
+from users.models import User
+
+
+def build_dashboard(user: User, days: int, transactions_limit: int) -> dict[str, Any]:
+    """Данные главного экрана за фиксированное число запросов.
+
+    Счета загружаются один раз и идут и в список, и в кривые баланса. Балансы считаются
+    по кривым прогноза с сегодняшнего дня на days дней вперёд, включая ещё не рассчитанные
+    повторения и проценты по ставке счёта, как в статистике. Число запросов не зависит
+    от числа счетов, операций и транзакций.
+    """
+    today = timezone.localdate()
+    horizon = today + timedelta(days=days - 1)
+    accounts = list(Account.objects.filter(user=user).order_by("-created_at"))
+    accounts_by_id = {account.id: account for account in accounts}
+
+    balances = {}
+    if accounts_by_id:
+        curves = build_balance_curves(user, accounts_by_id, today, horizon)
+        balances = {
+            str(account_id): curve.balances(today, horizon) for account_id, curve in curves.items()
+        }
+
+    regular_operations = (
+        RegularOperation.objects.filter(user=user)
+        .select_related("from_account", "to_account")
+        .prefetch_related(
+            # счёт правила приходит JOIN-ом вместо отдельного запроса к счетам
+            Prefetch(
+                "scenario__rules", queryset=ScenarioRule.objects.select_related("target_account")
+            )
+        )
+        .order_by("-created_at")
+    )
+    # последние транзакции по сегодняшний день: будущие запланированные строки сюда не идут;
+    # scenario_id транзакции читается через правило, поэтому оно подтягивается тем же JOIN
+    transactions = (
+        Transaction.objects.filter(user=user, date__lte=today)
+        .select_related("from_account", "to_account", "scenario_rule")
+        .order_by("-date", "-created_at")[:transactions_limit]
+    )
+
+    return {
+        "user": user,
+        "accounts": accounts,
+        "balances": balances,
+        "regular_operations": list(regular_operations),
+        "transactions": list(transactions),
+    }
@@ -1,6 +1,9 @@
+from accounts.serializers import AccountSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from regular_operations.serializers import RegularOperationSerializer
 from rest_framework import serializers
+from transactions.serializers import TransactionSerializer
 
 
 User = get_user_model()
@@ -141,3 +144,25 @@ class UserServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["first_name", "last_name", "email"]
+
+
+class DashboardRequestSerializer(serializers.Serializer):
+    days = serializers.IntegerField(
+        min_value=1, max_value=366, default=30, help_text="На сколько дней показать балансы"
+    )
+    transactions_limit = serializers.IntegerField(
+        min_value=0, max_value=100, default=10, help_text="Сколько последних транзакций вернуть"
+    )
+
+
+class DashboardSerializer(serializers.Serializer):
+    user = UserSerializer()
+    accounts = AccountSerializer(many=True)
+    balances = serializers.DictField(
+        child=serializers.DictField(
+            child=serializers.DecimalField(max_digits=12, decimal_places=2)
+        ),
+        help_text="Ключ — id счёта, значение — словарь {'дата': баланс}",
+    )
+    regular_operations = RegularOperationSerializer(many=True)
+    transactions = TransactionSerializer(many=True)
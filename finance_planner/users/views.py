@@ -1,15 +1,19 @@
 from auth.permissions import ServiceTokenPermission
 from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import mixins, permissions, status
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
+from users.dashboard import build_dashboard
 from users.models import User
 from users.serializers import (
     ChangePasswordSerializer,
+    DashboardRequestSerializer,
+    DashboardSerializer,
     UserSerializer,
     UserServiceSerializer,
 )
@@ -40,6 +44,32 @@ class UserViewSet(
         serializer = self.get_serializer(user)
         return Response(serializer.data)
 
+    @swagger_auto_schema(
+        query_serializer=DashboardRequestSerializer(),
+        methods=[
+            "get",
+        ],
+        responses={200: DashboardSerializer, 400: "Ошибка"},
+    )
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request: Request) -> Response:
+        """Главный экран одним запросом: пользователь, счета, балансы, операции и транзакции.
+
+        Заменяет отдельные запросы к me, списку и статистике счетов, регулярным операциям и
+        транзакциям.
+        """
+        serializer = DashboardRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        dashboard = build_dashboard(
+            request.user,  # type: ignore[arg-type]
+            serializer.validated_data["days"],
+            serializer.validated_data["transactions_limit"],
+        )
+        return Response(
+            DashboardSerializer(dashboard, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=False, methods=["post"], url_path="change-password")
     def change_password(self, request: Request) -> Response:
         serializer = self.get_serializer(data=request.data, context={"request": request})
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from accounts.models import Account
+from accounts.projection import build_balance_curves
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    SECOND_ACCOUNT_UUID,
+    THIRD_ACCOUNT_UUID,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+EXPECTED_BALANCES = {
+    MAIN_ACCOUNT_UUID: {
+        "2025-11-01": "750.00",
+        "2025-11-02": "1500.00",
+        "2025-11-03": "2250.00",
+    },
+    SECOND_ACCOUNT_UUID: {
+        "2025-11-01": "300.00",
+        "2025-11-02": "600.00",
+        "2025-11-03": "900.00",
+    },
+    THIRD_ACCOUNT_UUID: {
+        "2025-11-01": "300.00",
+        "2025-11-02": "600.00",
+        "2025-11-03": "900.00",
+    },
+}
+
+STATISTICS_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": (DEFAULT_DATE + timedelta(days=2)).isoformat(),
+}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_forecast_includes_unmaterialized_operations_without_writing(api_client, main_user):
+    transactions_before = Transaction.objects.count()
+
+    flat_response = api_client.post("/api/accounts/statistics/", STATISTICS_PAYLOAD, format="json")
+    forecast_response = api_client.post(
+        "/api/accounts/statistics/", {**STATISTICS_PAYLOAD, "forecast": True}, format="json"
+    )
+
+    assert flat_response.status_code == status.HTTP_200_OK, flat_response.data
+    assert set(flat_response.data["balances"][MAIN_ACCOUNT_UUID].values()) == {"0.00"}
+    assert forecast_response.status_code == status.HTTP_200_OK, forecast_response.data
+    assert forecast_response.data == {"balances": EXPECTED_BALANCES}
+    assert Transaction.objects.count() == transactions_before
+
+
+@freeze_time(DEFAULT_TIME)
+def test_forecast_does_not_double_count_materialized_rows(api_client):
+    calc_response = api_client.post(
+        "/api/transactions/calculate/",
+        {"start_date": DEFAULT_DATE.isoformat(), "end_date": DEFAULT_DATE.isoformat()},
+        format="json",
+    )
+    assert calc_response.status_code == status.HTTP_200_OK, calc_response.data
+
+    response = api_client.post(
+        "/api/accounts/statistics/", {**STATISTICS_PAYLOAD, "forecast": True}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert response.data == {"balances": EXPECTED_BALANCES}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_balance_curve_keeps_occurrences_before_calculated_window(api_client, main_user):
+    end_date = DEFAULT_DATE + timedelta(days=5)
+    response = api_client.post(
+        "/api/accounts/statistics/",
+        {**STATISTICS_PAYLOAD, "end_date": end_date.isoformat(), "forecast": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    # расчёт окна в середине оставляет первые дни без строк в БД
+    calculate_transactions(
+        main_user, DEFAULT_DATE + timedelta(days=2), DEFAULT_DATE + timedelta(days=3)
+    )
+
+    accounts_by_id = {account.id: account for account in Account.objects.filter(user=main_user)}
+    curves = build_balance_curves(main_user, accounts_by_id, DEFAULT_DATE, end_date)
+
+    for account_id, balances in response.data["balances"].items():
+        for day, balance in balances.items():
+            assert curves[UUID(account_id)].balance(date.fromisoformat(day)) == Decimal(balance), (
+                account_id,
+                day,
+            )
+
+
+@freeze_time(DEFAULT_TIME)
+def test_five_year_forecast_uses_bounded_query_count(other_api_client):
+    payload = {
+        "start_date": DEFAULT_DATE.isoformat(),
+        "end_date": (DEFAULT_DATE + timedelta(days=5 * 365)).isoformat(),
+        "forecast": True,
+    }
+
+    with CaptureQueriesContext(connection) as context:
+        response = other_api_client.post("/api/accounts/statistics/", payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    # счета + операции/сценарии/правила + уже рассчитанные ключи + по 2 запроса на счёт
+    assert len(context.captured_queries) <= 6 + 2 * len(response.data["balances"])
+    balances = response.data["balances"]
+    assert all(len(values) == 5 * 365 + 1 for values in balances.values())
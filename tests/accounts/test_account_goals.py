@@ -0,0 +1,141 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from accounts.models import Account, InterestCompounding
+from core.bootstrap import ACCOUNT_UUID_4, DEFAULT_DATE, DEFAULT_TIME, THIRD_ACCOUNT_UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _goals(client, **params) -> dict:
+    response = client.post("/api/accounts/goals/", params, format="json")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+def _reached_on(data: dict, account_id: str) -> str | None:
+    (goal,) = [goal for goal in data["goals"] if str(goal["account"]) == account_id]
+    return goal["reached_on"]
+
+
+@pytest.fixture
+def third_account_goal(main_user) -> Account:
+    account = Account.objects.get(id=THIRD_ACCOUNT_UUID)
+    account.target_amount = Decimal("1000")
+    account.save()
+    return account
+
+
+@freeze_time(DEFAULT_TIME)
+def test_goal_date_for_daily_transfers(api_client, third_account_goal):
+    data = _goals(api_client)
+
+    # 300 в день на накопительный счёт: 1200 к концу четвёртого дня
+    assert _reached_on(data, THIRD_ACCOUNT_UUID) == (DEFAULT_DATE + timedelta(days=3)).isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_goal_date_does_not_double_count_calculated_rows(api_client, third_account_goal):
+    api_client.post(
+        "/api/transactions/calculate/",
+        {"start_date": DEFAULT_DATE.isoformat(), "end_date": DEFAULT_DATE.isoformat()},
+        format="json",
+    )
+
+    data = _goals(api_client)
+
+    assert _reached_on(data, THIRD_ACCOUNT_UUID) == (DEFAULT_DATE + timedelta(days=3)).isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_goal_date_applies_interest_like_statistics(api_client, third_account_goal):
+    # 300 в день дают 10 000 за 34 дня, проценты с 100 000 на счёте ускоряют цель
+    Account.objects.filter(id=THIRD_ACCOUNT_UUID).update(
+        current_balance=Decimal("100000"),
+        target_amount=Decimal("110000"),
+        interest_rate=Decimal("36.5000"),
+        interest_compounding=InterestCompounding.DAY,
+    )
+    end_date = DEFAULT_DATE + timedelta(days=60)
+    statistics_response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": end_date.isoformat(),
+            "forecast": True,
+            "accounts": [THIRD_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][THIRD_ACCOUNT_UUID]
+    expected = next(
+        day for day, balance in balances.items() if Decimal(balance) >= Decimal("110000")
+    )
+
+    data = _goals(api_client, end_date=end_date.isoformat())
+
+    assert _reached_on(data, THIRD_ACCOUNT_UUID) == expected
+    assert expected < (DEFAULT_DATE + timedelta(days=33)).isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_goal_date_matches_daily_forecast(other_api_client):
+    end_date = DEFAULT_DATE + timedelta(days=3 * 365)
+    statistics_response = other_api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": end_date.isoformat(),
+            "forecast": True,
+            "accounts": [ACCOUNT_UUID_4],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][ACCOUNT_UUID_4]
+    expected = next(
+        day for day, balance in balances.items() if Decimal(balance) >= Decimal("70000")
+    )
+
+    data = _goals(other_api_client, end_date=end_date.isoformat())
+
+    assert data["horizon"] == end_date.isoformat()
+    assert _reached_on(data, ACCOUNT_UUID_4) == expected
+
+
+@freeze_time(DEFAULT_TIME)
+def test_goal_outside_horizon_is_not_reached(other_api_client):
+    data = _goals(other_api_client, end_date=(DEFAULT_DATE + timedelta(days=30)).isoformat())
+
+    assert _reached_on(data, ACCOUNT_UUID_4) is None
+
+
+@freeze_time(DEFAULT_TIME)
+def test_already_reached_goal_returns_balance_date(other_api_client):
+    Account.objects.filter(id=ACCOUNT_UUID_4).update(current_balance=Decimal("80000"))
+
+    data = _goals(other_api_client)
+
+    assert _reached_on(data, ACCOUNT_UUID_4) == DEFAULT_DATE.isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_only_goal_accounts_are_projected(other_api_client):
+    data = _goals(other_api_client)
+
+    assert [str(goal["account"]) for goal in data["goals"]] == [ACCOUNT_UUID_4]
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize("years", [5, 50])
+def test_goal_query_count_does_not_depend_on_horizon(other_api_client, years):
+    with CaptureQueriesContext(connection) as context:
+        _goals(other_api_client, end_date=date(DEFAULT_DATE.year + years, 1, 1).isoformat())
+
+    # счета + два агрегата транзакций + последние рассчитанные даты + операции/сценарии/правила
+    assert len(context.captured_queries) <= 10
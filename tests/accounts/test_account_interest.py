@@ -0,0 +1,110 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from accounts.forecast import accrue_balance
+from accounts.models import Account, AccountType, InterestCompounding
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    THIRD_ACCOUNT_UUID,
+)
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _balances(client, account_id: str, start_offset: int, end_offset: int) -> dict[str, str]:
+    response = client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": (DEFAULT_DATE + timedelta(days=start_offset)).isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=end_offset)).isoformat(),
+            "forecast": True,
+            "accounts": [account_id],
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data["balances"][account_id]
+
+
+def _set_interest(account_id: str, rate: str, compounding: InterestCompounding) -> None:
+    Account.objects.filter(id=account_id).update(
+        interest_rate=Decimal(rate), interest_compounding=compounding
+    )
+
+
+@freeze_time(DEFAULT_TIME)
+def test_yearly_interest_on_untouched_debt(other_api_client):
+    response = other_api_client.post(
+        "/api/accounts/",
+        {
+            "name": "Кредит",
+            "type": AccountType.DEBT,
+            "current_balance": "120000.00",
+            "interest_rate": "10.0000",
+            "interest_compounding": InterestCompounding.YEAR,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    account_id = str(response.data["id"])
+
+    balances = _balances(other_api_client, account_id, 0, 365)
+
+    assert balances[DEFAULT_DATE.isoformat()] == "120000.00"
+    assert balances[(DEFAULT_DATE + timedelta(days=365)).isoformat()] == "132000.00"
+
+
+@freeze_time(DEFAULT_TIME)
+def test_interest_matches_daily_accrual(api_client):
+    plain = _balances(api_client, THIRD_ACCOUNT_UUID, 0, 60)
+    _set_interest(THIRD_ACCOUNT_UUID, "12", InterestCompounding.MONTH)
+    daily_factor = (1 + Decimal("0.01")) ** (Decimal(12) / 365)
+
+    balances = _balances(api_client, THIRD_ACCOUNT_UUID, 0, 60)
+
+    expected = Decimal("0")
+    previous = Decimal("0")
+    for day, plain_balance in plain.items():
+        if day != DEFAULT_DATE.isoformat():
+            expected *= daily_factor
+        expected += Decimal(plain_balance) - previous
+        previous = Decimal(plain_balance)
+        assert Decimal(balances[day]) == pytest.approx(expected, abs=Decimal("0.01")), day
+    assert Decimal(balances[day]) > Decimal(plain[day])
+
+
+@freeze_time(DEFAULT_TIME)
+def test_window_after_current_date_jumps_to_start(api_client):
+    _set_interest(THIRD_ACCOUNT_UUID, "12", InterestCompounding.DAY)
+
+    full = _balances(api_client, THIRD_ACCOUNT_UUID, 0, 120)
+    tail = _balances(api_client, THIRD_ACCOUNT_UUID, 90, 120)
+
+    assert tail == {day: balance for day, balance in full.items() if day in tail}
+
+
+def test_accrue_balance_steps_between_changes():
+    changes = {DEFAULT_DATE: Decimal("100"), DEFAULT_DATE + timedelta(days=2): Decimal("10")}
+
+    balance = accrue_balance(
+        Decimal("0"), changes, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4), Decimal("2")
+    )
+
+    # 100 → 200 → 400 + 10 → 820 на конец третьего дня
+    assert balance == Decimal("820")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_interest_is_not_allowed_on_main_account(api_client):
+    response = api_client.patch(
+        f"/api/accounts/{MAIN_ACCOUNT_UUID}/", {"interest_rate": "5.0000"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "interest_rate" in response.data
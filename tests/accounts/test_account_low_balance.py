@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from accounts.models import Account, AccountType
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    OTHER_ACCOUNT_UUID,
+    SECOND_ACCOUNT_UUID,
+)
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from transactions.models import TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _low_balance_date(client, account_id: str) -> str | None:
+    response = client.get("/api/accounts/")
+    assert response.status_code == status.HTTP_200_OK
+    (account,) = [
+        account for account in response.data["results"] if str(account["id"]) == account_id
+    ]
+    return account["low_balance_date"]
+
+
+def _create_expense(client, day: date, amount: str) -> dict:
+    response = client.post(
+        "/api/transactions/",
+        {
+            "date": day.isoformat(),
+            "type": TransactionType.EXPENSE,
+            "amount": amount,
+            "from_account": MAIN_ACCOUNT_UUID,
+            "confirmed": False,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_planned_expense_sets_low_balance_date(api_client):
+    expense_date = DEFAULT_DATE + timedelta(days=10)
+    assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) is None
+
+    transaction = _create_expense(api_client, expense_date, "100000.00")
+
+    assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) == expense_date.isoformat()
+
+    api_client.delete(f"/api/transactions/{transaction['id']}/")
+
+    assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) is None
+
+
+@freeze_time(DEFAULT_TIME)
+def test_threshold_update_recomputes_date(api_client):
+    # к концу первого дня на основном счёте 750, к концу второго — 1500
+    response = api_client.patch(
+        f"/api/accounts/{MAIN_ACCOUNT_UUID}/", {"low_balance_threshold": "1000.00"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) == DEFAULT_DATE.isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_operation_update_recomputes_date(api_client, main_user):
+    operation = RegularOperation.objects.get(user=main_user, title="Питание")
+
+    response = api_client.patch(
+        f"/api/regular-operations/{operation.id}/", {"amount": "2000.00"}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) == DEFAULT_DATE.isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_low_balance_date_matches_daily_forecast(other_api_client):
+    threshold = Decimal("150000")
+    other_api_client.patch(
+        f"/api/accounts/{OTHER_ACCOUNT_UUID}/",
+        {"low_balance_threshold": str(threshold)},
+        format="json",
+    )
+    statistics_response = other_api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=365)).isoformat(),
+            "forecast": True,
+            "accounts": [OTHER_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][OTHER_ACCOUNT_UUID]
+    expected = next(day for day, balance in balances.items() if Decimal(balance) < threshold)
+
+    assert _low_balance_date(other_api_client, OTHER_ACCOUNT_UUID) == expected
+
+
+@freeze_time(DEFAULT_TIME)
+def test_low_balance_date_applies_interest_like_statistics(api_client, main_user, create_account):
+    # без операций долг не меняется, ниже порога его уводят только проценты
+    account = create_account(main_user, "Кредит", AccountType.DEBT, Decimal("-10000"))
+    account_id = str(account.id)
+    response = api_client.patch(
+        f"/api/accounts/{account_id}/",
+        {
+            "low_balance_threshold": "-10500",
+            "interest_rate": "36.5000",
+            "interest_compounding": "day",
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    statistics_response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=365)).isoformat(),
+            "forecast": True,
+            "accounts": [account_id],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][account_id]
+    expected = next(
+        day for day, balance in balances.items() if Decimal(balance) < Decimal("-10500")
+    )
+
+    assert _low_balance_date(api_client, account_id) == expected
+
+
+@freeze_time(DEFAULT_TIME)
+def test_only_touched_accounts_are_recomputed(api_client):
+    marker = DEFAULT_DATE + timedelta(days=100)
+    Account.objects.filter(id=SECOND_ACCOUNT_UUID).update(low_balance_date=marker)
+
+    _create_expense(api_client, DEFAULT_DATE + timedelta(days=10), "100000.00")
+
+    assert _low_balance_date(api_client, SECOND_ACCOUNT_UUID) == marker.isoformat()
+
+
+def test_command_refreshes_stale_dates(api_client):
+    future_marker = DEFAULT_DATE + timedelta(days=100)
+    Account.objects.filter(id=MAIN_ACCOUNT_UUID).update(
+        low_balance_date=DEFAULT_DATE - timedelta(days=5)
+    )
+    Account.objects.filter(id=SECOND_ACCOUNT_UUID).update(low_balance_date=future_marker)
+
+    with freeze_time(DEFAULT_TIME):
+        call_command("refresh_low_balance_dates", stdout=None)
+        assert _low_balance_date(api_client, MAIN_ACCOUNT_UUID) is None
+        assert _low_balance_date(api_client, SECOND_ACCOUNT_UUID) == future_marker.isoformat()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_account_list_does_not_read_transactions(api_client):
+    with CaptureQueriesContext(connection) as context:
+        api_client.get("/api/accounts/")
+
+    assert not [query for query in context.captured_queries if "transactions" in query["sql"]]
@@ -0,0 +1,177 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from accounts.models import Account, InterestCompounding
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    SECOND_ACCOUNT_UUID,
+    THIRD_ACCOUNT_UUID,
+)
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import RuleType, ScenarioRule
+
+
+pytestmark = pytest.mark.django_db
+
+END_DATE = DEFAULT_DATE + timedelta(days=29)
+MONTE_CARLO_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": END_DATE.isoformat(),
+    "paths": 2000,
+    "seed": 42,
+}
+
+
+def _bands(client, **params) -> dict:
+    response = client.post(
+        "/api/accounts/simulate/monte-carlo/", {**MONTE_CARLO_PAYLOAD, **params}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data["bands"]
+
+
+def _last_day(band: dict) -> Decimal:
+    return Decimal(band[END_DATE.isoformat()])
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_deterministic_plan_gives_equal_bands(api_client):
+    simulate_response = api_client.post(
+        "/api/accounts/simulate/",
+        {key: MONTE_CARLO_PAYLOAD[key] for key in ("start_date", "end_date")},
+        format="json",
+    )
+
+    bands = _bands(api_client)
+
+    for account_id, balances in simulate_response.data["balances"].items():
+        assert set(bands[account_id]) == {"p5", "p25", "p50", "p75", "p95"}
+        for band in bands[account_id].values():
+            assert band == balances
+
+
+@freeze_time(DEFAULT_TIME)
+def test_bands_apply_interest_like_statistics(api_client):
+    Account.objects.filter(id=THIRD_ACCOUNT_UUID).update(
+        current_balance=Decimal("100000"),
+        interest_rate=Decimal("12.0000"),
+        interest_compounding=InterestCompounding.MONTH,
+    )
+    statistics_response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": END_DATE.isoformat(),
+            "forecast": True,
+            "accounts": [THIRD_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][THIRD_ACCOUNT_UUID]
+
+    bands = _bands(api_client, accounts=[THIRD_ACCOUNT_UUID])
+
+    # пути считаются в копейках с плавающей точкой, статистика — в Decimal
+    for band in bands[THIRD_ACCOUNT_UUID].values():
+        assert band.keys() == balances.keys()
+        for day, balance in band.items():
+            assert abs(Decimal(balance) - Decimal(balances[day])) <= Decimal("0.01")
+    assert _last_day(bands[THIRD_ACCOUNT_UUID]["p50"]) > Decimal("100000") + 300 * 30 + 1
+
+
+@freeze_time(DEFAULT_TIME)
+def test_probability_skips_operation_with_its_scenario_transfers(api_client, salary):
+    salary.probability = Decimal("0.5")
+    salary.save()
+
+    bands = _bands(api_client, percentiles=[5, 50, 95])
+
+    # правило на третий счёт срабатывает только вместе с зарплатой: 30 дней по 300
+    third = [_last_day(bands[THIRD_ACCOUNT_UUID][key]) for key in ("p5", "p50", "p95")]
+    assert third[0] < third[1] < third[2]
+    assert Decimal("3000") < third[1] < Decimal("6000")
+    assert third[2] <= Decimal("9000")
+    second_median = _last_day(bands[SECOND_ACCOUNT_UUID]["p50"])
+    assert second_median == pytest.approx(third[1], rel=Decimal("0.2"))
+
+
+@freeze_time(DEFAULT_TIME)
+def test_amount_deviation_widens_bands_around_plan(api_client, salary):
+    salary.amount_deviation = Decimal("200.00")
+    salary.save()
+
+    main_bands = _bands(api_client)[MAIN_ACCOUNT_UUID]
+
+    planned = Decimal("750") * 30
+    assert _last_day(main_bands["p5"]) < planned < _last_day(main_bands["p95"])
+    assert _last_day(main_bands["p50"]) == pytest.approx(planned, rel=Decimal("0.01"))
+
+
+@freeze_time(DEFAULT_TIME)
+def test_percentage_rule_follows_sampled_amount(api_client, salary):
+    salary.amount_deviation = Decimal("200.00")
+    salary.save()
+    # правило зарплаты на третий счёт — половина выпавшей суммы вместо фиксированных 300
+    rule = salary.scenario.rules.get(target_account_id=THIRD_ACCOUNT_UUID)
+    ScenarioRule.objects.filter(id=rule.id).update(
+        type=RuleType.PERCENTAGE, amount=None, percent=Decimal("50.00")
+    )
+
+    third_bands = _bands(api_client)[THIRD_ACCOUNT_UUID]
+
+    third = [_last_day(third_bands[key]) for key in ("p5", "p50", "p95")]
+    assert third[0] < third[1] < third[2]
+    assert third[1] == pytest.approx(Decimal("500") * 30, rel=Decimal("0.01"))
+
+
+@freeze_time(DEFAULT_TIME)
+def test_seed_makes_result_reproducible(api_client, salary):
+    salary.probability = Decimal("0.7")
+    salary.amount_deviation = Decimal("100.00")
+    salary.save()
+
+    assert _bands(api_client) == _bands(api_client)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_paths_are_limited(api_client):
+    response = api_client.post(
+        "/api/accounts/simulate/monte-carlo/",
+        {**MONTE_CARLO_PAYLOAD, "paths": 1_000_000},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@freeze_time(DEFAULT_TIME)
+def test_sampling_follows_exception_amount(api_client, salary):
+    salary.amount_deviation = Decimal("50.00")
+    salary.save()
+    response = api_client.post(
+        f"/api/regular-operations/{salary.id}/exceptions/",
+        {"date": (DEFAULT_DATE + timedelta(days=10)).isoformat(), "amount": "5000.00"},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    simulate_response = api_client.post(
+        "/api/accounts/simulate/",
+        {key: MONTE_CARLO_PAYLOAD[key] for key in ("start_date", "end_date")},
+        format="json",
+    )
+
+    main_bands = _bands(api_client)[MAIN_ACCOUNT_UUID]
+
+    planned = _last_day(simulate_response.data["balances"][MAIN_ACCOUNT_UUID])
+    assert planned == Decimal("750") * 30 + Decimal("4000")
+    assert _last_day(main_bands["p50"]) == pytest.approx(planned, rel=Decimal("0.005"))
@@ -0,0 +1,215 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from accounts.models import Account, InterestCompounding
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    SECOND_ACCOUNT_UUID,
+    THIRD_ACCOUNT_UUID,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import RuleType, ScenarioRule
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+SIMULATION_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": (DEFAULT_DATE + timedelta(days=2)).isoformat(),
+}
+
+
+def _daily_series(step: str) -> dict[str, str]:
+    return {
+        (DEFAULT_DATE + timedelta(days=offset)).isoformat(): f"{Decimal(step) * (offset + 1):.2f}"
+        for offset in range(3)
+    }
+
+
+def _simulate(client, **overrides) -> dict[str, dict[str, str]]:
+    response = client.post(
+        "/api/accounts/simulate/", {**SIMULATION_PAYLOAD, **overrides}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data["balances"]
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+@pytest.fixture
+def third_account_rule(salary) -> ScenarioRule:
+    return ScenarioRule.objects.get(
+        scenario__operation=salary, target_account_id=THIRD_ACCOUNT_UUID
+    )
+
+
+@freeze_time(DEFAULT_TIME)
+def test_simulation_without_overrides_matches_forecast(api_client):
+    forecast_response = api_client.post(
+        "/api/accounts/statistics/", {**SIMULATION_PAYLOAD, "forecast": True}, format="json"
+    )
+
+    assert _simulate(api_client) == forecast_response.data["balances"]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_simulation_applies_interest_like_statistics(api_client):
+    Account.objects.filter(id=THIRD_ACCOUNT_UUID).update(
+        current_balance=Decimal("100000"),
+        interest_rate=Decimal("12.0000"),
+        interest_compounding=InterestCompounding.MONTH,
+    )
+    payload = {**SIMULATION_PAYLOAD, "end_date": (DEFAULT_DATE + timedelta(days=40)).isoformat()}
+    forecast_response = api_client.post(
+        "/api/accounts/statistics/", {**payload, "forecast": True}, format="json"
+    )
+
+    balances = _simulate(api_client, **payload)
+
+    assert balances == forecast_response.data["balances"]
+    last_day = payload["end_date"]
+    assert Decimal(balances[THIRD_ACCOUNT_UUID][last_day]) != Decimal("100000") + 300 * 41
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_override_changes_series_without_saving(api_client, third_account_rule):
+    transactions_before = Transaction.objects.count()
+
+    balances = _simulate(api_client, rules=[{"id": str(third_account_rule.id), "amount": "500.00"}])
+
+    assert balances[MAIN_ACCOUNT_UUID] == _daily_series("550")
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("300")
+    assert balances[THIRD_ACCOUNT_UUID] == _daily_series("500")
+    third_account_rule.refresh_from_db()
+    assert third_account_rule.amount == Decimal("300.00")
+    assert Transaction.objects.count() == transactions_before
+
+
+@pytest.fixture
+def salary_rules(salary) -> list[ScenarioRule]:
+    # 200 и 300 фиксированно, остаток зарплаты — на второй счёт
+    first, second, remainder = salary.scenario.rules.order_by("order")
+    ScenarioRule.objects.filter(id=remainder.id).update(type=RuleType.REMAINDER, amount=None)
+    return [first, second, remainder]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_override_recomputes_whole_scenario(api_client, salary_rules):
+    first, _, _ = salary_rules
+
+    balances = _simulate(api_client, rules=[{"id": str(first.id), "amount": "0.00"}])
+
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("700")
+    assert balances[MAIN_ACCOUNT_UUID] == _daily_series("350")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_type_override_switches_to_percentage(api_client, salary_rules):
+    _, second, _ = salary_rules
+
+    balances = _simulate(
+        api_client,
+        rules=[
+            {"id": str(second.id), "type": RuleType.PERCENTAGE, "amount": None, "percent": "50.00"}
+        ],
+    )
+
+    assert balances[THIRD_ACCOUNT_UUID] == _daily_series("500")
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("500")
+    assert balances[MAIN_ACCOUNT_UUID] == _daily_series("350")
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize(
+    ("rule_index", "override", "failed_field"),
+    [
+        (1, {"type": RuleType.PERCENTAGE, "percent": "50.00"}, "amount"),
+        (1, {"type": RuleType.PERCENTAGE, "amount": None}, "percent"),
+        (1, {"amount": None}, "amount"),
+        (2, {"amount": "10.00"}, "amount"),
+    ],
+)
+def test_rule_override_requires_value_of_its_type(
+    api_client, salary_rules, rule_index, override, failed_field
+):
+    rule = salary_rules[rule_index]
+
+    response = api_client.post(
+        "/api/accounts/simulate/",
+        {**SIMULATION_PAYLOAD, "rules": [{"id": str(rule.id), **override}]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data["rules"][str(rule.id)]) == {failed_field}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_target_override_moves_transfers(api_client, third_account_rule):
+    balances = _simulate(
+        api_client,
+        rules=[{"id": str(third_account_rule.id), "target_account": SECOND_ACCOUNT_UUID}],
+    )
+
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("600")
+    assert balances[THIRD_ACCOUNT_UUID] == _daily_series("0")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_operation_override_replaces_materialized_rows(api_client, salary):
+    api_client.post("/api/transactions/calculate/", SIMULATION_PAYLOAD, format="json")
+
+    balances = _simulate(api_client, operations=[{"id": str(salary.id), "amount": "2000.00"}])
+
+    assert balances[MAIN_ACCOUNT_UUID] == _daily_series("1750")
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("300")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_excluded_operation_drops_its_scenario_transfers(api_client, salary):
+    balances = _simulate(api_client, operations=[{"id": str(salary.id), "excluded": True}])
+
+    # остаются только фриланс и расходы: 500 - 100 - 50
+    assert balances[MAIN_ACCOUNT_UUID] == _daily_series("350")
+    assert balances[SECOND_ACCOUNT_UUID] == _daily_series("0")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_overrides_do_not_add_queries(api_client, salary, third_account_rule):
+    with CaptureQueriesContext(connection) as plain_context:
+        _simulate(api_client)
+    with CaptureQueriesContext(connection) as override_context:
+        _simulate(
+            api_client,
+            end_date=(DEFAULT_DATE + timedelta(days=365)).isoformat(),
+            operations=[{"id": str(salary.id), "amount": "2000.00"}],
+            rules=[{"id": str(third_account_rule.id), "order": 0, "amount": "1.00"}],
+        )
+
+    assert len(override_context.captured_queries) == len(plain_context.captured_queries)
+    assert all(query["sql"].startswith("SELECT") for query in override_context.captured_queries)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_foreign_rule_override_is_rejected(api_client, other_user):
+    foreign_rule = ScenarioRule.objects.filter(scenario__user=other_user).first()
+
+    response = api_client.post(
+        "/api/accounts/simulate/",
+        {**SIMULATION_PAYLOAD, "rules": [{"id": str(foreign_rule.id), "amount": "1.00"}]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "rules" in response.data
@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, THIRD_ACCOUNT_UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import ScenarioRule
+
+
+pytestmark = pytest.mark.django_db
+
+SIMULATION_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": (DEFAULT_DATE + timedelta(days=30)).isoformat(),
+}
+
+
+def _compare(client, variants: list[dict], **params) -> dict:
+    response = client.post(
+        "/api/accounts/simulate/compare/",
+        {**SIMULATION_PAYLOAD, **params, "variants": variants},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+def _simulate(client, variant: dict) -> dict:
+    response = client.post(
+        "/api/accounts/simulate/",
+        {**SIMULATION_PAYLOAD, "operations": [], "rules": [], **variant},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data["balances"]
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+@pytest.fixture
+def variants(salary) -> list[dict]:
+    third_account_rule = ScenarioRule.objects.get(
+        scenario__operation=salary, target_account_id=THIRD_ACCOUNT_UUID
+    )
+    return [
+        {"name": "Повышение", "operations": [{"id": str(salary.id), "amount": "1500.00"}]},
+        {"name": "Без резерва", "rules": [{"id": str(third_account_rule.id), "excluded": True}]},
+        {
+            "name": "Всё сразу",
+            "operations": [{"id": str(salary.id), "period_type": "week"}],
+            "rules": [{"id": str(third_account_rule.id), "amount": "50.00", "order": 0}],
+        },
+    ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_compare_matches_single_simulations(api_client, variants):
+    api_client.post(
+        "/api/transactions/calculate/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=5)).isoformat(),
+        },
+        format="json",
+    )
+
+    data = _compare(api_client, variants)
+
+    assert data["baseline"]["balances"] == _simulate(api_client, {})
+    assert [variant["name"] for variant in data["variants"]] == [v["name"] for v in variants]
+    for result, variant in zip(data["variants"], variants, strict=True):
+        expected = _simulate(
+            api_client, {key: value for key, value in variant.items() if key != "name"}
+        )
+        assert result["balances"] == expected, variant["name"]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_compare_baseline_matches_statistics_forecast(other_api_client):
+    payload = {
+        **SIMULATION_PAYLOAD,
+        "end_date": (DEFAULT_DATE + timedelta(days=3 * 365)).isoformat(),
+    }
+    statistics_response = other_api_client.post(
+        "/api/accounts/statistics/", {**payload, "forecast": True}, format="json"
+    )
+
+    data = _compare(other_api_client, [{"name": "Без изменений"}], **payload)
+
+    assert data["baseline"]["balances"] == statistics_response.data["balances"]
+    assert data["variants"][0]["balances"] == statistics_response.data["balances"]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_excluded_operation_matches_real_deletion(other_api_client, other_user):
+    operation = RegularOperation.objects.filter(user=other_user, end_date__isnull=True).first()
+    payload = {**SIMULATION_PAYLOAD, "end_date": (DEFAULT_DATE + timedelta(days=365)).isoformat()}
+
+    data = _compare(
+        other_api_client,
+        [{"name": "Без операции", "operations": [{"id": str(operation.id), "excluded": True}]}],
+        **payload,
+    )
+    other_api_client.delete(f"/api/regular-operations/{operation.id}/")
+    statistics_response = other_api_client.post(
+        "/api/accounts/statistics/", {**payload, "forecast": True}, format="json"
+    )
+
+    assert data["variants"][0]["balances"] == statistics_response.data["balances"]
+    assert data["baseline"]["balances"] != statistics_response.data["balances"]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_compare_query_count_does_not_depend_on_variants(api_client, variants):
+    with CaptureQueriesContext(connection) as single_context:
+        _compare(api_client, variants[:1])
+    with CaptureQueriesContext(connection) as many_context:
+        _compare(api_client, variants * 3)
+
+    assert len(many_context.captured_queries) == len(single_context.captured_queries)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_compare_requires_variants(api_client):
+    response = api_client.post(
+        "/api/accounts/simulate/compare/", {**SIMULATION_PAYLOAD, "variants": []}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
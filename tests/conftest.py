@@ -9,6 +9,7 @@ from core.bootstrap import (
     ACCOUNT_UUID_4,
     ACCOUNT_UUID_5,
     ACCOUNT_UUID_6,
+    DEFAULT_DATE,
     DEFAULT_TIME,
     MAIN_ACCOUNT_UUID,
     OTHER_ACCOUNT_UUID,
@@ -54,7 +55,11 @@ def default_income_payload() -> tuple[dict, dict]:
         "to_account_name": "Основной счёт",
         "period_type": RegularOperationPeriodType.MONTH.value,
         "period_interval": 1,
+        "recurrence": "",
         "active_before": date.max.strftime("%Y-%m-%d"),
+        "next_occurrence": DEFAULT_DATE.isoformat(),
+        "amount_deviation": None,
+        "probability": "1.0000",
         "start_date": get_isoformat_with_z(DEFAULT_TIME),
         "end_date": get_isoformat_with_z(DEFAULT_TIME + timedelta(days=30)),
         "created_at": get_isoformat_with_z(DEFAULT_TIME),
@@ -85,7 +90,11 @@ def default_expense_payload() -> tuple[dict, dict]:
         "from_account_name": "Основной счёт",
         "period_type": RegularOperationPeriodType.MONTH.value,
         "period_interval": 1,
+        "recurrence": "",
         "active_before": date.max.strftime("%Y-%m-%d"),
+        "next_occurrence": DEFAULT_DATE.isoformat(),
+        "amount_deviation": None,
+        "probability": "1.0000",
         "start_date": get_isoformat_with_z(DEFAULT_TIME),
         "end_date": get_isoformat_with_z(DEFAULT_TIME + timedelta(days=30)),
         "created_at": get_isoformat_with_z(DEFAULT_TIME),
@@ -0,0 +1,49 @@
+from datetime import date
+from decimal import Decimal
+
+from loans.amortization import build_amortization_schedule, get_monthly_payment
+import pytest
+
+
+@pytest.mark.parametrize(
+    ["principal", "annual_rate", "term_months", "expected_payment"],
+    [
+        pytest.param(Decimal("120000"), Decimal("12"), 12, Decimal("10661.86"), id="12% year"),
+        pytest.param(Decimal("1000"), Decimal("0"), 3, Decimal("333.34"), id="zero rate"),
+        pytest.param(
+            Decimal("5000000"), Decimal("9.5"), 360, Decimal("42042.72"), id="30 year mortgage"
+        ),
+    ],
+)
+def test_schedule_closes_loan_in_term(principal, annual_rate, term_months, expected_payment):
+    payment = get_monthly_payment(principal, annual_rate, term_months)
+
+    schedule = build_amortization_schedule(principal, annual_rate, payment, date(2025, 1, 31))
+
+    assert payment == expected_payment
+    assert len(schedule.dates) == term_months
+    assert schedule.principal.sum() == principal * 100
+    assert schedule.remaining[-1] == 0
+    assert schedule.dates[:3] == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)]
+
+
+def test_schedule_matches_monthly_recurrence():
+    principal, annual_rate = Decimal("5000000"), Decimal("9.5")
+    payment = get_monthly_payment(principal, annual_rate, 360)
+    rate = float(annual_rate) / 100 / 12
+
+    schedule = build_amortization_schedule(principal, annual_rate, payment, date(2025, 1, 1))
+
+    previous = int(principal * 100)
+    for amount, interest, principal_part, remaining in zip(
+        schedule.amounts.tolist(),
+        schedule.interest.tolist(),
+        schedule.principal.tolist(),
+        schedule.remaining.tolist(),
+        strict=True,
+    ):
+        assert interest == round(previous * rate)
+        assert principal_part == previous - remaining
+        assert amount == interest + principal_part
+        assert amount <= int(payment * 100) + 1
+        previous = remaining
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from core.bootstrap import (
+    ACCOUNT_UUID_5,
+    ACCOUNT_UUID_6,
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    OTHER_ACCOUNT_UUID,
+)
+from dateutil.relativedelta import relativedelta
+from freezegun import freeze_time
+from loans.models import LoanPayment
+import pytest
+from rest_framework import status
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+FIRST_PAYMENT_DATE = DEFAULT_DATE + relativedelta(months=1)
+LOAN_PAYLOAD = {
+    "account": ACCOUNT_UUID_6,
+    "payer_account": OTHER_ACCOUNT_UUID,
+    "principal": "120000.00",
+    "interest_rate": "12.0000",
+    "term_months": 12,
+    "first_payment_date": FIRST_PAYMENT_DATE.isoformat(),
+}
+
+
+@pytest.fixture
+def loan(other_api_client) -> dict:
+    response = other_api_client.post("/api/loans/", LOAN_PAYLOAD, format="json")
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    return response.data
+
+
+def _schedule(client, loan_id: str) -> list[dict]:
+    response = client.get(f"/api/loans/{loan_id}/schedule/")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_create_loan_materializes_schedule(other_api_client, loan):
+    schedule = _schedule(other_api_client, loan["id"])
+
+    assert loan["monthly_payment"] == "10661.86"
+    assert len(schedule) == 12
+    assert schedule[0]["interest"] == "1200.00"
+    assert sum(Decimal(row["principal"]) for row in schedule) == Decimal("120000.00")
+    transactions = Transaction.objects.filter(loan_payment__loan_id=loan["id"])
+    assert transactions.count() == 24
+    assert {
+        (transaction.type, transaction.confirmed, transaction.to_account_id)
+        for transaction in transactions
+    } == {
+        (TransactionType.TRANSFER, False, UUID(ACCOUNT_UUID_6)),
+        (TransactionType.EXPENSE, False, None),
+    }
+    # на долговой счёт уходит только основной долг, проценты — расход со счёта платежей
+    transfers = transactions.filter(type=TransactionType.TRANSFER)
+    expenses = transactions.filter(type=TransactionType.EXPENSE, from_account_id=OTHER_ACCOUNT_UUID)
+    assert sum(transfer.amount for transfer in transfers) == Decimal("120000.00")
+    assert sum(expense.amount for expense in expenses) == sum(
+        Decimal(row["interest"]) for row in schedule
+    )
+
+
+@freeze_time(DEFAULT_TIME)
+def test_preview_does_not_write(other_api_client, loan):
+    response = other_api_client.post(
+        "/api/loans/preview/",
+        {key: LOAN_PAYLOAD[key] for key in ("principal", "interest_rate", "term_months")}
+        | {"first_payment_date": FIRST_PAYMENT_DATE.isoformat()},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    schedule = _schedule(other_api_client, loan["id"])
+    assert [
+        {key: row[key] for key in ("date", "amount", "interest", "principal", "remaining")}
+        for row in response.data
+    ] == [
+        {key: row[key] for key in ("date", "amount", "interest", "principal", "remaining")}
+        for row in schedule
+    ]
+    assert LoanPayment.objects.count() == 12
+
+
+@freeze_time(DEFAULT_TIME)
+def test_extra_payment_rewrites_only_tail(other_api_client, loan):
+    before = _schedule(other_api_client, loan["id"])
+    extra_date = FIRST_PAYMENT_DATE + relativedelta(months=3) + timedelta(days=5)
+
+    response = other_api_client.post(
+        f"/api/loans/{loan['id']}/extra-payment/",
+        {"date": extra_date.isoformat(), "amount": "50000.00"},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    after = response.data
+    assert after[:4] == before[:4]
+    assert after[4]["extra"] is True
+    assert Decimal(after[4]["remaining"]) == Decimal(before[3]["remaining"]) - 50000
+    assert after[5]["date"] == before[4]["date"]
+    assert len(after) < len(before)
+    # платёж прежний: расхождение только в копейку от округления остатка
+    for row in after[5:-1]:
+        assert abs(Decimal(row["amount"]) - Decimal(loan["monthly_payment"])) <= Decimal("0.01")
+    assert sum(Decimal(row["principal"]) for row in after) == Decimal("120000.00")
+    assert Transaction.objects.filter(loan_payment__loan_id=loan["id"]).count() == sum(
+        len(row["transactions"]) for row in after
+    )
+    assert len(after[4]["transactions"]) == 1
+
+
+@freeze_time(DEFAULT_TIME)
+def test_extra_payment_over_remaining_is_rejected(other_api_client, loan):
+    response = other_api_client.post(
+        f"/api/loans/{loan['id']}/extra-payment/",
+        {"date": DEFAULT_DATE.isoformat(), "amount": "200000.00"},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "amount" in response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_loan_requires_debt_account(other_api_client):
+    response = other_api_client.post(
+        "/api/loans/", {**LOAN_PAYLOAD, "account": ACCOUNT_UUID_5}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "account" in response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_delete_loan_removes_planned_payments(other_api_client, loan):
+    response = other_api_client.delete(f"/api/loans/{loan['id']}/")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not Transaction.objects.filter(loan_payment__loan_id=loan["id"]).exists()
+
+
+@freeze_time(DEFAULT_TIME)
+def test_loan_can_be_recreated_on_account_after_delete(other_api_client, loan):
+    other_api_client.delete(f"/api/loans/{loan['id']}/")
+
+    response = other_api_client.post("/api/loans/", LOAN_PAYLOAD, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    assert response.data["id"] != loan["id"]
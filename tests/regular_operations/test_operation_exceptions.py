@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from accounts.models import Account
+from accounts.projection import build_balance_curves
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+EXCEPTION_DATE = DEFAULT_DATE + timedelta(days=3)
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+def _post_exception(client, salary: RegularOperation, payload: dict):
+    return client.post(
+        f"/api/regular-operations/{salary.id}/exceptions/",
+        {"date": EXCEPTION_DATE.isoformat(), **payload},
+        format="json",
+    )
+
+
+def _salary_amounts(salary: RegularOperation) -> dict:
+    return dict(Transaction.objects.filter(operation=salary).values_list("planned_date", "amount"))
+
+
+def _transaction_writes(context) -> list[str]:
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        and "transactions_transaction" in query["sql"]
+    ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_override_touches_single_planned_row(api_client, main_user, salary):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=9))
+
+    with CaptureQueriesContext(connection) as context:
+        response = _post_exception(api_client, salary, {"amount": "2000.00"})
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    # фиксированные правила сценария от суммы не зависят, поэтому меняется одна строка
+    (write,) = _transaction_writes(context)
+    assert write.startswith("UPDATE")
+    amounts = _salary_amounts(salary)
+    assert amounts.pop(EXCEPTION_DATE) == Decimal("2000.00")
+    assert set(amounts.values()) == {Decimal("1000.00")}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_skip_deletes_occurrence_with_scenario_transfers(api_client, main_user, salary):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=9))
+
+    response = _post_exception(api_client, salary, {"skip": True})
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert EXCEPTION_DATE not in _salary_amounts(salary)
+    assert not Transaction.objects.filter(
+        scenario_rule__scenario__operation=salary, planned_date=EXCEPTION_DATE
+    ).exists()
+    assert len(_salary_amounts(salary)) == 9
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calculate_applies_exceptions(api_client, main_user, salary):
+    _post_exception(api_client, salary, {"skip": True})
+    api_client.post(
+        f"/api/regular-operations/{salary.id}/exceptions/",
+        {"date": (EXCEPTION_DATE + timedelta(days=1)).isoformat(), "amount": "1200.00"},
+        format="json",
+    )
+
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=9))
+
+    amounts = _salary_amounts(salary)
+    assert EXCEPTION_DATE not in amounts
+    assert amounts[EXCEPTION_DATE + timedelta(days=1)] == Decimal("1200.00")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_deleting_exception_restores_occurrence(api_client, main_user, salary):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=9))
+    _post_exception(api_client, salary, {"skip": True})
+
+    response = api_client.delete(
+        f"/api/regular-operations/{salary.id}/exceptions/{EXCEPTION_DATE.isoformat()}/"
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _salary_amounts(salary)[EXCEPTION_DATE] == Decimal("1000.00")
+    assert (
+        Transaction.objects.filter(
+            scenario_rule__scenario__operation=salary, planned_date=EXCEPTION_DATE
+        ).count()
+        == 3
+    )
+
+
+def test_deleting_exception_on_impossible_date_is_not_found(api_client, salary):
+    response = api_client.delete(f"/api/regular-operations/{salary.id}/exceptions/2025-02-30/")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@freeze_time(DEFAULT_TIME)
+def test_operation_update_keeps_overridden_amount(api_client, main_user, salary):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=9))
+    _post_exception(api_client, salary, {"amount": "2000.00"})
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/", {"amount": "1500.00"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    amounts = _salary_amounts(salary)
+    assert amounts.pop(EXCEPTION_DATE) == Decimal("2000.00")
+    assert set(amounts.values()) == {Decimal("1500.00")}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_projection_matches_daily_forecast(api_client, main_user, salary):
+    _post_exception(api_client, salary, {"skip": True})
+    end_date = DEFAULT_DATE + timedelta(days=10)
+    response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": end_date.isoformat(),
+            "forecast": True,
+            "accounts": [MAIN_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = response.data["balances"][MAIN_ACCOUNT_UUID]
+
+    account = Account.objects.get(id=MAIN_ACCOUNT_UUID)
+    curve = build_balance_curves(main_user, {account.id: account}, DEFAULT_DATE, end_date)[
+        account.id
+    ]
+
+    # без зарплаты день даёт 350 вместо обычных 750
+    previous_day = EXCEPTION_DATE - timedelta(days=1)
+    assert Decimal(balances[EXCEPTION_DATE.isoformat()]) - Decimal(
+        balances[previous_day.isoformat()]
+    ) == Decimal("350.00")
+    for offset in range(11):
+        day = DEFAULT_DATE + timedelta(days=offset)
+        assert curve.balance(day) == Decimal(balances[day.isoformat()]), day
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize(
+    ("payload", "field"),
+    [
+        ({"skip": True, "amount": "10.00"}, "amount"),
+        ({}, "amount"),
+        ({"date": (DEFAULT_DATE + timedelta(days=90)).isoformat(), "skip": True}, "date"),
+    ],
+)
+def test_invalid_exception_is_rejected(api_client, salary, payload, field):
+    response = _post_exception(api_client, salary, payload)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert field in response.data
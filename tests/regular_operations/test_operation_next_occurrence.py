@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.core.management import call_command
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import (
+    RegularOperation,
+    RegularOperationPeriodType,
+    RegularOperationType,
+)
+from rest_framework import status
+from transactions.calculation import calculate_transactions, get_next_occurrence
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+def _operation(**fields) -> RegularOperation:
+    defaults = {
+        "amount": 100,
+        "type": RegularOperationType.EXPENSE,
+        "start_date": datetime(2025, 1, 31, tzinfo=DEFAULT_TIME.tzinfo),
+        "period_type": RegularOperationPeriodType.MONTH,
+        "period_interval": 1,
+    }
+    return RegularOperation(**{**defaults, **fields})
+
+
+def test_bootstrap_operations_have_next_occurrence(main_user):
+    assert set(
+        RegularOperation.objects.filter(user=main_user).values_list("next_occurrence", flat=True)
+    ) == {DEFAULT_DATE}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_skip_moves_next_occurrence(api_client, salary):
+    response = api_client.post(
+        f"/api/regular-operations/{salary.id}/exceptions/",
+        {"date": DEFAULT_DATE.isoformat(), "skip": True},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    salary.refresh_from_db()
+    assert salary.next_occurrence == DEFAULT_DATE + timedelta(days=1)
+
+
+def test_calculate_moves_next_occurrence_forward(main_user, salary):
+    today = DEFAULT_DATE + timedelta(days=10)
+
+    with freeze_time(DEFAULT_TIME + timedelta(days=10)):
+        calculate_transactions(main_user, today, today + timedelta(days=5))
+
+    salary.refresh_from_db()
+    assert salary.next_occurrence == today
+
+
+@freeze_time(DEFAULT_TIME)
+def test_soft_delete_clears_next_occurrence(api_client, salary):
+    response = api_client.delete(f"/api/regular-operations/{salary.id}/")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert RegularOperation.available_objects.get(id=salary.id).next_occurrence is None
+
+
+@pytest.mark.parametrize(
+    ("fields", "day", "expected"),
+    [
+        pytest.param({}, date(2025, 2, 1), date(2025, 2, 28), id="month end clamp"),
+        pytest.param({"period_interval": 3}, date(2025, 2, 1), date(2025, 4, 30), id="quarterly"),
+        pytest.param(
+            {"end_date": datetime(2025, 3, 1, tzinfo=DEFAULT_TIME.tzinfo)},
+            date(2025, 3, 1),
+            None,
+            id="after end date",
+        ),
+        pytest.param(
+            {
+                "period_type": RegularOperationPeriodType.CUSTOM,
+                "recurrence": "FREQ=YEARLY;BYMONTH=6;BYMONTHDAY=1",
+            },
+            date(2025, 7, 1),
+            date(2026, 6, 1),
+            id="custom yearly",
+        ),
+        pytest.param(
+            {"period_type": RegularOperationPeriodType.CUSTOM, "recurrence": "FREQ=DAILY;COUNT=2"},
+            date(2025, 3, 1),
+            None,
+            id="exhausted rule",
+        ),
+    ],
+)
+def test_get_next_occurrence(fields: dict, day: date, expected: date | None):
+    assert get_next_occurrence(_operation(**fields), day) == expected
+
+
+def test_command_moves_stale_dates_forward(salary):
+    RegularOperation.objects.filter(id=salary.id).update(next_occurrence=None)
+
+    with freeze_time(DEFAULT_TIME + timedelta(days=3)):
+        call_command("refresh_next_occurrences", stdout=None)
+
+    salary.refresh_from_db()
+    assert salary.next_occurrence == DEFAULT_DATE + timedelta(days=3)
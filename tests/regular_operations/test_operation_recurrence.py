@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from accounts.models import Account
+from accounts.projection import build_balance_curves
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperationPeriodType, RegularOperationType
+from regular_operations.recurrence import get_schedule
+from rest_framework import status
+from transactions.calculation import calculate_transactions, count_transaction_days
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_operation(client, operation_type: str, recurrence: str, **extra):
+    payload = {
+        "title": "По правилу",
+        "amount": "100.00",
+        "type": operation_type,
+        "start_date": DEFAULT_TIME.isoformat(),
+        "period_type": RegularOperationPeriodType.CUSTOM,
+        "recurrence": recurrence,
+        **extra,
+    }
+    if operation_type == RegularOperationType.INCOME:
+        payload["to_account"] = MAIN_ACCOUNT_UUID
+    else:
+        payload["from_account"] = MAIN_ACCOUNT_UUID
+    return client.post("/api/regular-operations/", payload, format="json")
+
+
+@pytest.mark.parametrize(
+    ("recurrence", "expected"),
+    [
+        pytest.param(
+            "FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1",
+            [date(2025, 11, 28), date(2025, 12, 31), date(2026, 1, 30)],
+            id="last business day",
+        ),
+        pytest.param(
+            "FREQ=MONTHLY;BYMONTHDAY=15,-1",
+            [
+                date(2025, 11, 15),
+                date(2025, 11, 30),
+                date(2025, 12, 15),
+                date(2025, 12, 31),
+                date(2026, 1, 15),
+                date(2026, 1, 31),
+            ],
+            id="15th and last day",
+        ),
+        pytest.param(
+            "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;COUNT=3",
+            # неделя даты начала (пн 27.10) уже прошла свою пятницу, следующая через неделю
+            [date(2025, 11, 14), date(2025, 11, 28), date(2025, 12, 12)],
+            id="every 2nd friday",
+        ),
+        pytest.param("FREQ=YEARLY", [date(2025, 11, 1)], id="yearly"),
+    ],
+)
+def test_schedule_occurrences(recurrence: str, expected: list[date]):
+    schedule = get_schedule(recurrence, DEFAULT_DATE)
+    low, high = DEFAULT_DATE, date(2026, 1, 31)
+
+    assert schedule.between(low, high) == expected
+    assert schedule.count(low, high) == len(expected)
+    assert get_schedule(recurrence, DEFAULT_DATE) is schedule
+    assert count_transaction_days(
+        DEFAULT_DATE,
+        None,
+        low,
+        high,
+        RegularOperationPeriodType.CUSTOM,
+        1,
+        recurrence,
+    ) == len(expected)
+
+
+def test_schedule_window_inside_generated_dates():
+    schedule = get_schedule("FREQ=MONTHLY;BYMONTHDAY=15,-1", DEFAULT_DATE)
+    schedule.between(DEFAULT_DATE, date(2030, 1, 1))
+
+    assert schedule.between(date(2026, 2, 1), date(2026, 2, 28)) == [
+        date(2026, 2, 15),
+        date(2026, 2, 28),
+    ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calculate_uses_recurrence(api_client, main_user):
+    response = _create_operation(api_client, RegularOperationType.INCOME, "FREQ=YEARLY")
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=800))
+
+    assert list(
+        Transaction.objects.filter(operation_id=response.data["id"])
+        .order_by("planned_date")
+        .values_list("planned_date", flat=True)
+    ) == [date(2025, 11, 1), date(2026, 11, 1), date(2027, 11, 1)]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_projection_matches_daily_forecast(api_client, main_user):
+    response = _create_operation(
+        api_client, RegularOperationType.EXPENSE, "FREQ=MONTHLY;BYMONTHDAY=15,-1"
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    end_date = DEFAULT_DATE + timedelta(days=60)
+
+    statistics_response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": end_date.isoformat(),
+            "forecast": True,
+            "accounts": [MAIN_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = statistics_response.data["balances"][MAIN_ACCOUNT_UUID]
+    account = Account.objects.get(id=MAIN_ACCOUNT_UUID)
+    curve = build_balance_curves(main_user, {account.id: account}, DEFAULT_DATE, end_date)[
+        account.id
+    ]
+
+    for day, balance in balances.items():
+        assert curve.balance(date.fromisoformat(day)) == Decimal(balance), day
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize(
+    ("period_type", "recurrence"),
+    [
+        pytest.param(RegularOperationPeriodType.CUSTOM, "", id="missing rule"),
+        pytest.param(RegularOperationPeriodType.CUSTOM, "FREQ=SOMETIMES", id="invalid rule"),
+        pytest.param(RegularOperationPeriodType.MONTH, "FREQ=YEARLY", id="rule without custom"),
+    ],
+)
+def test_invalid_recurrence_is_rejected(api_client, period_type, recurrence):
+    response = _create_operation(
+        api_client, RegularOperationType.INCOME, recurrence, period_type=period_type
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "recurrence" in response.data
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, SECOND_ACCOUNT_UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+TODAY = DEFAULT_DATE + timedelta(days=5)
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+def _calculate(user, days: int) -> None:
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=days - 1))
+
+
+def _salary_rows(salary: RegularOperation):
+    return Transaction.objects.filter(operation=salary).order_by("planned_date")
+
+
+def _salary_rule_rows(salary: RegularOperation):
+    return Transaction.objects.filter(scenario_rule__scenario__operation=salary)
+
+
+@freeze_time(TODAY)
+def test_amount_update_touches_only_future_planned_rows(api_client, main_user, salary):
+    _calculate(main_user, days=10)
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/", {"amount": "1500.00"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    amounts_by_date = dict(_salary_rows(salary).values_list("planned_date", "amount"))
+    assert len(amounts_by_date) == 10
+    for planned_date, amount in amounts_by_date.items():
+        expected = Decimal("1500.00") if planned_date >= TODAY else Decimal("1000.00")
+        assert amount == expected, planned_date
+
+
+@freeze_time(TODAY)
+def test_end_date_shrink_deletes_future_rows_with_scenario_transfers(api_client, main_user, salary):
+    _calculate(main_user, days=10)
+    new_end_date = DEFAULT_TIME + timedelta(days=6)
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/",
+        {"end_date": new_end_date.isoformat()},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert _salary_rows(salary).last().planned_date == new_end_date.date()
+    assert _salary_rows(salary).count() == 7
+    assert _salary_rule_rows(salary).count() == 7 * 3
+
+
+@freeze_time(TODAY)
+def test_end_date_extension_fills_gap_up_to_existing_horizon(api_client, main_user, salary):
+    salary.end_date = DEFAULT_TIME + timedelta(days=6)
+    salary.save()
+    _calculate(main_user, days=10)
+    assert _salary_rows(salary).count() == 7
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/",
+        {"end_date": (DEFAULT_TIME + timedelta(days=30)).isoformat()},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert _salary_rows(salary).count() == 10
+    assert _salary_rule_rows(salary).count() == 10 * 3
+
+
+@freeze_time(TODAY)
+def test_to_account_update_moves_scenario_transfers_source(api_client, main_user, salary):
+    _calculate(main_user, days=10)
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/", {"to_account": SECOND_ACCOUNT_UUID}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    future_rule_rows = _salary_rule_rows(salary).filter(planned_date__gte=TODAY)
+    past_rule_rows = _salary_rule_rows(salary).filter(planned_date__lt=TODAY)
+    assert {str(row.from_account_id) for row in future_rule_rows} == {SECOND_ACCOUNT_UUID}
+    assert SECOND_ACCOUNT_UUID not in {str(row.from_account_id) for row in past_rule_rows}
+
+
+@pytest.mark.parametrize("days", [10, 25])
+def test_regeneration_statement_count_does_not_depend_on_horizon(
+    api_client, main_user, salary, days
+):
+    _calculate(main_user, days=days)
+
+    with freeze_time(TODAY), CaptureQueriesContext(connection) as context:
+        response = api_client.patch(
+            f"/api/regular-operations/{salary.id}/",
+            {"amount": "1500.00", "end_date": (DEFAULT_TIME + timedelta(days=7)).isoformat()},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    writes = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith(("UPDATE", "DELETE"))
+        and "transactions_transaction" in query["sql"]
+    ]
+    # один DELETE лишних дат и по UPDATE на строки операции и правил сценария
+    assert len(writes) == 3
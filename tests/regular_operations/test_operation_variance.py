@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation, RegularOperationException
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+REPORT_TIME = DEFAULT_TIME + timedelta(days=10)
+REPORT_WINDOW = {"start_date": "2025-11-01", "end_date": "2025-11-10"}
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    salary = RegularOperation.objects.get(user=main_user, title="Зарплата")
+    RegularOperationException.objects.create(
+        operation=salary, date=date(2025, 11, 3), amount=Decimal("900")
+    )
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=44))
+
+    planned = Transaction.objects.filter(operation=salary)
+    planned.filter(planned_date=date(2025, 11, 1)).update(confirmed=True, amount=Decimal("1200"))
+    planned.filter(planned_date=date(2025, 11, 2)).update(confirmed=True, date=date(2025, 11, 4))
+    return salary
+
+
+def _variance(client, **params) -> list[dict]:
+    response = client.get("/api/regular-operations/variance/", params)
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(REPORT_TIME)
+def test_variance_for_operation(api_client, salary):
+    rows = _variance(api_client, operations=[salary.id], **REPORT_WINDOW)
+
+    assert rows == [
+        {
+            "operation": str(salary.id),
+            "title": "Зарплата",
+            "month": "2025-11-01",
+            "planned_total": "9900.00",
+            "actual_total": "2200.00",
+            "variance": "-7700.00",
+            "planned_count": 10,
+            "confirmed_count": 2,
+            "missed_count": 8,
+            "late_count": 1,
+        }
+    ]
+
+
+@freeze_time(REPORT_TIME)
+def test_variance_lists_every_operation_by_month(api_client, main_user, salary):
+    rows = _variance(api_client, start_date="2025-11-01", end_date="2025-12-15")
+
+    operations = RegularOperation.objects.filter(user=main_user)
+    assert {row["title"] for row in rows} == set(operations.values_list("title", flat=True))
+    assert {row["month"] for row in rows} == {"2025-11-01", "2025-12-01"}
+    assert all(row["missed_count"] == 0 for row in rows if row["month"] == "2025-12-01")
+
+
+@freeze_time(REPORT_TIME)
+def test_variance_query_count_does_not_depend_on_operations(api_client, salary):
+    with CaptureQueriesContext(connection) as single_operation:
+        _variance(api_client, operations=[salary.id], **REPORT_WINDOW)
+    with CaptureQueriesContext(connection) as all_operations:
+        _variance(api_client, **REPORT_WINDOW)
+
+    assert len(single_operation.captured_queries) == len(all_operations.captured_queries)
+
+
+@freeze_time(REPORT_TIME)
+def test_variance_rejects_inverted_window(api_client):
+    response = api_client.get(
+        "/api/regular-operations/variance/",
+        {"start_date": "2025-11-10", "end_date": "2025-11-01"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "end_date" in response.data
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, SECOND_ACCOUNT_UUID
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import RuleType, ScenarioRule
+from transactions.calculation import calculate_transactions, get_rule_amounts
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def salary(main_user) -> RegularOperation:
+    return RegularOperation.objects.get(user=main_user, title="Зарплата")
+
+
+def _set_rule_types(salary: RegularOperation) -> list[ScenarioRule]:
+    # правила зарплаты: 200 на второй счёт, затем 33.33 % на третий и остаток снова на второй
+    fixed, percentage, remainder = salary.scenario.rules.order_by("order")
+    ScenarioRule.objects.filter(id=percentage.id).update(
+        type=RuleType.PERCENTAGE, amount=None, percent=Decimal("33.33")
+    )
+    ScenarioRule.objects.filter(id=remainder.id).update(type=RuleType.REMAINDER, amount=None)
+    return [fixed, percentage, remainder]
+
+
+def _rule_amounts(salary: RegularOperation, day) -> list[Decimal]:
+    return list(
+        Transaction.objects.filter(scenario_rule__scenario__operation=salary, planned_date=day)
+        .order_by("scenario_rule__order")
+        .values_list("amount", flat=True)
+    )
+
+
+def test_rule_amounts_are_evaluated_in_order():
+    rules = [
+        ScenarioRule(type=RuleType.FIXED, amount=Decimal("10.00"), order=1),
+        ScenarioRule(type=RuleType.PERCENTAGE, percent=Decimal("50.00"), order=2),
+        ScenarioRule(type=RuleType.REMAINDER, order=3),
+    ]
+
+    fixed, percentage, remainder = get_rule_amounts(
+        [Decimal("100.01"), Decimal("0.01"), Decimal("15.00")], rules
+    )
+
+    assert fixed == [Decimal("10.00"), Decimal("10.00"), Decimal("10.00")]
+    # половина копейки округляется вверх
+    assert percentage == [Decimal("50.01"), Decimal("0.01"), Decimal("7.50")]
+    # остаток не уходит в минус, если фиксированные правила съели всю сумму
+    assert remainder == [Decimal("40.00"), Decimal("0.00"), Decimal("0.00")]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calculate_creates_percentage_and_remainder_transfers(main_user, salary):
+    _set_rule_types(salary)
+
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE)
+
+    assert _rule_amounts(salary, DEFAULT_DATE) == [
+        Decimal("200.00"),
+        Decimal("333.30"),
+        Decimal("466.70"),
+    ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_amount_update_recomputes_rule_amounts(api_client, main_user, salary):
+    _set_rule_types(salary)
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/", {"amount": "1000.05"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    for offset in range(5):
+        assert _rule_amounts(salary, DEFAULT_DATE + timedelta(days=offset)) == [
+            Decimal("200.00"),
+            Decimal("333.32"),
+            Decimal("466.73"),
+        ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_empty_remainder_has_no_transfer(api_client, main_user, salary):
+    _set_rule_types(salary)
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+    response = api_client.patch(
+        f"/api/regular-operations/{salary.id}/", {"amount": "100.00"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert _rule_amounts(salary, DEFAULT_DATE) == [Decimal("200.00"), Decimal("33.33")]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_update_regenerates_planned_transfers(api_client, main_user, salary):
+    _, percentage, _ = _set_rule_types(salary)
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+    response = api_client.patch(
+        f"/api/scenarios/rules/{percentage.id}/",
+        {"percent": "50.00", "target_account": SECOND_ACCOUNT_UUID},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    for offset in range(5):
+        assert _rule_amounts(salary, DEFAULT_DATE + timedelta(days=offset)) == [
+            Decimal("200.00"),
+            Decimal("500.00"),
+            Decimal("300.00"),
+        ]
+    assert {
+        str(account_id)
+        for account_id in Transaction.objects.filter(scenario_rule=percentage).values_list(
+            "to_account_id", flat=True
+        )
+    } == {SECOND_ACCOUNT_UUID}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_rule_order_change_renumbers_planned_descriptions(api_client, main_user, salary):
+    fixed, percentage, remainder = _set_rule_types(salary)
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+    response = api_client.patch(f"/api/scenarios/rules/{fixed.id}/", {"order": 10}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    title = salary.scenario.title
+    for scenario_index, rule in enumerate([percentage, remainder, fixed]):
+        assert set(
+            Transaction.objects.filter(scenario_rule=rule).values_list("description", flat=True)
+        ) == {f"Операция для {title} ({scenario_index})"}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_forecast_uses_rule_amounts(api_client, salary):
+    _set_rule_types(salary)
+
+    response = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=1)).isoformat(),
+            "forecast": True,
+            "accounts": [SECOND_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    balances = response.data["balances"][SECOND_ACCOUNT_UUID]
+    day_change = Decimal(balances[(DEFAULT_DATE + timedelta(days=1)).isoformat()]) - Decimal(
+        balances[DEFAULT_DATE.isoformat()]
+    )
+    assert day_change == Decimal("666.70")
+
+
+@pytest.mark.parametrize(
+    "values, failed_fields",
+    [
+        ({"type": RuleType.FIXED}, {"amount"}),
+        ({"type": RuleType.FIXED, "amount": "10.00", "percent": "5.00"}, {"percent"}),
+        ({"type": RuleType.PERCENTAGE}, {"percent"}),
+        ({"type": RuleType.PERCENTAGE, "amount": "10.00"}, {"amount", "percent"}),
+        ({"type": RuleType.REMAINDER, "amount": "10.00"}, {"amount"}),
+        ({"type": RuleType.REMAINDER, "percent": "5.00"}, {"percent"}),
+    ],
+)
+def test_rule_requires_only_value_of_its_type(api_client, salary, values, failed_fields):
+    response = api_client.post(
+        "/api/scenarios/rules/",
+        {
+            "scenario": str(salary.scenario.id),
+            "target_account": SECOND_ACCOUNT_UUID,
+            "order": 4,
+            **values,
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == failed_fields
+
+
+def test_rule_type_change_requires_clearing_old_value(api_client, salary):
+    rule = salary.scenario.rules.order_by("order").first()
+    url = f"/api/scenarios/rules/{rule.id}/"
+
+    response = api_client.patch(
+        url, {"type": RuleType.PERCENTAGE, "percent": "10.00"}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"amount"}
+
+    response = api_client.patch(
+        url, {"type": RuleType.PERCENTAGE, "percent": "10.00", "amount": None}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.data
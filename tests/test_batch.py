@@ -0,0 +1,151 @@
+from accounts.models import Account, AccountType
+from core.bootstrap import DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+EXPENSE_BODY = {
+    "date": "2025-11-01",
+    "type": TransactionType.EXPENSE,
+    "amount": "10.00",
+    "from_account": MAIN_ACCOUNT_UUID,
+    "confirmed": False,
+}
+
+
+def _batch(client, requests: list[dict], **extra) -> dict:
+    response = client.post("/api/batch/", {"requests": requests, **extra}, format="json")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_batch_dispatches_sub_requests(api_client, main_user):
+    data = _batch(
+        api_client,
+        [
+            {"method": "GET", "path": "/api/users/me/"},
+            {"method": "GET", "path": "/api/transactions/upcoming/?days=1"},
+            {"method": "POST", "path": "/api/transactions/", "body": EXPENSE_BODY},
+            {"method": "GET", "path": "/api/nowhere/"},
+        ],
+    )
+
+    me, upcoming, created, missing = data["responses"]
+    assert me == {"status": status.HTTP_200_OK, "body": api_client.get("/api/users/me/").data}
+    assert upcoming["status"] == status.HTTP_200_OK
+    assert {item["date"] for item in upcoming["body"]} == {"2025-11-01"}
+    assert created["status"] == status.HTTP_201_CREATED
+    assert Transaction.objects.filter(user=main_user, id=created["body"]["id"]).exists()
+    assert missing["status"] == status.HTTP_404_NOT_FOUND
+    assert data["rolled_back"] is False
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize(
+    ("atomic", "expected_statuses", "kept"),
+    [
+        pytest.param(
+            True,
+            [
+                status.HTTP_201_CREATED,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_424_FAILED_DEPENDENCY,
+            ],
+            False,
+            id="atomic",
+        ),
+        pytest.param(
+            False,
+            [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST, status.HTTP_201_CREATED],
+            True,
+            id="independent",
+        ),
+    ],
+)
+def test_batch_write_semantics(api_client, main_user, atomic, expected_statuses, kept):
+    data = _batch(
+        api_client,
+        [
+            {
+                "method": "POST",
+                "path": "/api/accounts/",
+                "body": {"name": "Из пакета", "type": AccountType.ACCUMULATION},
+            },
+            {"method": "POST", "path": "/api/transactions/", "body": {"type": "expense"}},
+            {"method": "POST", "path": "/api/transactions/", "body": EXPENSE_BODY},
+        ],
+        atomic=atomic,
+    )
+
+    assert [response["status"] for response in data["responses"]] == expected_statuses
+    assert data["rolled_back"] is atomic
+    assert Account.objects.filter(user=main_user, name="Из пакета").exists() is kept
+    assert Transaction.objects.filter(user=main_user, amount=10).exists() is kept
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize("atomic", [True, False])
+def test_batch_turns_sub_request_exception_into_500(api_client, main_user, monkeypatch, atomic):
+    def broken_dashboard(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("users.views.build_dashboard", broken_dashboard)
+
+    data = _batch(
+        api_client,
+        [
+            {"method": "POST", "path": "/api/transactions/", "body": EXPENSE_BODY},
+            {"method": "GET", "path": "/api/users/dashboard/"},
+            {"method": "GET", "path": "/api/users/me/"},
+        ],
+        atomic=atomic,
+    )
+
+    statuses = [response["status"] for response in data["responses"]]
+    assert statuses[:2] == [status.HTTP_201_CREATED, status.HTTP_500_INTERNAL_SERVER_ERROR]
+    assert statuses[2] == (status.HTTP_424_FAILED_DEPENDENCY if atomic else status.HTTP_200_OK)
+    assert data["rolled_back"] is atomic
+    assert Transaction.objects.filter(user=main_user, amount=10).exists() is not atomic
+
+
+@freeze_time(DEFAULT_TIME)
+def test_batch_sub_requests_use_batch_user(other_api_client, main_user):
+    data = _batch(
+        other_api_client, [{"method": "GET", "path": f"/api/accounts/{MAIN_ACCOUNT_UUID}/"}]
+    )
+
+    assert data["responses"][0]["status"] == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        pytest.param("/api/batch/", id="nested batch"),
+        pytest.param("/api/auth/logout/", id="auth"),
+        pytest.param("/admin/", id="outside api"),
+    ],
+)
+def test_batch_rejects_forbidden_paths(api_client, path):
+    response = api_client.post(
+        "/api/batch/", {"requests": [{"method": "GET", "path": path}]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "requests" in response.data
+
+
+def test_batch_requires_authentication(bootstrap_db):
+    response = APIClient().post(
+        "/api/batch/", {"requests": [{"method": "GET", "path": "/api/users/me/"}]}, format="json"
+    )
+
+    assert response.status_code in (
+        status.HTTP_401_UNAUTHORIZED,
+        status.HTTP_403_FORBIDDEN,
+    )
@@ -0,0 +1,166 @@
+from datetime import timedelta
+
+from accounts.models import Account, AccountType
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from core.models import Tombstone, TombstoneEntity
+from core.sync import TOMBSTONE_RETENTION, encode_cursor
+from django.core.management import call_command
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import ScenarioRule
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+EXPENSE_BODY = {
+    "date": "2025-11-01",
+    "type": TransactionType.EXPENSE,
+    "amount": "10.00",
+    "from_account": MAIN_ACCOUNT_UUID,
+    "confirmed": False,
+}
+# тестовые данные созданы в DEFAULT_TIME и не должны попадать в перекрытие курсора
+SYNC_TIME = DEFAULT_TIME + timedelta(minutes=1)
+
+
+def _changes(client, cursor: str | None = None) -> dict:
+    response = client.get("/api/changes/", {"cursor": cursor} if cursor else {})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+def _changed_ids(data: dict) -> dict[str, tuple[set[str], set[str]]]:
+    return {
+        name: ({item["id"] for item in entity["updated"]}, {str(i) for i in entity["deleted"]})
+        for name, entity in data["changes"].items()
+        if entity["updated"] or entity["deleted"]
+    }
+
+
+def test_changes_without_cursor_returns_snapshot(api_client, main_user):
+    with freeze_time(SYNC_TIME):
+        data = _changes(api_client)
+
+    changes = data["changes"]
+    assert {item["id"] for item in changes["accounts"]["updated"]} == {
+        str(account_id)
+        for account_id in Account.objects.filter(user=main_user).values_list("id", flat=True)
+    }
+    assert len(changes["regular_operations"]["updated"]) == (
+        RegularOperation.objects.filter(user=main_user).count()
+    )
+    assert all(not entity["deleted"] for entity in changes.values())
+
+
+def test_changes_after_cursor_contain_only_new_changes(api_client):
+    with freeze_time(SYNC_TIME) as frozen:
+        cursor = _changes(api_client)["cursor"]
+        frozen.tick(timedelta(minutes=1))
+        assert _changed_ids(_changes(api_client, cursor)) == {}
+
+        created = api_client.post("/api/transactions/", EXPENSE_BODY, format="json")
+        assert created.status_code == status.HTTP_201_CREATED, created.data
+        frozen.tick(timedelta(minutes=1))
+        data = _changes(api_client, cursor)
+
+    assert _changed_ids(data) == {"transactions": ({str(created.data["id"])}, set())}
+
+
+def test_changes_report_hard_deletes_by_tombstones(api_client, main_user, create_account):
+    account = create_account(main_user, "Удаляемый", AccountType.PURPOSE)
+    with freeze_time(SYNC_TIME) as frozen:
+        created = api_client.post("/api/transactions/", EXPENSE_BODY, format="json")
+        frozen.tick(timedelta(minutes=1))
+        cursor = _changes(api_client)["cursor"]
+        frozen.tick(timedelta(minutes=1))
+
+        api_client.delete(f"/api/transactions/{created.data['id']}/")
+        api_client.delete(f"/api/accounts/{account.id}/")
+        frozen.tick(timedelta(minutes=1))
+        data = _changes(api_client, cursor)
+
+    assert not Transaction.objects.filter(id=created.data["id"]).exists()
+    assert set(data["changes"]["transactions"]["deleted"]) == {created.data["id"]}
+    assert set(data["changes"]["accounts"]["deleted"]) == {str(account.id)}
+    assert set(Tombstone.objects.filter(user=main_user).values_list("entity", flat=True)) == {
+        TombstoneEntity.ACCOUNT,
+        TombstoneEntity.TRANSACTION,
+    }
+
+
+def test_account_delete_reports_cascaded_scenario_rules(api_client, main_user):
+    rule = ScenarioRule.objects.filter(scenario__user=main_user).first()
+    with freeze_time(SYNC_TIME) as frozen:
+        calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=30))
+        planned_ids = {
+            str(transaction_id)
+            for transaction_id in Transaction.objects.filter(scenario_rule=rule).values_list(
+                "id", flat=True
+            )
+        }
+        cursor = _changes(api_client)["cursor"]
+        frozen.tick(timedelta(minutes=1))
+        response = api_client.delete(f"/api/accounts/{rule.target_account_id}/")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        data = _changes(api_client, cursor)
+
+    assert not ScenarioRule.available_objects.filter(id=rule.id).exists()
+    assert str(rule.id) in set(data["changes"]["scenario_rules"]["deleted"])
+    assert planned_ids
+    assert planned_ids <= set(data["changes"]["transactions"]["deleted"])
+
+
+def test_changes_report_soft_deletes(api_client, main_user):
+    operation = RegularOperation.objects.filter(user=main_user).first()
+    with freeze_time(SYNC_TIME) as frozen:
+        cursor = _changes(api_client)["cursor"]
+        frozen.tick(timedelta(minutes=1))
+        response = api_client.delete(f"/api/regular-operations/{operation.id}/")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        data = _changes(api_client, cursor)
+
+    changes = data["changes"]
+    assert changes["regular_operations"]["deleted"] == [str(operation.id)]
+    assert str(operation.id) not in {
+        item["id"] for item in changes["regular_operations"]["updated"]
+    }
+
+
+def test_changes_are_scoped_to_user(api_client, other_api_client):
+    with freeze_time(SYNC_TIME) as frozen:
+        cursor = _changes(other_api_client)["cursor"]
+        frozen.tick(timedelta(minutes=1))
+        api_client.post("/api/transactions/", EXPENSE_BODY, format="json")
+        assert _changed_ids(_changes(other_api_client, cursor)) == {}
+
+
+def test_changes_reject_invalid_and_expired_cursor(api_client):
+    with freeze_time(SYNC_TIME):
+        invalid = api_client.get("/api/changes/", {"cursor": "garbage"})
+        expired_cursor = encode_cursor(SYNC_TIME - TOMBSTONE_RETENTION - timedelta(days=1))
+        expired = api_client.get("/api/changes/", {"cursor": expired_cursor})
+
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert "cursor" in invalid.data
+    assert expired.status_code == status.HTTP_400_BAD_REQUEST
+    assert "cursor" in expired.data
+
+
+def test_purge_tombstones_drops_expired_rows(main_user):
+    with freeze_time(SYNC_TIME):
+        Tombstone.objects.create(
+            user=main_user,
+            entity=TombstoneEntity.TRANSACTION,
+            entity_id=MAIN_ACCOUNT_UUID,
+            deleted_at=SYNC_TIME - TOMBSTONE_RETENTION - timedelta(days=1),
+        )
+        fresh = Tombstone.objects.create(
+            user=main_user, entity=TombstoneEntity.ACCOUNT, entity_id=MAIN_ACCOUNT_UUID
+        )
+        call_command("purge_tombstones")
+
+    assert list(Tombstone.objects.all()) == [fresh]
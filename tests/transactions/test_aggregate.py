@@ -0,0 +1,93 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def planned(main_user):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=75))
+
+
+def _aggregate(client, **params) -> list[dict]:
+    response = client.get("/api/transactions/aggregate/", params)
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_aggregate_by_month_and_type(api_client, main_user, planned):
+    expected: dict[tuple[str, str], list] = defaultdict(lambda: [Decimal("0"), 0])
+    for transaction in Transaction.objects.filter(user=main_user):
+        totals = expected[transaction.date.replace(day=1).isoformat(), transaction.type]
+        totals[0] += transaction.amount
+        totals[1] += 1
+
+    rows = _aggregate(api_client, group_by=["month", "type"])
+
+    assert {
+        (row["period"], row["type"]): [Decimal(row["total"]), row["count"]] for row in rows
+    } == expected
+    assert [(row["period"], row["type"]) for row in rows] == sorted(expected)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_aggregate_applies_list_filters(api_client, main_user, planned):
+    last_day = DEFAULT_DATE + timedelta(days=9)
+    transactions = Transaction.objects.filter(
+        user=main_user,
+        type=TransactionType.EXPENSE,
+        from_account_id=MAIN_ACCOUNT_UUID,
+        date__lte=last_day,
+    )
+
+    rows = _aggregate(
+        api_client,
+        type=TransactionType.EXPENSE,
+        from_account=MAIN_ACCOUNT_UUID,
+        date__lte=last_day.isoformat(),
+        ordering="-amount",
+    )
+
+    assert rows == [
+        {
+            "total": f"{sum(transaction.amount for transaction in transactions):.4f}",
+            "count": transactions.count(),
+        }
+    ]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_aggregate_by_week_and_operation(api_client, main_user, planned):
+    rows = _aggregate(api_client, group_by=["week", "operation"])
+
+    assert all(date.fromisoformat(row["period"]).weekday() == 0 for row in rows)
+    assert sum(row["count"] for row in rows) == Transaction.objects.filter(user=main_user).count()
+    assert set(Transaction.objects.filter(user=main_user).values_list("operation", flat=True)) == {
+        row["operation"] and UUID(row["operation"]) for row in rows
+    }
+
+
+@freeze_time(DEFAULT_TIME)
+@pytest.mark.parametrize(
+    "group_by",
+    [
+        pytest.param(["month", "year"], id="two periods"),
+        pytest.param(["quarter"], id="unknown key"),
+    ],
+)
+def test_aggregate_rejects_invalid_group_by(api_client, group_by):
+    response = api_client.get("/api/transactions/aggregate/", {"group_by": group_by})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "group_by" in response.data
@@ -0,0 +1,82 @@
+from datetime import timedelta
+from decimal import Decimal
+import json
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+CALC_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": (DEFAULT_DATE + timedelta(days=2)).isoformat(),
+}
+
+
+def _preview(client, payload) -> list[dict]:
+    response = client.post(
+        "/api/transactions/calculate/", {**payload, "dry_run": True}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return json.loads(b"".join(response.streaming_content))
+
+
+def _preview_key(item: dict) -> tuple:
+    return (
+        item["planned_date"],
+        item["type"],
+        Decimal(item["amount"]),
+        item["from_account"],
+        item["to_account"],
+        item["operation"],
+        item["scenario_rule"],
+    )
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dry_run_matches_real_calculation_and_writes_nothing(api_client, main_user):
+    transactions_before = Transaction.objects.count()
+
+    preview = _preview(api_client, CALC_PAYLOAD)
+
+    assert len(preview) == 21
+    assert Transaction.objects.count() == transactions_before
+
+    calc_response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+    assert calc_response.data["transactions_created"] == len(preview)
+    created = Transaction.objects.filter(user=main_user, planned_date__isnull=False)
+    created_keys = {
+        (
+            transaction.planned_date.isoformat(),
+            transaction.type,
+            transaction.amount,
+            str(transaction.from_account_id) if transaction.from_account_id else None,
+            str(transaction.to_account_id) if transaction.to_account_id else None,
+            str(transaction.operation_id) if transaction.operation_id else None,
+            str(transaction.scenario_rule_id) if transaction.scenario_rule_id else None,
+        )
+        for transaction in created
+    }
+    assert {_preview_key(item) for item in preview} == created_keys
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dry_run_after_calculation_is_empty(api_client):
+    api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+
+    assert _preview(api_client, CALC_PAYLOAD) == []
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dry_run_cannot_be_async(api_client):
+    response = api_client.post(
+        "/api/transactions/calculate/",
+        {**CALC_PAYLOAD, "dry_run": True, "run_async": True},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,147 @@
+from datetime import timedelta
+import threading
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.core.management import call_command
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import CalculationResult
+from transactions.jobs import (
+    JOB_MAX_ATTEMPTS,
+    JOB_STALE_TIMEOUT,
+    claim_next_job,
+    process_pending_jobs,
+)
+from transactions.models import CalculateJob, CalculateJobStatus, Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+
+CALC_PAYLOAD = {
+    "start_date": DEFAULT_DATE.isoformat(),
+    "end_date": (DEFAULT_DATE + timedelta(days=2)).isoformat(),
+    "run_async": True,
+}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_async_calculate_enqueues_job_without_creating_transactions(api_client, main_user):
+    transactions_before = Transaction.objects.filter(user=main_user).count()
+
+    response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+
+    assert response.status_code == status.HTTP_202_ACCEPTED, response.data
+    assert response.data["status"] == CalculateJobStatus.PENDING
+    assert response.data["result"] is None
+    assert CalculateJob.objects.filter(id=response.data["id"], user=main_user).exists()
+    assert Transaction.objects.filter(user=main_user).count() == transactions_before
+
+
+@freeze_time(DEFAULT_TIME)
+def test_worker_processes_job_and_status_reports_result(api_client, main_user):
+    response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+    job_id = response.data["id"]
+
+    call_command("process_calculate_jobs", "--once", verbosity=0)
+
+    status_response = api_client.get(f"/api/transactions/calculate/jobs/{job_id}/")
+    assert status_response.status_code == status.HTTP_200_OK, status_response.data
+    data = status_response.data
+    assert data["status"] == CalculateJobStatus.DONE
+    # 3 дня * (2 дохода + 2 расхода + 3 перевода по сценариям)
+    assert data["result"] == {"transactions_created": 21, "transactions_all": 21}
+    assert data["processed_operations"] == data["total_operations"] == 4
+    assert data["finished_at"] is not None
+
+    sync_response = api_client.post(
+        "/api/transactions/calculate/",
+        {**CALC_PAYLOAD, "run_async": False},
+        format="json",
+    )
+    assert sync_response.status_code == status.HTTP_200_OK
+    assert sync_response.data["transactions_created"] == 0
+
+
+@freeze_time(DEFAULT_TIME)
+def test_failed_job_records_error(api_client, monkeypatch):
+    def _broken_calculation(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr("transactions.jobs.calculate_transactions", _broken_calculation)
+    response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+
+    call_command("process_calculate_jobs", "--once", verbosity=0)
+
+    job = CalculateJob.objects.get(id=response.data["id"])
+    assert job.status == CalculateJobStatus.FAILED
+    assert job.error == "boom"
+
+
+@freeze_time(DEFAULT_TIME)
+def test_job_status_is_visible_only_to_owner(api_client, other_api_client):
+    response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+
+    foreign_response = other_api_client.get(
+        f"/api/transactions/calculate/jobs/{response.data['id']}/"
+    )
+
+    assert foreign_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_job_status_with_malformed_id_is_not_found(api_client):
+    response = api_client.get("/api/transactions/calculate/jobs/not-a-uuid/")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_stale_running_job_is_reclaimed(api_client):
+    with freeze_time(DEFAULT_TIME) as frozen:
+        response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+        abandoned = claim_next_job()
+        assert str(abandoned.id) == response.data["id"]
+
+        assert claim_next_job() is None
+        frozen.tick(JOB_STALE_TIMEOUT + timedelta(seconds=1))
+        assert process_pending_jobs() == 1
+
+    job = CalculateJob.objects.get(id=response.data["id"])
+    assert job.status == CalculateJobStatus.DONE
+    assert job.attempts == 2
+    assert job.transactions_created == 21
+
+
+def test_stale_job_fails_after_max_attempts(api_client):
+    with freeze_time(DEFAULT_TIME) as frozen:
+        response = api_client.post("/api/transactions/calculate/", CALC_PAYLOAD, format="json")
+        for _ in range(JOB_MAX_ATTEMPTS):
+            assert claim_next_job() is not None
+            frozen.tick(JOB_STALE_TIMEOUT + timedelta(seconds=1))
+
+        assert claim_next_job() is None
+
+    job = CalculateJob.objects.get(id=response.data["id"])
+    assert job.status == CalculateJobStatus.FAILED
+    assert job.error
+
+
+def test_heartbeat_keeps_long_operation_alive(main_user, monkeypatch):
+    job = CalculateJob.objects.create(
+        user=main_user, start_date=DEFAULT_DATE, end_date=DEFAULT_DATE
+    )
+    beats = threading.Event()
+
+    def _long_calculation(*args, **kwargs):
+        # одна долгая операция без вызовов on_progress
+        assert beats.wait(timeout=5)
+        return CalculationResult(transactions_created=0, transactions_all=0)
+
+    monkeypatch.setattr("transactions.jobs.JOB_HEARTBEAT_INTERVAL", timedelta(milliseconds=10))
+    monkeypatch.setattr("transactions.jobs._touch_job", lambda job_id: beats.set())
+    monkeypatch.setattr("transactions.jobs.calculate_transactions", _long_calculation)
+
+    assert process_pending_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.status == CalculateJobStatus.DONE
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation, RegularOperationType
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _count_calculate_selects(user, days: int) -> int:
+    with CaptureQueriesContext(connection) as context:
+        calculate_transactions(user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=days - 1))
+    # вставки бьются на пачки по лимиту параметров БД, а вот выборки не должны зависеть от окна
+    return sum(query["sql"].startswith("SELECT") for query in context.captured_queries)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calculate_query_count_does_not_depend_on_window(main_user):
+    short_window_selects = _count_calculate_selects(main_user, days=3)
+    long_window_selects = _count_calculate_selects(main_user, days=60)
+
+    assert short_window_selects == long_window_selects
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calculate_twice_keeps_single_row_per_occurrence(main_user):
+    end_date = DEFAULT_DATE + timedelta(days=4)
+
+    first = calculate_transactions(main_user, DEFAULT_DATE, end_date)
+    second = calculate_transactions(main_user, DEFAULT_DATE, end_date)
+
+    assert first.transactions_created == first.transactions_all == 35
+    assert second.transactions_created == 0
+    assert second.transactions_all == first.transactions_all
+    assert Transaction.objects.filter(user=main_user).count() == first.transactions_created
+
+
+@freeze_time(DEFAULT_TIME)
+def test_created_count_ignores_concurrent_writes(main_user, main_account, monkeypatch):
+    bulk_create = Transaction.objects.bulk_create
+
+    def _bulk_create_with_concurrent_write(*args, **kwargs):
+        created = bulk_create(*args, **kwargs)
+        # строка, которую в то же окно записал другой процесс
+        Transaction.objects.create(
+            user=main_user,
+            date=DEFAULT_DATE,
+            planned_date=DEFAULT_DATE,
+            type=TransactionType.EXPENSE,
+            amount=1,
+            from_account=main_account,
+        )
+        return created
+
+    monkeypatch.setattr(Transaction.objects, "bulk_create", _bulk_create_with_concurrent_write)
+    result = calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+    assert result.transactions_created == result.transactions_all == 35
+
+
+@freeze_time(DEFAULT_TIME)
+def test_unique_constraint_rejects_duplicated_operation_occurrence(main_user, main_account):
+    operation = RegularOperation.objects.filter(
+        user=main_user, type=RegularOperationType.INCOME
+    ).first()
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE)
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Transaction.objects.create(
+            user=main_user,
+            date=DEFAULT_DATE,
+            planned_date=DEFAULT_DATE,
+            type=TransactionType.INCOME,
+            amount=operation.amount,
+            to_account=main_account,
+            operation=operation,
+            confirmed=False,
+        )
@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from core.bootstrap import (
+    DEFAULT_DATE,
+    DEFAULT_TIME,
+    MAIN_ACCOUNT_UUID,
+    SECOND_ACCOUNT_UUID,
+    THIRD_ACCOUNT_UUID,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def calculated(main_user) -> None:
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=4))
+
+
+def _calendar(client, **params) -> list[dict]:
+    response = client.get("/api/transactions/calendar/", {"month": "2025-11", **params})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calendar_groups_totals_by_day_and_account(api_client, calculated):
+    days = _calendar(api_client)
+
+    assert len(days) == 30
+    first_day = days[0]
+    assert first_day["date"] == DEFAULT_DATE.isoformat()
+    assert (first_day["income"], first_day["expense"], first_day["transfer"]) == (
+        "1500.00",
+        "150.00",
+        "600.00",
+    )
+    assert first_day["count"] == 7
+    assert first_day["accounts"] == {
+        MAIN_ACCOUNT_UUID: {
+            "income": "1500.00",
+            "expense": "150.00",
+            "transfer_in": "0.00",
+            "transfer_out": "600.00",
+            "count": 7,
+        },
+        SECOND_ACCOUNT_UUID: {
+            "income": "0.00",
+            "expense": "0.00",
+            "transfer_in": "300.00",
+            "transfer_out": "0.00",
+            "count": 2,
+        },
+        THIRD_ACCOUNT_UUID: {
+            "income": "0.00",
+            "expense": "0.00",
+            "transfer_in": "300.00",
+            "transfer_out": "0.00",
+            "count": 1,
+        },
+    }
+    assert days[5]["count"] == 0
+    assert days[5]["accounts"] == {}
+    assert "transactions" not in first_day
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calendar_account_filter(api_client, calculated):
+    first_day = _calendar(api_client, accounts=[SECOND_ACCOUNT_UUID])[0]
+
+    assert first_day["count"] == 2
+    assert first_day["transfer"] == "300.00"
+    assert list(first_day["accounts"]) == [SECOND_ACCOUNT_UUID]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calendar_transactions_take_two_queries(api_client, calculated):
+    with CaptureQueriesContext(connection) as context:
+        days = _calendar(api_client, transactions_limit=2)
+
+    transaction_queries = [
+        query for query in context.captured_queries if "transactions_transaction" in query["sql"]
+    ]
+    assert len(transaction_queries) == 2
+    assert [transaction["amount"] for transaction in days[0]["transactions"]] == [
+        "1000.0000",
+        "500.0000",
+    ]
+    assert days[5]["transactions"] == []
+
+
+@freeze_time(DEFAULT_TIME)
+def test_calendar_rejects_invalid_month(api_client):
+    response = api_client.get("/api/transactions/calendar/", {"month": "2025-13"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "month" in response.data
@@ -1,8 +1,8 @@
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 from regular_operations.models import RegularOperationPeriodType
-from transactions.views import _is_transaction_day
+from transactions.calculation import _is_transaction_day, count_transaction_days
 
 
 @pytest.mark.parametrize(
@@ -176,3 +176,55 @@ def test_is_transaction_day(
         )
         is expected
     )
+
+
+@pytest.mark.parametrize(
+    ["created_date", "deleted_date", "period_interval", "period_type"],
+    [
+        pytest.param(date(2025, 1, 1), None, 1, RegularOperationPeriodType.DAY, id="every day"),
+        pytest.param(date(2025, 1, 3), None, 4, RegularOperationPeriodType.DAY, id="every 4 days"),
+        pytest.param(
+            date(2025, 1, 2), None, 2, RegularOperationPeriodType.WEEK, id="every 2 weeks"
+        ),
+        pytest.param(date(2025, 1, 31), None, 1, RegularOperationPeriodType.MONTH, id="month end"),
+        pytest.param(date(2024, 2, 29), None, 3, RegularOperationPeriodType.MONTH, id="leap day"),
+        pytest.param(
+            date(2025, 1, 10),
+            date(2025, 7, 10),
+            1,
+            RegularOperationPeriodType.MONTH,
+            id="deleted on due day",
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "window",
+    [
+        pytest.param((date(2024, 12, 1), date(2026, 3, 1)), id="covers start"),
+        pytest.param((date(2025, 2, 28), date(2025, 9, 30)), id="inside"),
+        pytest.param((date(2025, 3, 15), date(2025, 3, 20)), id="short window"),
+    ],
+)
+def test_count_transaction_days_matches_daily_check(
+    created_date: date,
+    deleted_date: date | None,
+    period_interval: int,
+    period_type: str,
+    window: tuple[date, date],
+):
+    low, high = window
+    expected = sum(
+        _is_transaction_day(
+            created_date=created_date,
+            deleted_date=deleted_date,
+            current_date=low + timedelta(days=offset),
+            period_type=period_type,
+            period_interval=period_interval,
+        )
+        for offset in range((high - low).days + 1)
+    )
+
+    assert (
+        count_transaction_days(created_date, deleted_date, low, high, period_type, period_interval)
+        == expected
+    )
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from importlib import import_module
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from freezegun import freeze_time
+import pytest
+from transactions.models import Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+unique_planned_occurrences = import_module(
+    "transactions.migrations.0007_transaction_unique_planned_occurrences"
+)
+
+
+def _planned(user, account, *, confirmed: bool) -> Transaction:
+    return Transaction.objects.create(
+        user=user,
+        date=DEFAULT_DATE,
+        planned_date=DEFAULT_DATE,
+        type=TransactionType.EXPENSE,
+        amount=10,
+        from_account=account,
+        confirmed=confirmed,
+    )
+
+
+def test_duplicated_occurrences_keep_confirmed_row(main_user, main_account):
+    # новые уникальные индексы не дают завести дубль по операции, поэтому повторения
+    # группируются по счёту — логика выбора та же
+    with freeze_time(DEFAULT_TIME) as frozen:
+        unconfirmed_old = _planned(main_user, main_account, confirmed=False)
+        frozen.tick(timedelta(hours=1))
+        confirmed_new = _planned(main_user, main_account, confirmed=True)
+        frozen.tick(timedelta(hours=1))
+        unconfirmed_new = _planned(main_user, main_account, confirmed=False)
+    transactions = Transaction.objects.filter(
+        id__in=[unconfirmed_old.id, confirmed_new.id, unconfirmed_new.id]
+    )
+
+    duplicated_ids = unique_planned_occurrences.get_duplicated_ids(transactions, "from_account")
+
+    assert duplicated_ids == [unconfirmed_old.id, unconfirmed_new.id]
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import MonthlySummary, SummarizedMonth, Transaction, TransactionType
+
+
+pytestmark = pytest.mark.django_db
+
+# ноябрь и декабрь уже закрыты, январь ещё открыт
+REPORT_TIME = DEFAULT_TIME + timedelta(days=80)
+
+
+@pytest.fixture
+def planned(main_user):
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=90))
+
+
+def _ledger_totals(user) -> dict[tuple[str, str], list]:
+    expected: dict[tuple[str, str], list] = defaultdict(lambda: [Decimal("0"), 0])
+    for transaction in Transaction.objects.filter(user=user):
+        totals = expected[transaction.date.replace(day=1).isoformat(), transaction.type]
+        totals[0] += transaction.amount
+        totals[1] += 1
+    return expected
+
+
+def _aggregate(client, **params) -> dict[tuple[str, str], list]:
+    response = client.get("/api/transactions/aggregate/", {"group_by": ["month", "type"], **params})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return {
+        (row["period"], row["type"]): [Decimal(row["total"]), row["count"]] for row in response.data
+    }
+
+
+@freeze_time(REPORT_TIME)
+def test_aggregate_reads_closed_months_from_summaries(api_client, main_user, planned):
+    assert _aggregate(api_client) == _ledger_totals(main_user)
+    assert set(MonthlySummary.objects.filter(user=main_user).values_list("month", flat=True)) == {
+        date(2025, 11, 1),
+        date(2025, 12, 1),
+    }
+
+
+@freeze_time(REPORT_TIME)
+def test_summaries_follow_transaction_writes(api_client, main_user, planned):
+    _aggregate(api_client)
+
+    response = api_client.post(
+        "/api/transactions/",
+        {
+            "date": "2025-11-15",
+            "type": TransactionType.EXPENSE,
+            "amount": "123.45",
+            "from_account": MAIN_ACCOUNT_UUID,
+            "confirmed": True,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    assert _aggregate(api_client) == _ledger_totals(main_user)
+
+    transaction_url = f"/api/transactions/{response.data['id']}/"
+    response = api_client.patch(transaction_url, {"date": "2025-12-20"}, format="json")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert _aggregate(api_client) == _ledger_totals(main_user)
+
+    assert api_client.delete(transaction_url).status_code == status.HTTP_204_NO_CONTENT
+    assert _aggregate(api_client) == _ledger_totals(main_user)
+
+
+@freeze_time(REPORT_TIME)
+def test_empty_closed_months_are_not_recomputed(api_client, main_user, planned):
+    Transaction.objects.filter(user=main_user, date__gte=date(2025, 12, 1)).delete()
+    _aggregate(api_client, date__gte="2025-11-01")
+    assert set(SummarizedMonth.objects.filter(user=main_user).values_list("month", flat=True)) == {
+        date(2025, 11, 1),
+        date(2025, 12, 1),
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        rows = _aggregate(api_client, date__gte="2025-11-01")
+
+    assert rows == _ledger_totals(main_user)
+    recomputed = f'DELETE FROM "{MonthlySummary._meta.db_table}"'
+    assert not any(query["sql"].startswith(recomputed) for query in queries.captured_queries)
+
+
+@freeze_time(REPORT_TIME)
+def test_partial_months_and_unsupported_filters_use_ledger(api_client, main_user, planned):
+    transactions = Transaction.objects.filter(
+        user=main_user, date__gte=date(2025, 11, 10), confirmed=False
+    )
+
+    rows = _aggregate(api_client, date__gte="2025-11-10", confirmed="false")
+
+    assert (
+        sum(total for total, _ in rows.values())
+        == transactions.aggregate(total=Sum("amount"))["total"]
+    )
+    assert sum(count for _, count in rows.values()) == transactions.count()
+
+
+@freeze_time(REPORT_TIME)
+def test_rebuild_command(main_user, planned):
+    MonthlySummary.objects.create(
+        user=main_user, month=date(2025, 11, 1), type=TransactionType.INCOME, total=1, count=1
+    )
+
+    call_command("rebuild_monthly_summaries", stdout=None)
+
+    closed = Transaction.objects.filter(user=main_user, date__lt=date(2026, 1, 1))
+    summaries = MonthlySummary.objects.filter(user=main_user)
+    assert (
+        summaries.aggregate(total=Sum("total"))["total"]
+        == closed.aggregate(total=Sum("amount"))["total"]
+    )
+    assert summaries.aggregate(count=Sum("count"))["count"] == closed.count()
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from regular_operations.models import RegularOperation
+from rest_framework import status
+from scenarios.models import ScenarioRule
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+TODAY = DEFAULT_DATE + timedelta(days=45)
+HORIZON_END = DEFAULT_DATE + timedelta(days=3 * 365)
+
+
+@pytest.fixture
+def salary(other_user) -> RegularOperation:
+    operation = RegularOperation.objects.get(user=other_user, title="Зарплата")
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(other_user, DEFAULT_DATE, HORIZON_END)
+    # одна прошедшая транзакция подтверждена пользователем
+    Transaction.objects.filter(operation=operation, planned_date__lt=TODAY).update(confirmed=True)
+    return operation
+
+
+def _transaction_deletes(context) -> list[str]:
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("DELETE") and "transactions_transaction" in query["sql"]
+    ]
+
+
+@freeze_time(TODAY)
+def test_operation_delete_purges_future_planned_rows_in_one_statement(other_api_client, salary):
+    rule_rows = Transaction.objects.filter(scenario_rule__scenario__operation=salary)
+    operation_rows = Transaction.objects.filter(operation=salary)
+    past_rows_before = operation_rows.filter(planned_date__lt=TODAY).count()
+    past_rule_rows_before = rule_rows.filter(planned_date__lt=TODAY).count()
+    assert operation_rows.filter(planned_date__gte=TODAY).count() > 30
+
+    with CaptureQueriesContext(connection) as context:
+        response = other_api_client.delete(f"/api/regular-operations/{salary.id}/")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert len(_transaction_deletes(context)) == 1
+    assert not operation_rows.filter(planned_date__gte=TODAY).exists()
+    assert not rule_rows.filter(planned_date__gte=TODAY).exists()
+    assert operation_rows.filter(planned_date__lt=TODAY, confirmed=True).count() == (
+        past_rows_before
+    )
+    assert rule_rows.filter(planned_date__lt=TODAY).count() == past_rule_rows_before
+
+
+@freeze_time(TODAY)
+def test_scenario_rule_destroy_purges_only_its_future_rows(other_api_client, salary):
+    rule = ScenarioRule.objects.filter(scenario__operation=salary).first()
+    rule_rows = Transaction.objects.filter(scenario_rule=rule)
+    other_rows_before = Transaction.objects.exclude(scenario_rule=rule).count()
+
+    with CaptureQueriesContext(connection) as context:
+        response = other_api_client.delete(f"/api/scenarios/rules/{rule.id}/")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert len(_transaction_deletes(context)) == 1
+    assert not rule_rows.filter(planned_date__gte=TODAY).exists()
+    assert rule_rows.filter(planned_date__lt=TODAY).exists()
+    assert Transaction.objects.exclude(scenario_rule=rule).count() == other_rows_before
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+# зарплата, фриланс, два расхода и три перевода по правилам зарплаты
+DAILY_OCCURRENCES = 7
+
+
+def _upcoming(client, days: int) -> list[dict]:
+    response = client.get("/api/transactions/upcoming/", {"days": days})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+@freeze_time(DEFAULT_TIME)
+def test_upcoming_returns_virtual_occurrences(api_client):
+    upcoming = _upcoming(api_client, days=3)
+
+    assert len(upcoming) == 3 * DAILY_OCCURRENCES
+    assert all(item["virtual"] and item["id"] is None for item in upcoming)
+    assert [item["date"] for item in upcoming] == sorted(item["date"] for item in upcoming)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_upcoming_merges_planned_rows(api_client, main_user):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=1))
+    confirmed = Transaction.objects.filter(user=main_user, planned_date=DEFAULT_DATE).first()
+    Transaction.objects.filter(id=confirmed.id).update(confirmed=True)
+
+    upcoming = _upcoming(api_client, days=3)
+
+    assert len(upcoming) == 3 * DAILY_OCCURRENCES - 1
+    planned = [item for item in upcoming if not item["virtual"]]
+    assert len(planned) == 2 * DAILY_OCCURRENCES - 1
+    assert {item["date"] for item in planned} == {
+        DEFAULT_DATE.isoformat(),
+        (DEFAULT_DATE + timedelta(days=1)).isoformat(),
+    }
+    assert str(confirmed.id) not in {item["id"] for item in upcoming}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_upcoming_query_count_does_not_depend_on_window(api_client):
+    with CaptureQueriesContext(connection) as short_window:
+        _upcoming(api_client, days=3)
+    with CaptureQueriesContext(connection) as long_window:
+        _upcoming(api_client, days=60)
+
+    assert len(short_window.captured_queries) == len(long_window.captured_queries)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_upcoming_rejects_invalid_window(api_client):
+    response = api_client.get("/api/transactions/upcoming/", {"days": 0})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "days" in response.data
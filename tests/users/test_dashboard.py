@@ -0,0 +1,155 @@
+from datetime import timedelta
+from decimal import Decimal
+import time
+
+from accounts.models import Account, AccountType, InterestCompounding
+from core.bootstrap import DEFAULT_DATE, DEFAULT_TIME, MAIN_ACCOUNT_UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from transactions.calculation import calculate_transactions
+from transactions.models import Transaction
+
+
+pytestmark = pytest.mark.django_db
+
+DASHBOARD_QUERY_BUDGET = 12
+DASHBOARD_MAX_SECONDS = 1.0
+
+
+def _dashboard(client, **params) -> dict:
+    response = client.get("/api/users/dashboard/", params)
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data
+
+
+def _fan_out(client) -> None:
+    # запросы, которые главный экран делал по отдельности
+    client.get("/api/users/me/")
+    client.get("/api/accounts/")
+    client.post("/api/accounts/statistics/", {"forecast": True}, format="json")
+    client.get("/api/regular-operations/")
+    client.get("/api/transactions/")
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_matches_separate_endpoints(api_client, main_user):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=3))
+
+    dashboard = _dashboard(api_client, days=10, transactions_limit=5)
+
+    assert dashboard["user"] == api_client.get("/api/users/me/").data
+    assert dashboard["accounts"] == api_client.get("/api/accounts/").data["results"]
+    operations = api_client.get("/api/regular-operations/").data
+    assert dashboard["regular_operations"] == operations.get("results", operations)
+
+    statistics = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=9)).isoformat(),
+            "forecast": True,
+            "accounts": [MAIN_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    assert (
+        dashboard["balances"][MAIN_ACCOUNT_UUID] == statistics.data["balances"][MAIN_ACCOUNT_UUID]
+    )
+
+
+def test_dashboard_lists_latest_transactions_up_to_today(api_client, main_user):
+    today = DEFAULT_DATE + timedelta(days=2)
+    with freeze_time(DEFAULT_TIME):
+        calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=5))
+    with freeze_time(DEFAULT_TIME + timedelta(days=2)):
+        dashboard = _dashboard(api_client, transactions_limit=100)
+        latest = _dashboard(api_client, transactions_limit=5)
+
+    dates = [item["date"] for item in dashboard["transactions"]]
+    assert dates == sorted(dates, reverse=True)
+    assert dates[0] == today.isoformat()
+    assert {item["id"] for item in dashboard["transactions"]} == {
+        str(transaction_id)
+        for transaction_id in Transaction.objects.filter(
+            user=main_user, date__lte=today
+        ).values_list("id", flat=True)
+    }
+    assert {item["date"] for item in latest["transactions"]} == {today.isoformat()}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_applies_interest_like_statistics(api_client, main_user):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=3))
+    without_interest = _dashboard(api_client, days=40)["balances"][MAIN_ACCOUNT_UUID]
+    Account.objects.filter(id=MAIN_ACCOUNT_UUID).update(
+        interest_rate=Decimal("12.0000"), interest_compounding=InterestCompounding.MONTH
+    )
+
+    dashboard = _dashboard(api_client, days=40)
+
+    statistics = api_client.post(
+        "/api/accounts/statistics/",
+        {
+            "start_date": DEFAULT_DATE.isoformat(),
+            "end_date": (DEFAULT_DATE + timedelta(days=39)).isoformat(),
+            "forecast": True,
+            "accounts": [MAIN_ACCOUNT_UUID],
+        },
+        format="json",
+    )
+    balances = dashboard["balances"][MAIN_ACCOUNT_UUID]
+    assert balances == statistics.data["balances"][MAIN_ACCOUNT_UUID]
+    last_day = (DEFAULT_DATE + timedelta(days=39)).isoformat()
+    assert balances[last_day] != without_interest[last_day]
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_without_accounts(create_user):
+    client = APIClient()
+    client.force_authenticate(user=create_user("empty"))
+
+    dashboard = _dashboard(client)
+
+    assert dashboard["accounts"] == []
+    assert dashboard["balances"] == {}
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_query_budget(api_client, main_user, create_account):
+    with CaptureQueriesContext(connection) as small:
+        _dashboard(api_client)
+
+    for index in range(5):
+        create_account(main_user, f"Счёт {index}", AccountType.ACCUMULATION)
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=30))
+    with CaptureQueriesContext(connection) as large:
+        _dashboard(api_client, transactions_limit=100)
+    with CaptureQueriesContext(connection) as fan_out:
+        _fan_out(api_client)
+
+    assert len(small.captured_queries) == len(large.captured_queries)
+    assert len(large.captured_queries) <= DASHBOARD_QUERY_BUDGET
+    assert len(large.captured_queries) < len(fan_out.captured_queries)
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_latency(api_client, main_user):
+    calculate_transactions(main_user, DEFAULT_DATE, DEFAULT_DATE + timedelta(days=30))
+    _dashboard(api_client)
+
+    started = time.perf_counter()
+    _dashboard(api_client, days=366, transactions_limit=100)
+
+    assert time.perf_counter() - started < DASHBOARD_MAX_SECONDS
+
+
+@freeze_time(DEFAULT_TIME)
+def test_dashboard_rejects_invalid_window(api_client):
+    response = api_client.get("/api/users/dashboard/", {"days": 0})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "days" in response.data